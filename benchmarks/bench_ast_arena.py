@@ -0,0 +1,68 @@
+# memory held by a parsed tree and traversal speed: parser classes vs AstArena
+#   python benchmarks/bench_ast_arena.py [statements]
+import sys
+import os
+import gc
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser, Interpreter
+from ccompiler.parser.profiling import count_nodes_by_class
+from ccompiler.parser.ast_arena import ArenaParser, ArenaInterpreter
+from benchmarks.gen_source import generate_program
+
+def memory(build):
+    """(bytes still held by what build() returns, peak bytes while building)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, held, peak
+
+def best_time(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    text = generate_program(statements, safe=True)
+
+    tree, tree_held, tree_peak = memory(lambda: Parser(Lexer(text, scanner='regex')).parse())
+    arena, arena_held, arena_peak = memory(lambda: ArenaParser.from_text(text).parse())
+    nodes = len(arena)
+    if sum(count_nodes_by_class(tree).values()) != nodes:
+        raise SystemExit("the arena and the parser tree have different node counts")
+    if Interpreter(None).visit(tree) != ArenaInterpreter(arena).run():
+        raise SystemExit("the arena and the parser tree evaluate differently")
+
+    print(f"{statements} statements, {nodes} nodes, source {len(text.encode()) / 1024:.0f} KiB")
+    print(f"  classes: held {tree_held / 1024:8.0f} KiB ({tree_held / nodes:5.1f} B/node), "
+          f"peak while parsing {tree_peak / 1024:8.0f} KiB")
+    print(f"    arena: held {arena_held / 1024:8.0f} KiB ({arena_held / nodes:5.1f} B/node), "
+          f"peak while parsing {arena_peak / 1024:8.0f} KiB")
+
+    print("traversal (all nodes, post-order):")
+    walk_tree = best_time(lambda: count_nodes_by_class(tree))
+    walk_arena = best_time(lambda: sum(1 for _ in arena.postorder()))
+    walk_indices = best_time(lambda: sum(1 for _ in range(len(arena))))
+    print(f"  classes, explicit stack: {walk_tree * 1000:8.2f} ms")
+    print(f"  arena.postorder():       {walk_arena * 1000:8.2f} ms")
+    print(f"  arena index order:       {walk_indices * 1000:8.2f} ms")
+
+    print("evaluation:")
+    print(f"  Interpreter on classes:  {best_time(lambda: Interpreter(None).visit(tree)) * 1000:8.2f} ms")
+    print(f"  Interpreter on views:    {best_time(lambda: Interpreter(None).visit(arena.tree())) * 1000:8.2f} ms")
+    print(f"  ArenaInterpreter:        {best_time(lambda: ArenaInterpreter(arena).run()) * 1000:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# repeated execution of one parsed program on each execution backend
+#   python benchmarks/bench_backends.py [statements] [runs] [deep expression depth]
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.backends import BACKENDS, compile_program
+from benchmarks.gen_source import generate_program, deep_expression
+
+def parse(text):
+    return Parser(Lexer(text, scanner='regex')).parse()
+
+def outcome(run):
+    try:
+        return 'ok', repr(run())
+    except Exception as e:
+        return 'error', str(e)
+
+def check_same_results(seeds=200):
+    """differential check: every backend must agree with the tree-walking Interpreter"""
+    for seed in range(seeds):
+        tree = parse(generate_program(statements=30, depth=4, seed=seed))
+        expected = outcome(compile_program(tree, 'tree'))
+        for backend in BACKENDS:
+            got = outcome(compile_program(tree, backend))
+            if got != expected:
+                raise SystemExit(f"seed {seed}: {backend} gave {got}, interpreter gave {expected}")
+
+def timed(run, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        run()
+    return (time.perf_counter() - start) / runs
+
+def report(title, tree, runs):
+    print(title)
+    baseline = None
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        run = compile_program(tree, backend)
+        compile_time = time.perf_counter() - start
+        elapsed = timed(run, runs)
+        baseline = baseline or elapsed
+        print(f"  {backend:>9}: {elapsed * 1000:8.2f} ms/run  ({baseline / elapsed:4.1f}x)"
+              f"  compile {compile_time * 1000:.1f} ms")
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    depth = int(sys.argv[3]) if len(sys.argv) > 3 else 12
+    check_same_results()
+    print("all backends agree with the Interpreter")
+
+    report(f"{statements} generated statements", parse(generate_program(statements, safe=True)), runs)
+    deep = deep_expression(depth, names=('a', 'b'))
+    report(f"deep expression, depth {depth}", parse(f"int main() {{ a = 3; b = 5; return {deep}; }}"), runs)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# batch throughput (files/sec) as the worker count grows
+#   python benchmarks/bench_batch.py [files] [statements]
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.parser.batch import run_batch
+from benchmarks.gen_source import generate_program
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    source_dir = tempfile.mkdtemp()
+    try:
+        paths = []
+        for seed in range(files):
+            path = os.path.join(source_dir, f"program_{seed}.c")
+            with open(path, 'w') as f:
+                f.write(generate_program(statements, seed=seed, safe=True))
+            paths.append(path)
+
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+            worker_counts.append(worker_counts[-1] * 2)
+        print(f"{files} files of {statements} statements")
+        base = None
+        with open(os.devnull, 'w') as out:
+            for workers in worker_counts:
+                count, counts, elapsed = run_batch(paths, workers, chunksize=4, out=out)
+                rate = count / elapsed
+                base = base or rate
+                print(f"  {workers:3d} workers: {rate:8.1f} files/sec  ({rate / base:4.2f}x)  {counts}")
+    finally:
+        shutil.rmtree(source_dir)
+
+if __name__ == '__main__':
+    main()
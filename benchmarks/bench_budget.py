@@ -0,0 +1,55 @@
+# cost of running within a Budget, per backend, and how fast pathological programs are stopped
+#   python benchmarks/bench_budget.py [statements] [runs]
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.backends import BACKENDS, compile_program
+from ccompiler.parser.budget import Budget, BudgetExceeded
+from benchmarks.gen_source import generate_program
+
+PATHOLOGICAL = {
+    'power tower': "int main() { x = 9; return x ** 9 ** 9 ** 9; }",
+    'squaring': "int main() { x = 3; " + "x = x * x; " * 40 + "return x; }",
+}
+
+def timed(run, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tree = Parser(Lexer(generate_program(statements, seed=0, safe=True), scanner='regex')).parse()
+    budget = Budget(max_steps=10 ** 9, max_int_bits=1 << 20, deadline=60.0, max_memory=1 << 40)
+
+    print(f"{statements} statements, every limit set")
+    for backend in BACKENDS:
+        plain = compile_program(tree, backend)
+        limited = compile_program(tree, backend, budget)
+        if plain() != limited():
+            raise SystemExit(f"{backend}: the budget changed the result")
+        plain_time = timed(plain, runs)
+        limited_time = timed(limited, runs)
+        print(f"  {backend:>9}: {plain_time * 1000:8.2f} ms/run, within budget {limited_time * 1000:8.2f} ms/run "
+              f"({limited_time / plain_time:.2f}x)")
+
+    budget = Budget(max_int_bits=1 << 20, deadline=1.0)
+    for name, text in PATHOLOGICAL.items():
+        run = compile_program(Parser(Lexer(text)).parse(), 'vm', budget)
+        start = time.perf_counter()
+        try:
+            run()
+            raise SystemExit(f"{name}: not stopped")
+        except BudgetExceeded as e:
+            print(f"  {name}: stopped after {(time.perf_counter() - start) * 1000:.2f} ms: {e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+# compile time without the cache, from disk and from the in-process layer
+#   python benchmarks/bench_compile_cache.py [statements]
+import sys
+import os
+import time
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.parser.compile_cache import CompileCache
+from benchmarks.gen_source import generate_program
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    text = generate_program(statements)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cold = timed(lambda: CompileCache(cache_dir).compile_text(text))
+        disk = timed(lambda: CompileCache(cache_dir).compile_text(text))
+        cache = CompileCache(cache_dir)
+        cache.compile_text(text)
+        memory = timed(lambda: cache.compile_text(text))
+        print(f"{statements} statements")
+        print(f"  miss (lex, parse, optimize): {cold * 1000:8.2f} ms")
+        print(f"  disk hit:                    {disk * 1000:8.2f} ms")
+        print(f"  memory hit:                  {memory * 1000:8.2f} ms")
+    finally:
+        shutil.rmtree(cache_dir)
+
+if __name__ == '__main__':
+    main()
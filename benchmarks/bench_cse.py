@@ -0,0 +1,80 @@
+# hash-consing: deduplication ratio and evaluation time saved by MemoInterpreter
+#   python benchmarks/bench_cse.py [statements] [runs]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser, Interpreter
+from ccompiler.parser.cse import MemoInterpreter
+from benchmarks.gen_source import gen_expr, generate_program
+
+def repetitive_program(statements, pool_size=20, reassign=0.05, seed=0):
+    """
+    statements built from a fixed pool of subexpressions over p0..p4, the way
+    generated code repeats itself; every so often one of the p's changes
+    """
+    rng = random.Random(seed)
+    params = [f"p{i}" for i in range(5)]
+    pool = [gen_expr(rng, params, 4, safe=True) for _ in range(pool_size)]
+    lines = ["int main() {"] + [f"    {p} = {rng.randint(1, 9)};" for p in params]
+    for i in range(statements):
+        if rng.random() < reassign:
+            lines.append(f"    {rng.choice(params)} = {rng.randint(1, 9)};")
+        lines.append(f"    v{i % 20} = (({rng.choice(pool)}) + ({rng.choice(pool)}) * {rng.randint(1, 9)}) % 1009;")
+    lines.append(f"    return v0 + ({rng.choice(pool)});")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def parse(text, share):
+    parser = Parser(Lexer(text, scanner='regex'), share_subtrees=share)
+    return parser.parse(), parser.sharing_stats
+
+def outcome(run):
+    # errors with the span they report, which must be that of the failing occurrence
+    try:
+        return 'ok', repr(run())
+    except Exception as e:
+        return 'error', str(e), getattr(e, 'start', None), getattr(e, 'end', None)
+
+def check_same_results(seeds=200):
+    for seed in range(seeds):
+        for text in (generate_program(30, depth=4, seed=seed), repetitive_program(30, pool_size=4, seed=seed)):
+            expected = outcome(lambda: Interpreter(None).visit(parse(text, False)[0]))
+            got = outcome(lambda: MemoInterpreter().visit(parse(text, True)[0]))
+            if got != expected:
+                raise SystemExit(f"seed {seed}: MemoInterpreter gave {got}, Interpreter gave {expected}")
+
+def best_time(func, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    check_same_results()
+    print("MemoInterpreter agrees with the Interpreter")
+
+    for title, text in (("generated program", generate_program(statements, safe=True)),
+                        ("repetitive program", repetitive_program(statements)),
+                        ("repetitive program, inputs never change", repetitive_program(statements, reassign=0))):
+        tree, _ = parse(text, False)
+        shared_tree, stats = parse(text, True)
+        memo = MemoInterpreter()
+        memo.visit(shared_tree)
+        plain = best_time(lambda: Interpreter(None).visit(tree), runs)
+        shared = best_time(lambda: MemoInterpreter().visit(shared_tree), runs)
+        print(title)
+        print(f"  {stats}")
+        print(f"  memo: {memo.stats}")
+        print(f"  Interpreter on the tree:    {plain * 1000:8.2f} ms")
+        print(f"  MemoInterpreter:            {shared * 1000:8.2f} ms  ({plain / shared:.2f}x)")
+
+if __name__ == '__main__':
+    main()
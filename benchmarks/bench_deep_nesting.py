@@ -0,0 +1,45 @@
+# parse and evaluate expressions nested far beyond the recursion limit with the
+# iterative parser and evaluator, and check that time grows linearly with depth
+#   python benchmarks/bench_deep_nesting.py [max depth]
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.iterative import IterativeInterpreter
+
+# name -> (expression of the given nesting depth, expected value)
+SHAPES = {
+    'parentheses': lambda n: ("(" * n + "a" + ")" * n, 3),
+    'unary chain': lambda n: ("- " * n + "a", 3 if n % 2 == 0 else -3),
+    '** chain': lambda n: (" ** ".join(["1"] * n), 1),
+    'nested sums': lambda n: ("(a + " * n + "1" + ")" * n, 3 * n + 1),
+}
+
+def run(expression):
+    text = f"int main() {{ a = 3; return {expression}; }}"
+    lexer = Lexer(text, scanner='regex')
+    start = time.perf_counter()
+    tree = Parser(lexer, expr_parser='iterative').parse()
+    parsed = time.perf_counter()
+    result = IterativeInterpreter(None).visit(tree)
+    done = time.perf_counter()
+    return result, parsed - start, done - parsed
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    depths = [max_depth // 100, max_depth // 10, max_depth]
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    for name, shape in SHAPES.items():
+        print(name)
+        for depth in depths:
+            expression, expected = shape(depth)
+            result, parse_time, eval_time = run(expression)
+            if result != expected:
+                raise SystemExit(f"{name} at depth {depth}: got {result}, expected {expected}")
+            print(f"  depth {depth:>8}: parse {parse_time * 1e9 / depth:7.0f} ns/level, "
+                  f"evaluate {eval_time * 1e9 / depth:7.0f} ns/level")
+
+if __name__ == '__main__':
+    main()
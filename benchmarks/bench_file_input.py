@@ -0,0 +1,42 @@
+# bytes/sec of scanning a generated file through each input path
+#   python benchmarks/bench_file_input.py [statements] [chunk_size]
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import RegexScanner
+from ccompiler.scanner.file_input import SourceFile
+from benchmarks.gen_source import generate_program
+
+def count(tokens):
+    n = 0
+    for _ in tokens:
+        n += 1
+    return n
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1 << 16
+    with tempfile.NamedTemporaryFile('w', suffix='.c', delete=False) as f:
+        f.write(generate_program(statements))
+        path = f.name
+    try:
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        with open(path) as f:
+            expected = count(RegexScanner.iter_tokens(f.read()))
+        elapsed = time.perf_counter() - start
+        print(f"input: {size / 1e6:.2f} MB, {expected} tokens, chunk size {chunk_size}")
+        print(f"{'read()':>8}: {size / elapsed / 1e6:8.2f} MB/s")
+
+        for mode in ('mmap', 'chunked'):
+            source = SourceFile(path, mode, chunk_size)
+            if count(source.scanner_tokens()) != expected:
+                raise SystemExit(f"{mode} input does not match the whole-file token count")
+            print(f"{mode:>8}: {source.bytes_per_second / 1e6:8.2f} MB/s")
+    finally:
+        os.unlink(path)
+
+if __name__ == '__main__':
+    main()
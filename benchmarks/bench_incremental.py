@@ -0,0 +1,70 @@
+# time per edit: IncrementalDocument.edit against parsing the whole file again
+#   python benchmarks/bench_incremental.py [statements] [edits]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.incremental import IncrementalDocument
+from benchmarks.gen_source import generate_program
+from benchmarks.bench_serialize import nodes
+
+def statement_offsets(document):
+    """start offset of every statement segment"""
+    offsets = []
+    position = len(document.texts[0])
+    for text in document.texts[1:-1]:
+        offsets.append(position)
+        position += len(text)
+    return offsets
+
+def edits(document, kind, rng):
+    """an (offset, removed, inserted) edit of the given kind at a random statement"""
+    offsets = statement_offsets(document)
+    i = rng.randrange(len(offsets) - 1)  # never the final return statement
+    start = offsets[i]
+    if kind == 'retype a digit':
+        segment = document.texts[i + 1]
+        digits = [j for j, ch in enumerate(segment) if ch.isdigit()]
+        j = rng.choice(digits) if digits else segment.index('=') + 2
+        return start + j, 1 if digits else 0, str(rng.randint(1, 9))
+    if kind == 'insert a statement':
+        return start, 0, f"\n    w{i} = {rng.randint(1, 99)} * v0;"
+    return start, len(document.texts[i + 1]), ''  # delete a statement
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    text = generate_program(statements)
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    Parser(Lexer(text, scanner='regex')).parse()
+    full = time.perf_counter() - start
+    print(f"{statements} statements, {len(text) / 1024:.0f} KiB")
+    print(f"  full Lexer + Parser:      {full * 1000:10.3f} ms")
+
+    document = IncrementalDocument(text)
+    for kind in ('retype a digit', 'insert a statement', 'delete a statement'):
+        elapsed = 0.0
+        scanned = 0
+        for _ in range(count):
+            edit = edits(document, kind, rng)
+            start = time.perf_counter()
+            document.edit(*edit)
+            elapsed += time.perf_counter() - start
+            scanned += document.stats.chars_scanned
+            if document.stats.full_reparse:
+                raise SystemExit(f"{kind}: unexpected full reparse")
+        print(f"  {kind + ':':<25} {elapsed / count * 1000:10.3f} ms/edit  "
+              f"({full * count / elapsed:7.0f}x), {scanned / count:.0f} chars scanned/edit")
+
+    expected = Parser(Lexer(document.text, scanner='regex')).parse()
+    if nodes(expected) != nodes(document.tree):
+        raise SystemExit("the incremental tree differs from a full parse of the edited text, spans included")
+    print("final tree matches a full parse")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# cost of source locations: building a LineIndex and turning offsets into line:column
+#   python benchmarks/bench_line_index.py [lines]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.line_index import LineIndex
+
+LOOKUPS = 100000
+
+def count_lines(text, offset):
+    # what a location costs without an index: count the newlines before it
+    line = text.count('\n', 0, offset) + 1
+    return line, offset - (text.rfind('\n', 0, offset) + 1) + 1
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    text = "".join(f"  x{i % 97} = x{i % 89} + {i};\n" for i in range(lines))
+    rng = random.Random(0)
+    offsets = [rng.randrange(len(text)) for _ in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    index = LineIndex(text)
+    build = time.perf_counter() - start
+    print(f"{len(index)} lines, {len(text) / 1e6:.1f} MB: index built in {build:.3f} s "
+          f"({build / len(index) * 1e9:.0f} ns/line, {index.starts.itemsize} bytes/line)")
+
+    start = time.perf_counter()
+    for offset in offsets:
+        index.location(offset)
+    elapsed = time.perf_counter() - start
+    print(f"  bisect lookup:   {elapsed / LOOKUPS * 1e9:10.0f} ns/location")
+
+    sample = offsets[:100]
+    start = time.perf_counter()
+    for offset in sample:
+        if count_lines(text, offset) != index.location(offset):
+            raise SystemExit(f"wrong location for offset {offset}")
+    elapsed = time.perf_counter() - start
+    print(f"  counting lines:  {elapsed / len(sample) * 1e9:10.0f} ns/location")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+# node counts and run time before/after the optimizer pass
+#   python benchmarks/bench_optimizer.py [statements] [runs]
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.parser.backends import compile_program
+from ccompiler.parser.optimizer import optimize
+from benchmarks.gen_source import generate_program
+from benchmarks.bench_backends import parse, outcome, timed
+
+def check_same_results(seeds=300):
+    """the optimized tree must give the same result or the same error"""
+    for seed in range(seeds):
+        tree = parse(generate_program(statements=20, depth=4, seed=seed))
+        optimized, _ = optimize(tree)
+        expected = outcome(compile_program(tree))
+        got = outcome(compile_program(optimized))
+        if got != expected:
+            raise SystemExit(f"seed {seed}: optimized tree gave {got}, original gave {expected}")
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    check_same_results()
+    print("optimized trees agree with the originals")
+
+    tree = parse(generate_program(statements, safe=True))
+    optimized, stats = optimize(tree)
+    print(stats)
+    for backend in ('tree', 'closure'):
+        before = timed(compile_program(tree, backend), runs)
+        after = timed(compile_program(optimized, backend), runs)
+        print(f"{backend:>8}: {before * 1000:8.2f} -> {after * 1000:8.2f} ms/run")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# scaling of ParallelScanner from 1 to N worker processes on one large source
+#   python benchmarks/bench_parallel_scan.py [statements] [max_workers] [chunk_size]
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.scanner.token_buffer import TokenBuffer
+from ccompiler.scanner.parallel_scan import ParallelScanner
+from ccompiler.parser.parser import Parser, ParserError
+from benchmarks.gen_source import generate_program
+from benchmarks.bench_serialize import nodes
+
+def scanner_tokens(text):
+    """(lexeme, type, start) of every parser token of the sequential legacy scanner"""
+    return [(t.lexeme, t.type, t.start) for t in Lexer(text).tokens if t.type is not T.EOF]
+
+def buffer_tokens(buffer):
+    return [(buffer.lexemes[buffer.lexeme_ids[i]], buffer.token(i).type, buffer.starts[i])
+            for i in range(len(buffer))]
+
+def parse_outcome(lexer):
+    """every node with its span, or the syntax error with its line and column"""
+    try:
+        return nodes(Parser(lexer).parse())
+    except ParserError as e:
+        return e.message, e.start, e.line, e.column
+
+def check_same_spans(text):
+    """a tree parsed from ParallelScanner tokens has the spans and error locations of one from the Lexer"""
+    broken = text.replace(";", "", 1)
+    for source in (text, broken):
+        if parse_outcome(ParallelScanner(workers=1, chunk_size=64).lexer(source)) != parse_outcome(Lexer(source)):
+            raise SystemExit("a tree parsed from ParallelScanner tokens differs from the Lexer's, spans included")
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    chunk_size = int(sys.argv[3]) if len(sys.argv) > 3 else 1 << 18
+
+    # tiny chunks cut through comments, operators and words as often as possible
+    text = generate_program(statements=300, comment_every=2, seed=1)
+    text = text.replace("//", "/* a\n block */ //", 40)
+    for size in (1, 5, 64):
+        scanner = ParallelScanner(workers=2, chunk_size=size)
+        if buffer_tokens(scanner.scan(text)) != scanner_tokens(text):
+            raise SystemExit(f"chunk size {size}: ParallelScanner differs from the sequential scanner")
+    check_same_spans(text)
+    print(f"ParallelScanner agrees with the sequential scanner ({scanner.chunks} chunks, {scanner.resynced} resynced)")
+
+    text = generate_program(statements=statements, seed=0)
+    megabytes = len(text) / 1e6
+    start = time.perf_counter()
+    expected = TokenBuffer.from_text(text)
+    sequential = time.perf_counter() - start
+    print(f"{statements} statements, {megabytes:.1f} MB, {len(expected)} tokens, {os.cpu_count()} CPUs")
+    print(f"  sequential:  {sequential:7.2f} s  {megabytes / sequential:6.2f} MB/s")
+
+    for workers in range(1, max_workers + 1):
+        scanner = ParallelScanner(workers, chunk_size)
+        start = time.perf_counter()
+        buffer = scanner.scan(text)
+        elapsed = time.perf_counter() - start
+        if buffer.types != expected.types or buffer.starts != expected.starts:
+            raise SystemExit(f"{workers} workers: tokens differ from the sequential scan")
+        print(f"  {workers:2d} workers:  {elapsed:7.2f} s  {megabytes / elapsed:6.2f} MB/s  "
+              f"({sequential / elapsed:.2f}x, {scanner.chunks} chunks)")
+
+if __name__ == '__main__':
+    main()
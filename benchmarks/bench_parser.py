@@ -0,0 +1,58 @@
+# Python calls per token and parse time of the two expression parsers
+#   python benchmarks/bench_parser.py [operands]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser, EXPRESSION_PARSERS
+from benchmarks.gen_source import generate_program
+
+def flat_expression(operands, seed=0):
+    """a long expression without parentheses, e.g. 'a + 3 * b - 7 % a ...'"""
+    rng = random.Random(seed)
+    parts = [rng.choice(['a', 'b', '7', '42'])]
+    for _ in range(operands - 1):
+        parts.append(rng.choice(['+', '-', '*', '/', '%']))
+        parts.append(rng.choice(['a', 'b', '7', '42']))
+    return " ".join(parts)
+
+def count_calls(func):
+    calls = 0
+    def profiler(frame, event, arg):
+        nonlocal calls
+        if event == 'call':
+            calls += 1
+    sys.setprofile(profiler)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+def report(title, text, runs=5):
+    lexer = Lexer(text, scanner='regex')
+    tokens = len(lexer.tokens)
+    print(f"{title}: {tokens} tokens")
+    for mode in EXPRESSION_PARSERS:
+        def parse():
+            lexer.pos = 0  # reuse the scanned tokens, only parsing is measured
+            return Parser(lexer, expr_parser=mode).parse()
+        calls = count_calls(parse)
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            parse()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"  {mode:>9}: {calls / tokens:5.2f} calls/token  {best * 1000:8.2f} ms")
+
+def main():
+    operands = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    report(f"flat expression of {operands} operands",
+           f"int main() {{ a = 1; b = 2; return {flat_expression(operands)}; }}")
+    report("generated program", generate_program(5000))
+
+if __name__ == '__main__':
+    main()
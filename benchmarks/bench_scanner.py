@@ -0,0 +1,36 @@
+# throughput of the scanner engines in MB/s
+#   python benchmarks/bench_scanner.py [statements]
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import SCANNERS
+from benchmarks.gen_source import generate_program
+
+def best_time(func, text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = generate_program(statements)
+    size_mb = len(text.encode()) / 1e6
+
+    streams = {name: [(t.lexeme, t.type) for t in scan(text)] for name, scan in SCANNERS.items()}
+    reference = streams['legacy']
+    for name, stream in streams.items():
+        if stream != reference:
+            raise SystemExit(f"{name} scanner does not match the legacy token stream")
+
+    print(f"input: {size_mb:.2f} MB, {len(reference)} tokens")
+    for name, scan in SCANNERS.items():
+        elapsed = best_time(scan, text)
+        print(f"{name:>8}: {size_mb / elapsed:8.2f} MB/s  ({elapsed:.3f} s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# loading a program or its tokens from the binary format of parser/serialize.py
+# against scanning and parsing its source again
+#   python benchmarks/bench_serialize.py [statements] [runs]
+import sys
+import os
+import time
+import mmap
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.scanner.token_buffer import TokenBuffer, BufferLexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.optimizer import optimize
+from ccompiler.parser.serialize import encode_program, encode_tokens, write_program, read_program, load_tokens
+from benchmarks.gen_source import generate_program
+
+def timed(func, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def nodes(tree):
+    """(class, start, end, name / value / operator) of every node, in pre-order"""
+    rows = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        kind = type(node).__name__
+        label = getattr(node, 'name', None) or getattr(node, 'value', None)
+        if kind in ('BinOp', 'UnaryOp'):
+            label = node.op.type
+        rows.append((kind, node.start, node.end, label))
+        children = {'Program': ['function'], 'Function': ['body'], 'Assign': ['right', 'left'],
+                    'Return': ['expr'], 'BinOp': ['right', 'left'], 'UnaryOp': ['expr']}.get(kind, [])
+        stack.extend(getattr(node, name) for name in children)
+        if kind == 'Block':
+            stack.extend(reversed(node.statements))
+    return rows
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    text = generate_program(statements, seed=0)
+    tree = Parser(Lexer(text, scanner='regex')).parse()
+    buffer = TokenBuffer.from_text(text)
+    data = encode_program(tree)
+    token_data = encode_tokens(buffer)
+
+    for program in (tree, optimize(tree)[0]):
+        if nodes(read_program(encode_program(program))) != nodes(program):
+            raise SystemExit("a decoded tree differs from the encoded one")
+    decoded = load_tokens(token_data)
+    if list(decoded.types) != list(buffer.types) or list(decoded.starts) != list(buffer.starts):
+        raise SystemExit("decoded tokens differ from the encoded ones")
+    print("decoded trees and tokens match the originals")
+
+    count = len(nodes(tree))
+    print(f"{statements} statements, {len(text) / 1e6:.1f} MB of source, {len(buffer)} tokens, {count} nodes")
+    print(f"  serialized program: {len(data) / 1e6:.1f} MB ({len(data) / count:.1f} bytes/node), "
+          f"tokens: {len(token_data) / 1e6:.1f} MB ({len(token_data) / len(buffer):.1f} bytes/token)")
+
+    parse = timed(lambda: Parser(Lexer(text, scanner='regex')).parse(), runs)
+    print(f"  re-parse the source:         {parse * 1000:8.1f} ms")
+    print(f"  encode the program:          {timed(lambda: encode_program(tree), runs) * 1000:8.1f} ms")
+    decode = timed(lambda: read_program(data), runs)
+    print(f"  decode the program:          {decode * 1000:8.1f} ms  ({parse / decode:.1f}x faster)")
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'program.bin')
+        with open(path, 'wb') as f:
+            write_program(tree, f)
+
+        def from_stream():
+            with open(path, 'rb') as f:
+                return read_program(f)
+
+        def from_mmap():
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return read_program(mapped)
+        print(f"  decode from a file stream:   {timed(from_stream, runs) * 1000:8.1f} ms")
+        print(f"  decode from a mapped file:   {timed(from_mmap, runs) * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(directory)
+
+    scan = timed(lambda: TokenBuffer.from_text(text), runs)
+    load = timed(lambda: load_tokens(token_data), runs)
+    print(f"  scan into a TokenBuffer:     {scan * 1000:8.1f} ms")
+    print(f"  decode the tokens:           {load * 1000:8.1f} ms  ({scan / load:.1f}x faster)")
+    reparse = timed(lambda: Parser(BufferLexer(load_tokens(token_data))).parse(), runs)
+    print(f"  parse the decoded tokens:    {reparse * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
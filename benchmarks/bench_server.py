@@ -0,0 +1,134 @@
+# load test for ccompiler.parser.server: latency percentiles and requests/sec over
+# concurrent connections, against starting a fresh process per evaluation
+#   python benchmarks/bench_server.py [requests] [connections] [workers] [programs]
+import sys
+import os
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.parser.batch import check_file
+from benchmarks.gen_source import generate_program
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRESH_PROCESS_RUNS = 10
+# would take hours and gigabytes without the server's integer size limit
+RUNAWAY = "int main() { x = 7; return x ** x ** x ** x ** x; }"
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def start_server(workers, cache_dir, timeout):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-m', 'ccompiler.parser.server', '--port', '0', '--workers', str(workers),
+        '--cache-dir', cache_dir, '--timeout', str(timeout), '--max-pending', '32',
+        cwd=PROJECT_ROOT, stderr=asyncio.subprocess.PIPE)
+    line = (await process.stderr.readline()).decode()
+    if not line.startswith("serving on "):
+        raise SystemExit(f"server did not start: {line}")
+    host, port = line.split()[2].rsplit(':', 1)
+    return process, host, int(port)
+
+
+async def client(host, port, requests, latencies):
+    """one connection sending its requests one after the other; returns the responses"""
+    reader, writer = await asyncio.open_connection(host, port)
+    responses = []
+    for request in requests:
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        responses.append(json.loads(await reader.readline()))
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def comparable(record):
+    return {key: value for key, value in record.items() if key not in ('file', 'seconds', 'cached', 'id')}
+
+
+async def run(total, connections, workers, programs, source_dir):
+    cache_dir = os.path.join(source_dir, 'cache')
+    paths = []
+    for seed in range(programs):
+        path = os.path.join(source_dir, f"program_{seed}.c")
+        text = generate_program(100, seed=seed, safe=seed % 5 != 0)
+        if seed % 7 == 3:
+            text = text.replace(";", "", 1)  # a syntax error
+        with open(path, 'w') as f:
+            f.write(text)
+        paths.append(path)
+    texts = []
+    for path in paths:
+        with open(path) as f:
+            texts.append(f.read())
+
+    process, host, port = await start_server(workers, cache_dir, timeout=2.0)
+    # keep reading the server's stderr so it can never block on a full pipe
+    log = asyncio.create_task(process.stderr.read())
+    try:
+        # the server answers like the batch checker, by text or by path, and stops a runaway program
+        checks = [{'id': i, 'source': text} for i, text in enumerate(texts)]
+        checks += [{'id': len(texts) + i, 'path': path} for i, path in enumerate(paths)]
+        responses = await client(host, port, checks, [])
+        for request, response in zip(checks, responses):
+            expected = comparable(check_file(paths[request['id'] % len(texts)]))
+            if response['id'] != request['id'] or comparable(response) != expected:
+                raise SystemExit(f"request {request['id']}: {response} differs from {expected}")
+        stopped, bad, after = await client(host, port, [{'source': RUNAWAY}, {'path': None, 'source': ''},
+                                                          {'source': texts[0]}], [])
+        if (stopped['status'] != 'budget_exceeded' or bad['status'] != 'bad_request'
+                or comparable(after) != comparable(responses[0])):
+            raise SystemExit(f"unexpected responses: {stopped}, {bad}, {after}")
+        print(f"server agrees with check_file on {len(checks)} requests; "
+              f"a runaway program was stopped: {stopped['error']}")
+
+        requests = [{'id': i, 'source': texts[i % programs]} for i in range(total)]
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(host, port, requests[i::connections], latencies)
+                               for i in range(connections)))
+        elapsed = time.perf_counter() - start
+    finally:
+        process.terminate()
+        await process.wait()
+        errors = await log
+        if errors:
+            print(errors.decode(), file=sys.stderr)
+
+    latencies.sort()
+    print(f"{total} requests over {connections} connections, {workers} workers, {programs} distinct programs")
+    print(f"  server:        {total / elapsed:8.1f} requests/sec  "
+          f"p50 {percentile(latencies, 0.5) * 1000:7.2f} ms  p99 {percentile(latencies, 0.99) * 1000:7.2f} ms")
+
+    fresh = []
+    for path in paths[:FRESH_PROCESS_RUNS]:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'ccompiler.parser.batch', path, '--workers', '1'], cwd=PROJECT_ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        fresh.append(time.perf_counter() - start)
+    fresh.sort()
+    print(f"  fresh process: {len(fresh) / sum(fresh):8.1f} requests/sec  "
+          f"p50 {percentile(fresh, 0.5) * 1000:7.2f} ms  (one at a time)")
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    programs = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    source_dir = tempfile.mkdtemp()
+    try:
+        asyncio.run(run(total, connections, workers, programs, source_dir))
+    finally:
+        shutil.rmtree(source_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# dict-backed Interpreter versus slot-resolved SlotInterpreter on variable-heavy code
+#   python benchmarks/bench_slots.py [statements] [runs]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser, Interpreter
+from ccompiler.parser.resolver import SlotInterpreter, resolve
+from benchmarks.gen_source import generate_program
+
+def variable_program(statements, names=20, reads=8, seed=0):
+    """every statement reads several variables, so variable access dominates"""
+    rng = random.Random(seed)
+    lines = [f"  v{i} = {i + 1};" for i in range(names)]
+    for _ in range(statements):
+        target = rng.randrange(names)
+        operands = " + ".join(f"v{rng.randrange(names)}" for _ in range(reads))
+        lines.append(f"  v{target} = ({operands}) % 1000;")
+    lines.append("  return v0;")
+    return "int main() {\n" + "\n".join(lines) + "\n}\n"
+
+def outcome(interpreter, tree):
+    try:
+        return 'ok', repr(interpreter.visit(tree))
+    except Exception as e:
+        return 'error', str(e)
+
+def timed(run, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    for seed in range(200):
+        tree = Parser(Lexer(generate_program(statements=30, depth=4, seed=seed), scanner='regex')).parse()
+        if outcome(Interpreter(None), tree) != outcome(SlotInterpreter(None), tree):
+            raise SystemExit(f"seed {seed}: SlotInterpreter differs from the Interpreter")
+    print("SlotInterpreter agrees with the Interpreter")
+
+    tree = Parser(Lexer(variable_program(statements), scanner='regex')).parse()
+    start = time.perf_counter()
+    resolved, resolution = resolve(tree)
+    print(f"{statements} statements, {resolution}, resolved in {(time.perf_counter() - start) * 1000:.1f} ms")
+    dict_time = timed(lambda: Interpreter(None).visit(tree), runs)
+    slot_time = timed(lambda: SlotInterpreter(None).visit(resolved), runs)
+    print(f"  dict frame: {dict_time * 1000:8.2f} ms/run")
+    print(f"  slot frame: {slot_time * 1000:8.2f} ms/run  ({dict_time / slot_time:.2f}x)")
+
+if __name__ == '__main__':
+    main()
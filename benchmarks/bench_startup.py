@@ -0,0 +1,91 @@
+# startup cost of short-lived invocations: import time of the entry modules
+# (checked against IMPORT_BUDGET_MS), a whole `python -m ccompiler.parser.batch` run, and
+# the token type comparisons the scanner and parser make for every token
+#   python benchmarks/bench_startup.py [runs]
+import sys
+import os
+import time
+import timeit
+import tempfile
+import compileall
+import subprocess
+from enum import Enum
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.tokens import TokenType as T, TOKEN_NAMES
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# cumulative `python -X importtime` of each module, in milliseconds; generous
+# enough for a slow machine, tight enough to catch an eagerly imported backend,
+# process pool or re (which brings enum along). parser.batch writes its records
+# with json, whose decoder imports re, so its budget includes them
+IMPORT_BUDGET_MS = {
+    'ccompiler.tokens': 2,
+    'ccompiler.scanner.lex_scanner': 12,
+    'ccompiler.parser.parser': 15,
+    'ccompiler.parser.batch': 50,
+}
+
+PROGRAM = "int main() { x = 2; y = x * (3 + 4); return y ** 2 % 7; }\n"
+
+# the Enum token types used to be; only here to compare against
+OldTokenType = Enum('OldTokenType', [(name, name) for name in TOKEN_NAMES])
+
+
+def import_ms(module):
+    """cumulative import time of module in a fresh interpreter, in milliseconds"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    # the module itself is imported last, so it is the last line
+    last = result.stderr.strip().splitlines()[-1]
+    return int(last.split('|')[1]) / 1000
+
+
+def process_ms(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def per_operation_ns(statement, namespace, number=1_000_000):
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    # every run should load bytecode, not compile the sources first
+    compileall.compile_dir(PROJECT_ROOT, quiet=1)
+
+    over = []
+    print(f"import time, best of {runs} fresh interpreters")
+    for module, budget in IMPORT_BUDGET_MS.items():
+        best = min(import_ms(module) for _ in range(runs))
+        print(f"  {module:<30} {best:7.2f} ms  (budget {budget} ms)")
+        if best > budget:
+            over.append(module)
+
+    with tempfile.TemporaryDirectory() as source_dir:
+        path = os.path.join(source_dir, 'program.c')
+        with open(path, 'w') as f:
+            f.write(PROGRAM)
+        bare = min(process_ms(['-c', 'pass']) for _ in range(runs))
+        batch = min(process_ms(['-m', 'ccompiler.parser.batch', path, '--workers', '1']) for _ in range(runs))
+    print(f"one-file `python -m ccompiler.parser.batch`: {batch:.1f} ms ({batch - bare:.1f} ms over a bare interpreter)")
+
+    print("per token type operation")
+    token = type('Token', (), {})()
+    for label, types in (('Enum', OldTokenType), ('int codes', T)):
+        token.type = types.SEMI
+        descriptions = {getattr(types, name): name for name in TOKEN_NAMES}
+        namespace = {'T': types, 'token': token, 'descriptions': descriptions}
+        equal = per_operation_ns("token.type == T.SEMI", namespace)
+        identical = per_operation_ns("token.type is T.SEMI", namespace)
+        lookup = per_operation_ns("descriptions[token.type]", namespace)
+        print(f"  {label:>9}:  == {equal:6.1f} ns   is {identical:6.1f} ns   dict lookup {lookup:6.1f} ns")
+
+    if over:
+        raise SystemExit(f"over the import time budget: {', '.join(over)}")
+
+if __name__ == '__main__':
+    main()
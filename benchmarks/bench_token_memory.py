@@ -0,0 +1,40 @@
+# memory held by Lexer's Token objects versus a TokenBuffer
+#   python benchmarks/bench_token_memory.py [statements]
+import sys
+import os
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.scanner.token_buffer import TokenBuffer
+from benchmarks.gen_source import generate_program
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak, elapsed
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = generate_program(statements)
+
+    lexer, lexer_retained, lexer_peak, lexer_time = measure(lambda: Lexer(text, scanner='regex'))
+    count = len(lexer.tokens) - 1  # without EOF
+    del lexer
+    buffer, buffer_retained, buffer_peak, buffer_time = measure(lambda: TokenBuffer.from_text(text))
+    if len(buffer) != count:
+        raise SystemExit("TokenBuffer and Lexer disagree on the number of tokens")
+
+    print(f"{count} tokens")
+    for name, retained, peak, elapsed in (('Token objects', lexer_retained, lexer_peak, lexer_time),
+                                          ('TokenBuffer', buffer_retained, buffer_peak, buffer_time)):
+        print(f"{name:>14}: {retained / count:7.1f} bytes/token retained, "
+              f"peak {peak / 1e6:7.2f} MB, built in {elapsed:.3f} s")
+    print(f"footprint ratio: {lexer_retained / buffer_retained:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# one program over many input rows: a scalar Interpreter per row versus
+# evaluate_batch, which runs every node once over whole numpy columns
+#   python benchmarks/bench_vectorized.py [rows] [scalar_rows]
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser, Interpreter
+from ccompiler.parser.vectorized import evaluate_batch, evaluate_rows
+from ccompiler.parser.budget import Budget
+
+import numpy
+
+SOURCE = """int main() {
+  rate = 3 + b % 7;
+  x = (a * rate - b) / (a % 5);
+  y = (x + 1) ** 2 ** 1 - a % 11;
+  return y / (b - a) + rate * 2;
+}
+"""
+
+def columns(rows, seed=0):
+    rng = numpy.random.default_rng(seed)
+    return {'a': rng.integers(-1000, 1000, rows), 'b': rng.integers(-1000, 1000, rows)}
+
+def interpret_rows(inputs):
+    # the scalar loop as written without batch mode: Interpreter.interpret()
+    # lexes and parses the source again for every row
+    names = list(inputs)
+    for row in zip(*(inputs[name] for name in names)):
+        interpreter = Interpreter(Parser(Lexer(SOURCE, scanner='regex')))
+        interpreter.variables.update(zip(names, row))
+        try:
+            interpreter.interpret()
+        except Exception:
+            pass
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    scalar_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    tree = Parser(Lexer(SOURCE, scanner='regex')).parse()
+
+    # differential check: every row gets the Interpreter's value or error message
+    sample = columns(5000, seed=1)
+    sample['a'][:3] = [0, 2 ** 40, -2 ** 62]
+    # and within budgets that stop some rows part way
+    for budget in (None, Budget(max_steps=3), Budget(max_int_bits=24)):
+        result = evaluate_batch(tree, sample, budget)
+        values, errors = evaluate_rows(tree, {name: column.tolist() for name, column in sample.items()}, budget)
+        for row, (value, error) in enumerate(zip(values, errors)):
+            if result.errors[row] != error or (error is None and repr(result.values[row].item()) != repr(value)):
+                raise SystemExit(f"row {row}: evaluate_batch differs from the Interpreter")
+    print(f"evaluate_batch agrees with the Interpreter ({result})")
+
+    inputs = columns(rows)
+    scalar = {name: column[:scalar_rows].tolist() for name, column in inputs.items()}
+
+    start = time.perf_counter()
+    interpret_rows(scalar)
+    interpret_rate = scalar_rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    evaluate_rows(tree, scalar)
+    visit_rate = scalar_rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = evaluate_batch(tree, inputs)
+    batch_rate = rows / (time.perf_counter() - start)
+
+    print(f"{rows} rows: {result}")
+    print(f"  Interpreter.interpret per row: {interpret_rate:12.0f} rows/s")
+    print(f"  Interpreter.visit per row:     {visit_rate:12.0f} rows/s")
+    print(f"  evaluate_batch:                {batch_rate:12.0f} rows/s  "
+          f"({batch_rate / interpret_rate:.0f}x, {batch_rate / visit_rate:.0f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import random
+
+OPERATORS = ['+', '-', '*', '/', '%', '**']
+
+def gen_expr(rng, names, depth, safe=False, operators=OPERATORS):
+    # random expression over integers and already assigned names.
+    # safe expressions never divide by a variable and only raise literals to
+    # a power, so they cannot fail at runtime
+    if depth <= 0 or rng.random() < 0.3:
+        if names and rng.random() < 0.5:
+            leaf = rng.choice(names)
+        else:
+            leaf = str(rng.randint(1, 99))
+        return f"-{leaf}" if rng.random() < 0.1 else leaf
+    op = rng.choice(operators)
+    if op == '**':
+        # keep powers small so evaluating generated programs stays cheap
+        base = str(rng.randint(1, 9)) if safe else f"({gen_expr(rng, names, depth - 1, operators=operators)})"
+        return f"{base} ** {rng.randint(0, 3)}"
+    left = gen_expr(rng, names, depth - 1, safe, operators)
+    if safe and op in ('/', '%'):
+        right = str(rng.randint(1, 99))
+    else:
+        right = gen_expr(rng, names, depth - 1, safe, operators)
+    return f"({left} {op} {right})"
+
+def generate_program(statements=1000, depth=3, seed=0, safe=False,
+                     operators=OPERATORS, comment_every=10, identifiers=50):
+    """
+    source text of an 'int main() { ... }' program with the given number of statements.
+    Safe programs also keep every assigned value below 1009 so that long
+    programs do not spend their time in huge integer arithmetic.
+    operators is the pool binary operators are drawn from (repeat one to weight it),
+    a comment line precedes every comment_every-th statement (0 for none) and
+    assignments cycle through the given number of identifiers.
+    """
+    rng = random.Random(seed)
+    lines = ["int main() {"]
+    names = []
+    for i in range(statements):
+        if comment_every and i % comment_every == 0:
+            lines.append(f"    // statement {i}")
+        name = f"v{i % identifiers}"
+        expr = gen_expr(rng, names, depth, safe, operators)
+        if safe:
+            expr = f"({expr}) % 1009"
+        lines.append(f"    {name} = {expr};")
+        if name not in names:
+            names.append(name)
+    lines.append(f"    return {gen_expr(rng, names, depth, safe, operators)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def deep_expression(depth, names=(), seed=0):
+    """fully balanced expression tree of + - * with 2 ** depth leaves, literals or the given names"""
+    rng = random.Random(seed)
+    leaves = [str(n) for n in range(1, 10)] + list(names)
+
+    def build(level):
+        if level == 0:
+            return rng.choice(leaves)
+        return f"({build(level - 1)} {rng.choice('+-*')} {build(level - 1)})"
+    return build(depth)
@@ -0,0 +1,162 @@
+# per-phase benchmark suite: scanner, Lexer, Parser and Interpreter timed
+# separately over several program sizes, with peak memory, saved as JSON
+#   python benchmarks/run_suite.py [--sizes 1000,5000,20000] [-o results.json]
+#   python benchmarks/run_suite.py --compare old.json new.json [--threshold 0.1]
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ccompiler.scanner.lex_scanner import Scanner, Lexer
+from ccompiler.parser.parser import Parser, Interpreter
+from benchmarks.gen_source import generate_program, OPERATORS
+
+SUITE_FORMAT = 1
+PHASES = ['scan', 'lex', 'parse', 'interpret']
+
+
+def interpret(tree):
+    return Interpreter(None).visit(tree)
+
+
+def phase_runs(text):
+    """
+    for each phase, a function that prepares its input (untimed) and one that runs it.
+    interpret visits an already parsed tree: Interpreter.interpret() would parse again
+    """
+    return {
+        'scan': (lambda: text, Scanner.scan_tokens),
+        'lex': (lambda: text, Lexer),
+        'parse': (lambda: Parser(Lexer(text)), lambda parser: parser.parse()),
+        'interpret': (lambda: Parser(Lexer(text)).parse(), interpret),
+    }
+
+
+def measure(prepare, run, repeat):
+    """best wall time over repeat runs, then peak traced memory of one more run"""
+    best = None
+    for _ in range(repeat):
+        data = prepare()
+        start = time.perf_counter()
+        run(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    data = prepare()
+    tracemalloc.start()
+    try:
+        run(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes, repeat=3, **generator):
+    results = []
+    for statements in sizes:
+        text = generate_program(statements, safe=True, **generator)
+        tokens = len(Scanner.scan_tokens(text))
+        for phase, (prepare, run) in phase_runs(text).items():
+            seconds, peak = measure(prepare, run, repeat)
+            results.append({
+                'statements': statements,
+                'bytes': len(text.encode()),
+                'tokens': tokens,
+                'phase': phase,
+                'seconds': seconds,
+                'peak_bytes': peak,
+            })
+            print(f"{statements:>8} statements  {phase:>9}: {seconds * 1000:10.2f} ms  "
+                  f"peak {peak / 1024:10.1f} KiB", file=sys.stderr)
+    return {
+        'format': SUITE_FORMAT,
+        'metadata': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'generator': generator,
+        },
+        'results': results,
+    }
+
+
+def compare(old, new, threshold):
+    """print time and memory ratios per (size, phase); returns the regressions beyond threshold"""
+    baseline = {(r['statements'], r['phase']): r for r in old['results']}
+    regressions = []
+    print(f"old: {old['metadata']['commit']}  new: {new['metadata']['commit']}")
+    if old['metadata']['generator'] != new['metadata']['generator']:
+        print("warning: the two runs used different generator settings")
+    for result in new['results']:
+        key = (result['statements'], result['phase'])
+        if key not in baseline:
+            continue
+        time_ratio = result['seconds'] / baseline[key]['seconds']
+        memory_ratio = result['peak_bytes'] / max(baseline[key]['peak_bytes'], 1)
+        flag = ''
+        if time_ratio > 1 + threshold or memory_ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print(f"{key[0]:>8} statements  {key[1]:>9}: time {time_ratio:5.2f}x  memory {memory_ratio:5.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the compiler phases")
+    arg_parser.add_argument('--sizes', default='1000,5000,20000', help="comma separated statement counts")
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--depth', type=int, default=3, help="expression depth")
+    arg_parser.add_argument('--operators', default=' '.join(OPERATORS),
+                            help="space separated operator pool, repeat an operator to weight it")
+    arg_parser.add_argument('--comment-every', type=int, default=10, help="0 for no comments")
+    arg_parser.add_argument('--identifiers', type=int, default=50)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('-o', '--output', help="write the JSON results here instead of stdout")
+    arg_parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files")
+    arg_parser.add_argument('--threshold', type=float, default=0.10,
+                            help="relative slowdown or memory growth counted as a regression")
+    args = arg_parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        return 1 if compare(old, new, args.threshold) else 0
+
+    report = run_suite(
+        [int(size) for size in args.sizes.split(',')],
+        repeat=args.repeat,
+        depth=args.depth,
+        seed=args.seed,
+        operators=args.operators.split(),
+        comment_every=args.comment_every,
+        identifiers=args.identifiers,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
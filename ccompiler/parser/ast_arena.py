@@ -0,0 +1,386 @@
+from array import array
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.token_buffer import TokenBuffer, CompactToken, TOKEN_TYPES, TYPE_CODES, EOF_TOKEN
+from ccompiler.parser.parser import ParserError, INFIX_OPERATORS, PREFIX_OPERATORS, PAREN, PREFIX, INFIX, runtime_error
+from ccompiler.parser.iterative import apply_binary
+
+# node kinds
+PROGRAM, FUNCTION, BLOCK, ASSIGN, RETURN, BINOP, UNARYOP, NUM, VAR = range(9)
+NO_NODE = -1
+
+# token type codes the parser compares against
+INTEGER, IDENTIFIER, LPAREN, RPAREN = (TYPE_CODES[t] for t in (T.INTEGER, T.IDENTIFIER, T.LPAREN, T.RPAREN))
+INT, RETURN_KEYWORD, ASSIGN_OP, SEMI = (TYPE_CODES[t] for t in (T.INT, T.RETURN, T.ASSIGN, T.SEMI))
+LBRACE, RBRACE, EOF = (TYPE_CODES[t] for t in (T.LBRACE, T.RBRACE, T.EOF))
+MINUS = TYPE_CODES[T.MINUS]
+INFIX_CODES = {TYPE_CODES[token_type]: binding for token_type, binding in INFIX_OPERATORS.items()}
+PREFIX_CODES = {TYPE_CODES[token_type]: binding for token_type, binding in PREFIX_OPERATORS.items()}
+
+
+class AstArena:
+    """
+    A whole tree in parallel typed arrays, one entry per node:
+      kinds   node kind (PROGRAM ... VAR)
+      ops     operator token type code (BINOP, UNARYOP)
+      lefts   first child: function, body, assigned Var, returned or unary operand, left operand
+      rights  second child: assigned value, right operand; for a BLOCK the statement count
+      values  index into values: Num value, Var / Function name; for a BLOCK the offset into items
+      starts, ends  source span of the node
+    Block statements are listed in items. Children are always added before their
+    parents, and a node's subtree is added in source order, so the node indices of a
+    parsed program are already in post-order.
+    """
+
+    def __init__(self, values, lexemes=None):
+        self.kinds = array('B')
+        self.ops = array('B')
+        self.lefts = array('i')
+        self.rights = array('i')
+        self.values = array('i')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.items = array('i')
+        self.constants = values  # shared with the TokenBuffer's lexeme table
+        self.lexemes = lexemes   # that table's lexemes, when there is one
+        self.op_tokens = {}      # operator code -> shared token, for views
+        self.root = NO_NODE
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, start, end, left=NO_NODE, right=NO_NODE, value=0, op=0):
+        self.kinds.append(kind)
+        self.ops.append(op)
+        self.lefts.append(left)
+        self.rights.append(right)
+        self.values.append(value)
+        self.starts.append(start)
+        self.ends.append(end)
+        return len(self.kinds) - 1
+
+    def children(self, index):
+        kind = self.kinds[index]
+        if kind == BLOCK:
+            offset = self.values[index]
+            return self.items[offset: offset + self.rights[index]].tolist()
+        if kind in (NUM, VAR):
+            return []
+        if kind in (ASSIGN, BINOP):
+            return [self.lefts[index], self.rights[index]]
+        return [self.lefts[index]]
+
+    def postorder(self, index=None):
+        """node indices below index (default: the root) in post-order, without recursion"""
+        stack = [(self.root if index is None else index, False)]
+        while stack:
+            index, expanded = stack.pop()
+            if expanded:
+                yield index
+                continue
+            stack.append((index, True))
+            children = self.children(index)
+            for child in reversed(children):
+                stack.append((child, False))
+
+    def node(self, index):
+        return VIEW_CLASSES[self.kinds[index]](self, index)
+
+    def tree(self):
+        return self.node(self.root)
+
+
+# ---- views: objects over one arena entry, created on demand ----
+# The classes are named after the parser's AST classes so that NodeVisitor
+# subclasses (e.g. the Interpreter) dispatch on them the same way, and have
+# their attributes, the token of a Num or Var included. Passes that cache
+# per tree (resolve, compile_python) hold the Program view weakly.
+
+def child(column):
+    return property(lambda self: self.arena.node(getattr(self.arena, column)[self.index]))
+
+def constant():
+    return property(lambda self: self.arena.constants[self.arena.values[self.index]])
+
+def leaf_token(token_type):
+    """the located token a Num or Var was parsed from, as the Parser's nodes keep it"""
+    def token(self):
+        arena = self.arena
+        value_id = arena.values[self.index]
+        value = arena.constants[value_id]
+        lexeme = arena.lexemes[value_id] if arena.lexemes is not None else str(value)
+        return CompactToken(lexeme, token_type, value, arena.starts[self.index], arena.ends[self.index])
+    return property(token)
+
+
+class NodeView:
+    __slots__ = ('arena', 'index', '__weakref__')
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def span(self):
+        return self.arena.starts[self.index], self.arena.ends[self.index]
+
+    @property
+    def start(self):
+        return self.arena.starts[self.index]
+
+    @property
+    def end(self):
+        return self.arena.ends[self.index]
+
+    @property
+    def op(self):
+        return self.arena.op_tokens[self.arena.ops[self.index]]
+
+class Program(NodeView):
+    __slots__ = ()
+    function = child('lefts')
+
+class Function(NodeView):
+    __slots__ = ()
+    name = constant()
+    body = child('lefts')
+
+class Block(NodeView):
+    __slots__ = ()
+
+    @property
+    def statements(self):
+        return [self.arena.node(index) for index in self.arena.children(self.index)]
+
+class Assign(NodeView):
+    __slots__ = ()
+    left = child('lefts')
+    right = child('rights')
+
+class Return(NodeView):
+    __slots__ = ()
+    expr = child('lefts')
+
+class BinOp(NodeView):
+    __slots__ = ()
+    left = child('lefts')
+    right = child('rights')
+
+class UnaryOp(NodeView):
+    __slots__ = ()
+    expr = child('lefts')
+
+class Num(NodeView):
+    __slots__ = ()
+    value = constant()
+    token = leaf_token(T.INTEGER)
+
+class Var(NodeView):
+    __slots__ = ()
+    name = constant()
+    token = leaf_token(T.IDENTIFIER)
+
+VIEW_CLASSES = [Program, Function, Block, Assign, Return, BinOp, UnaryOp, Num, Var]
+
+
+class ArenaParser:
+    """
+    Parser over a TokenBuffer that writes an AstArena: it reads type codes
+    straight from the buffer's arrays, creates no token or node objects and
+    parses expressions with explicit stacks. Trees and syntax errors are the
+    same as Parser's.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.types = buffer.types
+        self.pos = 0
+        self.arena = AstArena(buffer.values, buffer.lexemes)
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(TokenBuffer.from_text(text))
+
+    def type_at(self, pos):
+        return self.types[pos] if pos < len(self.types) else EOF
+
+    def end_of(self, pos):
+        buffer = self.buffer
+        return buffer.starts[pos] + len(buffer.lexemes[buffer.lexeme_ids[pos]])
+
+    def error(self, message=None):
+        if message is None:
+            message = "Unexpected token"
+        buffer = self.buffer
+        if self.pos < len(self.types):
+            token, start = buffer.token(self.pos), buffer.starts[self.pos]
+        else:
+            # like the Lexer's EOF token: right after the last token
+            token, start = EOF_TOKEN, self.end_of(self.pos - 1) if self.pos else None
+        raise ParserError(message, token, buffer.line_index, start)
+
+    def eat(self, code):
+        if self.type_at(self.pos) == code:
+            self.pos += 1
+        else:
+            self.error(f"Expected '{TOKEN_TYPES[code]}', got '{TOKEN_TYPES[self.type_at(self.pos)]}'")
+
+    def parse(self):
+        arena = self.arena
+        start = self.pos
+        self.eat(INT)
+        name = self.pos
+        self.eat(IDENTIFIER)
+        self.eat(LPAREN)
+        self.eat(RPAREN)
+        self.eat(LBRACE)
+        body = self.parse_block()
+        self.eat(RBRACE)
+        end = self.end_of(self.pos - 1)
+        function = arena.add(FUNCTION, self.buffer.starts[start], end, left=body,
+                             value=self.buffer.lexeme_ids[name])
+        arena.root = arena.add(PROGRAM, self.buffer.starts[start], end, left=function)
+        if self.type_at(self.pos) != EOF:
+            self.error("Unexpected tokens after end of program")
+        return arena
+
+    def parse_block(self):
+        statements = []
+        while self.type_at(self.pos) != RBRACE:
+            statements.append(self.parse_statement())
+        arena = self.arena
+        if not statements or arena.kinds[statements[-1]] != RETURN:
+            self.error("Function body must end with a return statement")
+        offset = len(arena.items)
+        arena.items.extend(statements)
+        return arena.add(BLOCK, arena.starts[statements[0]], arena.ends[statements[-1]],
+                         right=len(statements), value=offset)
+
+    def parse_statement(self):
+        arena = self.arena
+        pos = self.pos
+        code = self.type_at(pos)
+        if code == IDENTIFIER and self.type_at(pos + 1) == ASSIGN_OP:
+            target = arena.add(VAR, self.buffer.starts[pos], self.end_of(pos), value=self.buffer.lexeme_ids[pos])
+            self.pos += 2
+            expr = self.expr()
+            self.eat(SEMI)
+            return arena.add(ASSIGN, self.buffer.starts[pos], self.end_of(self.pos - 1), left=target, right=expr)
+        if code == RETURN_KEYWORD:
+            self.pos += 1
+            expr = self.expr()
+            self.eat(SEMI)
+            return arena.add(RETURN, self.buffer.starts[pos], self.end_of(self.pos - 1), left=expr)
+        self.error("Unexpected token")
+
+    def expr(self):
+        """Parser.iterative_expr over type codes"""
+        arena = self.arena
+        buffer = self.buffer
+        nodes = []
+        ops = []
+        min_bp = 0
+        while True:
+            pos = self.pos
+            code = self.type_at(pos)
+            if code == INTEGER or code == IDENTIFIER:
+                nodes.append(arena.add(NUM if code == INTEGER else VAR, buffer.starts[pos], self.end_of(pos),
+                                       value=buffer.lexeme_ids[pos]))
+                self.pos += 1
+            elif code == LPAREN:
+                self.pos += 1
+                ops.append((pos, 0, PAREN))
+                min_bp = 0
+                continue
+            else:
+                prefix_bp = PREFIX_CODES.get(code)
+                if prefix_bp is None or prefix_bp < min_bp:
+                    self.error(f"Expected an operand, got '{TOKEN_TYPES[code]}'")
+                self.pos += 1
+                ops.append((pos, prefix_bp, PREFIX))
+                min_bp = prefix_bp
+                continue
+
+            while True:
+                pos = self.pos
+                code = self.type_at(pos)
+                binding = INFIX_CODES.get(code)
+                left_bp = -1 if binding is None else binding[0]
+                while ops and ops[-1][2] != PAREN and ops[-1][1] > left_bp:
+                    op_pos, _, kind = ops.pop()
+                    op = self.types[op_pos]
+                    if op not in arena.op_tokens:
+                        arena.op_tokens[op] = buffer.token(op_pos)
+                    operand = nodes.pop()
+                    if kind == PREFIX:
+                        nodes.append(arena.add(UNARYOP, buffer.starts[op_pos], arena.ends[operand],
+                                               left=operand, op=op))
+                    else:
+                        left = nodes.pop()
+                        nodes.append(arena.add(BINOP, arena.starts[left], arena.ends[operand],
+                                               left=left, right=operand, op=op))
+                if binding is not None:
+                    self.pos += 1
+                    ops.append((pos, binding[1], INFIX))
+                    min_bp = binding[1]
+                    break
+                if not ops:
+                    return nodes.pop()
+                self.eat(RPAREN)
+                # a parenthesized expression's span includes its parentheses
+                arena.starts[nodes[-1]] = buffer.starts[ops.pop()[0]]
+                arena.ends[nodes[-1]] = self.end_of(self.pos - 1)
+
+
+class ArenaInterpreter:
+    """runs an AstArena built by ArenaParser with the Interpreter's results and errors, without recursion"""
+
+    def __init__(self, arena, budget=None):
+        self.arena = arena
+        self.variables = {}
+        self.budget = budget
+
+    def run(self):
+        arena = self.arena
+        block = arena.lefts[arena.lefts[arena.root]]
+        result = None
+        for statement in arena.children(block):
+            if arena.kinds[statement] == ASSIGN:
+                result = self.evaluate(arena.rights[statement])
+                self.variables[arena.constants[arena.values[arena.lefts[statement]]]] = result
+            else:
+                result = self.evaluate(arena.lefts[statement])
+        return result
+
+    def evaluate(self, index):
+        arena = self.arena
+        kinds, ops, values, constants = arena.kinds, arena.ops, arena.values, arena.constants
+        variables = self.variables
+        budget = self.budget
+        # an expression subtree is the index range from its leftmost leaf up to its root
+        # (see AstArena), so a plain loop over that range visits it in post-order
+        first = index
+        while kinds[first] == BINOP or kinds[first] == UNARYOP:
+            first = arena.lefts[first]
+        stack = []
+        for i in range(first, index + 1):
+            kind = kinds[i]
+            if kind == NUM:
+                stack.append(constants[values[i]])
+            elif kind == VAR:
+                name = constants[values[i]]
+                if name not in variables:
+                    raise runtime_error(f"Undefined variable: {name}", arena.starts[i], arena.ends[i])
+                stack.append(variables[name])
+            elif kind == BINOP:
+                right_val = stack.pop()
+                if budget is not None:
+                    stack.append(budget.binary(TOKEN_TYPES[ops[i]], stack.pop(), right_val,
+                                               arena.starts[i], arena.ends[i]))
+                else:
+                    stack.append(apply_binary(TOKEN_TYPES[ops[i]], stack.pop(), right_val,
+                                              arena.starts[i], arena.ends[i]))
+            elif budget is not None:
+                stack.append(budget.unary(TOKEN_TYPES[ops[i]], stack.pop(), arena.starts[i], arena.ends[i]))
+            else:
+                stack.append((-1 if ops[i] == MINUS else +1) * stack.pop())
+        return stack[0]
@@ -0,0 +1,45 @@
+from ccompiler.parser.parser import Interpreter
+
+BACKENDS = ('tree', 'iterative', 'slot', 'vm', 'closure', 'python')
+
+
+def compile_program(tree, backend='tree', budget=None):
+    """
+    prepare a parsed Program for the chosen execution backend and return a
+    zero-argument callable that runs it; compile once, call many times.
+    With a Budget (parser/budget.py) every run starts it and stays within it
+    """
+    run = compile_backend(tree, backend, budget)
+    if budget is None:
+        return run
+
+    def run_within_budget():
+        budget.start()
+        return run()
+    return run_within_budget
+
+
+def compile_backend(tree, backend, budget):
+    # each backend is imported on first use, so a run only loads the one it needs
+    if backend == 'tree':
+        return lambda: Interpreter(None, budget=budget).visit(tree)
+    if backend == 'iterative':
+        from ccompiler.parser.iterative import IterativeInterpreter
+        return lambda: IterativeInterpreter(None, budget=budget).visit(tree)
+    if backend == 'slot':
+        from ccompiler.parser.resolver import SlotInterpreter, resolve
+        resolved, resolution = resolve(tree)
+        resolution.check()
+        return lambda: SlotInterpreter(None, budget=budget).visit(resolved)
+    if backend == 'vm':
+        from ccompiler.parser import vm
+        bytecode = vm.compile_program(tree)
+        machine = vm.VM(budget)
+        return lambda: machine.run(bytecode)
+    if backend == 'closure':
+        from ccompiler.parser.closures import compile_closures
+        return compile_closures(tree, budget)
+    if backend == 'python':
+        from ccompiler.parser.codegen import compile_python
+        return compile_python(tree, budget)
+    raise ValueError(f"Unknown backend: {backend}")
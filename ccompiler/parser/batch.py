@@ -0,0 +1,150 @@
+# non-interactive batch compiler:
+#   python -m ccompiler.parser.batch FILE_OR_DIR... [--workers N] [--chunksize K] [--backend tree] [--profile]
+#                          [--max-steps N] [--max-int-bits B] [--deadline S] [--max-memory-mb M]
+# prints one JSON line per file on stdout and a throughput summary on stderr
+import sys
+import os
+import json
+import math
+import time
+import fnmatch
+import argparse
+from ccompiler.scanner.file_input import SourceFile
+from ccompiler.parser.parser import Parser, ParserError
+from ccompiler.parser.backends import BACKENDS, compile_program
+from ccompiler.parser.budget import BudgetExceeded, DEFAULT_MAX_INT_BITS, add_budget_arguments, budget_from_args
+
+
+def find_sources(paths, pattern):
+    """explicit files as given, directories searched recursively for pattern"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if fnmatch.fnmatch(name, pattern):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def json_value(value):
+    """results that JSON cannot carry exactly (inf, nan, complex, huge ints) become strings"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    if isinstance(value, int):
+        try:
+            str(value)
+        except ValueError:  # more digits than int -> str allows
+            return f"<int of {value.bit_length()} bits>"
+        return value
+    if isinstance(value, (float, type(None))):
+        return value
+    return repr(value)
+
+
+def check_file(path, backend='tree', optimized=False, profiled=False, budget=None):
+    """Lexer -> Parser -> execution for one file, as a JSON-ready dict; budget limits the execution"""
+    start = time.perf_counter()
+    record = {'file': path}
+    lexer = tree = None
+    try:
+        lexer = SourceFile(path).lexer()
+        tree = Parser(lexer).parse()
+        if optimized:
+            from ccompiler.parser.optimizer import optimize
+            tree, _ = optimize(tree, budget)
+        # a read of a variable every run fails at is reported without running:
+        # a ResolveError, a runtime_error like the one the run would raise
+        from ccompiler.parser.resolver import resolve
+        resolve(tree)[1].check()
+        result = compile_program(tree, backend, budget)()
+        record['status'] = 'ok'
+        record['result'] = json_value(result)
+    except ParserError as e:
+        record['status'] = 'syntax_error'
+        record['error'] = e.message
+        if e.line is not None:
+            record['line'], record['column'] = e.line, e.column
+    except (OSError, UnicodeDecodeError) as e:
+        record['status'] = 'io_error'
+        record['error'] = str(e)
+    except Exception as e:
+        if isinstance(e, BudgetExceeded):
+            record['status'] = 'budget_exceeded'
+            record['limit'] = e.limit
+        else:
+            record['status'] = 'runtime_error'
+        record['error'] = str(e)
+        # the whole file was scanned by the parse, so its line index is complete
+        if getattr(e, 'start', None) is not None:
+            record['line'], record['column'] = lexer.line_index.location(e.start)
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    if profiled and tree is not None and record['status'] != 'budget_exceeded':
+        # a separate, instrumented run of the tree Interpreter on the tree just run,
+        # within the same (restarted) budget
+        from ccompiler.parser.profiling import profile_tree
+        record['profile'] = profile_tree(tree, budget=budget).to_dict()
+    return record
+
+
+def check_file_with(args):
+    # ProcessPoolExecutor.map passes one argument per call
+    return check_file(*args)
+
+
+def run_batch(paths, workers=None, chunksize=1, backend='tree', optimized=False, profiled=False,
+              out=sys.stdout, budget=None):
+    """
+    check every file, streaming one JSON line per file to out in input order;
+    returns (file count, status counts, elapsed seconds)
+    """
+    jobs = ((path, backend, optimized, profiled, budget) for path in paths)
+    counts = {}
+    count = 0
+    start = time.perf_counter()
+
+    if workers == 1:
+        records = map(check_file_with, jobs)
+        executor = None
+    else:
+        # process pools take longer to import than a small batch takes to check
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        records = executor.map(check_file_with, jobs, chunksize=chunksize)
+    try:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            counts[record['status']] = counts.get(record['status'], 0) + 1
+            count += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return count, counts, time.perf_counter() - start
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Check and evaluate many source files")
+    arg_parser.add_argument('paths', nargs='+', help="source files or directories")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help="worker processes, 1 runs everything in this process")
+    arg_parser.add_argument('--chunksize', type=int, default=8, help="files handed to a worker at a time")
+    arg_parser.add_argument('--backend', choices=BACKENDS, default='tree')
+    arg_parser.add_argument('--optimize', action='store_true', help="run the optimizer before executing")
+    arg_parser.add_argument('--profile', action='store_true',
+                            help="add the interpret phase's time and allocations and node/visit counts to each record")
+    arg_parser.add_argument('--pattern', default='*.c', help="file name pattern used inside directories")
+    add_budget_arguments(arg_parser, defaults={'max_int_bits': DEFAULT_MAX_INT_BITS})
+    args = arg_parser.parse_args(argv)
+
+    paths = find_sources(args.paths, args.pattern)
+    count, counts, elapsed = run_batch(paths, args.workers, args.chunksize, args.backend,
+                                       args.optimize, args.profile, budget=budget_from_args(args))
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} files in {elapsed:.2f} s ({rate:.1f} files/sec): {summary}", file=sys.stderr)
+    return 0 if counts.get('ok', 0) == count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
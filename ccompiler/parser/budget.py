@@ -0,0 +1,156 @@
+import os
+import time
+import operator
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.iterative import apply_binary
+
+# the clock, cancellation and memory are looked at once every this many steps ...
+CHECK_EVERY = 256
+# ... and before computing any integer of at least this many bits
+LARGE_BITS = 1 << 20
+
+# the command line tools refuse integers beyond this unless told otherwise: the
+# deadline is only looked at between steps, so one 9 ** 9 ** 9 would outlast it
+DEFAULT_MAX_INT_BITS = 1 << 20
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# operators that cannot fail on their own run as one C call; division and
+# modulo go through apply_binary for its zero checks
+NATIVE = {T.PLUS: operator.add, T.MINUS: operator.sub, T.MUL: operator.mul, T.POWER: operator.pow}
+
+
+def resident_bytes():
+    """resident memory of this process, None where /proc is not available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class BudgetExceeded(Exception):
+    """runtime error of an evaluation that ran out of its Budget, located like runtime_error's"""
+
+    def __init__(self, message, limit, start=None, end=None):
+        super().__init__(message)
+        self.limit = limit  # 'steps', 'int_bits', 'deadline', 'memory' or 'cancelled'
+        self.start = start
+        self.end = end
+
+
+class Budget:
+    """
+    Resource limits for one evaluation, None meaning unlimited:
+    max_steps operators evaluated (every BinOp and UnaryOp is one step),
+    max_int_bits bits of any integer result, deadline seconds of wall-clock
+    time from start(), and max_memory bytes of resident memory of the process.
+
+    Backends given a budget send every operator through binary() / unary(),
+    which raise BudgetExceeded with a "Runtime Error: ..." message. A power is
+    refused before it is computed when its result would have too many bits;
+    that limit is what bounds the time of a single operation, the clock and
+    memory are only looked at between operations. cancel() may be called from
+    another thread and stops the evaluation at its next check.
+    """
+
+    def __init__(self, max_steps=None, max_int_bits=None, deadline=None, max_memory=None):
+        self.max_steps = max_steps
+        self.max_int_bits = max_int_bits
+        self.deadline = deadline
+        self.max_memory = max_memory
+        self.start()
+
+    def start(self):
+        """reset the step count and start the clock; call before every run"""
+        self.steps = 0
+        self.cancelled = False
+        self.expires = time.monotonic() + self.deadline if self.deadline is not None else None
+        # binary() compares against these without looking at which limits are set
+        self.next_check = self.checkpoint()
+        self.bits_limit = self.max_int_bits if self.max_int_bits is not None else float('inf')
+        return self
+
+    def checkpoint(self):
+        """step count at which tick() runs next"""
+        if self.max_steps is None:
+            return self.steps + CHECK_EVERY
+        return min(self.steps + CHECK_EVERY, self.max_steps + 1)
+
+    def tick(self, start=None, end=None):
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise BudgetExceeded(f"Runtime Error: Step limit exceeded ({self.max_steps} steps)", 'steps', start, end)
+        self.check(start, end)
+        self.next_check = self.checkpoint()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self, start=None, end=None, needed=0):
+        """cancellation, the deadline and memory, with needed more bytes about to be allocated"""
+        if self.cancelled:
+            raise BudgetExceeded("Runtime Error: Evaluation cancelled", 'cancelled', start, end)
+        if self.expires is not None and time.monotonic() > self.expires:
+            raise BudgetExceeded(f"Runtime Error: Deadline exceeded ({self.deadline} s)", 'deadline', start, end)
+        if self.max_memory is not None:
+            used = resident_bytes()
+            if used is not None and used + needed > self.max_memory:
+                raise BudgetExceeded(f"Runtime Error: Memory limit exceeded ({self.max_memory} bytes)",
+                                     'memory', start, end)
+
+    def check_bits(self, bits, start=None, end=None):
+        if self.max_int_bits is not None and bits > self.max_int_bits:
+            raise BudgetExceeded(f"Runtime Error: Integer result too large (over {self.max_int_bits} bits)",
+                                 'int_bits', start, end)
+
+    def binary(self, op_type, left, right, start=None, end=None):
+        """left op right like Interpreter.visit_BinOp, within the budget"""
+        self.steps += 1
+        if self.steps >= self.next_check:
+            self.tick(start, end)
+
+        if (op_type is T.POWER or op_type is T.MUL) and type(left) is int and type(right) is int:
+            bits = 0
+            if op_type is T.MUL:
+                bits = left.bit_length() + right.bit_length()
+            elif right > 1 and (left > 1 or left < -1):
+                # |left| >= 2 ** (b - 1), so the result has at least this many bits
+                bits = (left.bit_length() - 1) * right + 1
+                self.check_bits(bits, start, end)
+            if bits >= LARGE_BITS:
+                self.check(start, end, bits // 8)
+
+        operation = NATIVE.get(op_type)
+        if operation is None:
+            value = apply_binary(op_type, left, right, start, end)
+        else:
+            value = operation(left, right)
+        if type(value) is int and value.bit_length() > self.bits_limit:
+            self.check_bits(value.bit_length(), start, end)
+        return value
+
+    def unary(self, op_type, value, start=None, end=None):
+        """Interpreter.visit_UnaryOp's multiplication by +1 or -1, as one step"""
+        return self.binary(T.MUL, -1 if op_type == T.MINUS else +1, value, start, end)
+
+
+def add_budget_arguments(arg_parser, defaults=None):
+    """--max-steps, --max-int-bits, --deadline and --max-memory-mb options, defaults by option dest"""
+    defaults = defaults or {}
+    arg_parser.add_argument('--max-steps', type=int, default=defaults.get('max_steps'),
+                            help="operators a program may evaluate")
+    arg_parser.add_argument('--max-int-bits', type=int, default=defaults.get('max_int_bits'),
+                            help="bits of the largest integer a program may compute")
+    arg_parser.add_argument('--deadline', type=float, default=defaults.get('deadline'),
+                            help="seconds a program may run")
+    arg_parser.add_argument('--max-memory-mb', type=int, default=defaults.get('max_memory_mb'),
+                            help="resident memory ceiling of the evaluating process, in MB")
+
+
+def budget_from_args(args):
+    """Budget for the parsed options, None when none of them is set"""
+    limits = (args.max_steps, args.max_int_bits, args.deadline, args.max_memory_mb)
+    if all(limit is None for limit in limits):
+        return None
+    max_memory = args.max_memory_mb * 1024 * 1024 if args.max_memory_mb is not None else None
+    return Budget(args.max_steps, args.max_int_bits, args.deadline, max_memory)
@@ -0,0 +1,171 @@
+from operator import itemgetter
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.parser import NodeVisitor, runtime_error
+from ccompiler.parser.vm import UNSET
+
+# the factories of operators that can fail also get the node's source span
+CHECKED = (T.DIV, T.MOD)
+
+
+def division_by_zero(left, span):
+    def run(frame):
+        left(frame)  # errors in the left operand come first, as in visit_BinOp
+        raise runtime_error("Runtime Error: Division by zero", *span)
+    return run
+
+def modulo_by_zero(left, span):
+    def run(frame):
+        left(frame)
+        raise runtime_error("Runtime Error: Modulo by zero", *span)
+    return run
+
+# one closure factory per operator for the general case ...
+BINARY = {
+    T.PLUS: lambda l, r: lambda f: l(f) + r(f),
+    T.MINUS: lambda l, r: lambda f: l(f) - r(f),
+    T.MUL: lambda l, r: lambda f: l(f) * r(f),
+    T.POWER: lambda l, r: lambda f: l(f) ** r(f),
+}
+
+# ... and for a constant right operand, which is captured as a plain value
+BINARY_CONST = {
+    T.PLUS: lambda l, c: lambda f: l(f) + c,
+    T.MINUS: lambda l, c: lambda f: l(f) - c,
+    T.MUL: lambda l, c: lambda f: l(f) * c,
+    T.POWER: lambda l, c: lambda f: l(f) ** c,
+    # the zero check on a constant divisor is done once, at compile time
+    T.DIV: lambda l, c, span: (lambda f: l(f) / c) if c != 0 else division_by_zero(l, span),
+    T.MOD: lambda l, c, span: (lambda f: l(f) % c) if c != 0 else modulo_by_zero(l, span),
+}
+
+def divide(l, r, span):
+    def run(f):
+        left = l(f)
+        right = r(f)
+        if right == 0:
+            raise runtime_error("Runtime Error: Division by zero", *span)
+        return left / right
+    return run
+
+def modulo(l, r, span):
+    def run(f):
+        left = l(f)
+        right = r(f)
+        if right == 0:
+            raise runtime_error("Runtime Error: Modulo by zero", *span)
+        return left % right
+    return run
+
+BINARY[T.DIV] = divide
+BINARY[T.MOD] = modulo
+
+
+class ClosureCompiler(NodeVisitor):
+    """
+    Turn an AST into nested Python closures, once. Operators, constants and
+    variable slots are resolved while compiling, so running the program is a
+    single call with no per-node dispatch.
+    """
+
+    def __init__(self, budget=None):
+        self.slots = {}
+        self.assigned = set()  # names certainly assigned at the current point of the block
+        # budget: a Budget (parser/budget.py) every operator is checked against;
+        # the closures hold on to it, whoever runs them starts it
+        self.budget = budget
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def visit_Program(self, node):
+        return self.visit(node.function)
+
+    def visit_Function(self, node):
+        return self.visit(node.body)
+
+    def visit_Block(self, node):
+        statements = [self.visit(statement) for statement in node.statements]
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(frame):
+            result = None
+            for statement in statements:
+                result = statement(frame)
+            return result
+        return block
+
+    def visit_Assign(self, node):
+        expr = self.visit(node.right)
+        slot = self.slot(node.left.name)
+        self.assigned.add(node.left.name)
+
+        def assign(frame):
+            value = frame[slot] = expr(frame)
+            return value
+        return assign
+
+    def visit_Return(self, node):
+        return self.visit(node.expr)
+
+    def visit_Var(self, node):
+        name = node.name
+        slot = self.slot(name)
+        if name in self.assigned:
+            # the block is straight-line code, so this read can never fail
+            return itemgetter(slot)
+        start, end = node.start, node.end
+
+        def var(frame):
+            value = frame[slot]
+            if value is UNSET:
+                raise runtime_error(f"Undefined variable: {name}", start, end)
+            return value
+        return var
+
+    def visit_Num(self, node):
+        value = node.value
+        return lambda frame: value
+
+    def visit_BinOp(self, node):
+        op_type = node.op.type
+        if op_type not in BINARY:
+            raise Exception(f"Unknown operator: {op_type}")
+        left = self.visit(node.left)
+        if self.budget is not None:
+            return self.budgeted_binary(op_type, left, self.visit(node.right), node.start, node.end)
+        span = ((node.start, node.end),) if op_type in CHECKED else ()
+        if type(node.right).__name__ == 'Num':
+            return BINARY_CONST[op_type](left, node.right.value, *span)
+        return BINARY[op_type](left, self.visit(node.right), *span)
+
+    def budgeted_binary(self, op_type, l, r, start, end):
+        binary = self.budget.binary
+        return lambda f: binary(op_type, l(f), r(f), start, end)
+
+    def visit_UnaryOp(self, node):
+        expr = self.visit(node.expr)
+        if self.budget is not None:
+            unary = self.budget.unary
+            op_type, start, end = node.op.type, node.start, node.end
+            return lambda frame: unary(op_type, expr(frame), start, end)
+        if node.op.type == T.MINUS:
+            return lambda frame: -1 * expr(frame)
+        return lambda frame: +1 * expr(frame)
+
+
+class CompiledProgram:
+    def __init__(self, root, slot_count):
+        self.root = root
+        self.slot_count = slot_count
+
+    def __call__(self):
+        return self.root([UNSET] * self.slot_count)
+
+
+def compile_closures(tree, budget=None):
+    compiler = ClosureCompiler(budget)
+    root = compiler.visit(tree)
+    return CompiledProgram(root, len(compiler.slots))
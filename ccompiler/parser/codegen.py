@@ -0,0 +1,164 @@
+import ast
+import weakref
+from functools import partial
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.parser import NodeVisitor, runtime_error
+
+# operators CPython can run directly; '**' keeps its right associativity
+# because the generated ast mirrors our tree
+PYTHON_OPS = {
+    T.PLUS: ast.Add,
+    T.MINUS: ast.Sub,
+    T.MUL: ast.Mult,
+    T.POWER: ast.Pow,
+    T.DIV: ast.Div,
+    T.MOD: ast.Mod,
+}
+
+
+# helpers the generated code calls where our semantics differ from Python's;
+# start / end are the source span of the node, for locating their errors
+def _div(left, right, start=None, end=None):
+    if right == 0:
+        raise runtime_error("Runtime Error: Division by zero", start, end)
+    return left / right
+
+def _mod(left, right, start=None, end=None):
+    if right == 0:
+        raise runtime_error("Runtime Error: Modulo by zero", start, end)
+    return left % right
+
+def _undefined(name, start=None, end=None):
+    raise runtime_error(f"Undefined variable: {name}", start, end)
+
+HELPERS = {'_div': _div, '_mod': _mod, '_undefined': _undefined, '_T': T}
+CHECKED_OPS = {T.DIV: '_div', T.MOD: '_mod'}
+
+
+class PythonCodeGenerator(NodeVisitor):
+    """
+    Translate a Program into a Python ast.Module defining one function,
+    so compile() turns it into a code object that CPython runs natively.
+    Variables become locals named after their slot (identifiers in our
+    language are not always valid Python names).
+    A budgeted function takes a Budget argument and sends every operator
+    through it instead of running it natively.
+    """
+
+    FUNCTION_NAME = '__program__'
+    BUDGET = '_budget'
+
+    def __init__(self, budgeted=False):
+        self.slots = {}
+        self.assigned = set()
+        self.budgeted = budgeted
+
+    def local(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return f"v{self.slots[name]}"
+
+    def call(self, helper, args):
+        return ast.Call(func=ast.Name(id=helper, ctx=ast.Load()), args=args, keywords=[])
+
+    def span(self, node):
+        return [ast.Constant(value=node.start), ast.Constant(value=node.end)]
+
+    def budget_call(self, method, op_type, args, node):
+        # _budget.method(_T.NAME, *args, start, end)
+        func = ast.Attribute(value=ast.Name(id=self.BUDGET, ctx=ast.Load()), attr=method, ctx=ast.Load())
+        op = ast.Attribute(value=ast.Name(id='_T', ctx=ast.Load()), attr=op_type.name, ctx=ast.Load())
+        return ast.Call(func=func, args=[op, *args, *self.span(node)], keywords=[])
+
+    def generate(self, tree):
+        body = self.visit(tree) or [ast.Return(value=ast.Constant(value=None))]
+        # start from a parsed stub so the FunctionDef fields fit the running Python version
+        parameters = self.BUDGET if self.budgeted else ""
+        module = ast.parse(f"def {self.FUNCTION_NAME}({parameters}): pass")
+        module.body[0].body = body
+        return ast.fix_missing_locations(module)
+
+    def visit_Program(self, node):
+        return self.visit(node.function)
+
+    def visit_Function(self, node):
+        return self.visit(node.body)
+
+    def visit_Block(self, node):
+        body = []
+        last = len(node.statements) - 1
+        for i, statement in enumerate(node.statements):
+            kind = type(statement).__name__
+            if kind == 'Assign':
+                value = self.visit(statement.right)
+                target = self.local(statement.left.name)
+                self.assigned.add(statement.left.name)
+                body.append(ast.Assign(targets=[ast.Name(id=target, ctx=ast.Store())], value=value))
+                if i == last:
+                    body.append(ast.Return(value=ast.Name(id=target, ctx=ast.Load())))
+            else:
+                value = self.visit(statement)
+                # earlier return statements are still evaluated, like visit_Block does
+                body.append(ast.Return(value=value) if i == last else ast.Expr(value=value))
+        return body
+
+    def visit_Return(self, node):
+        return self.visit(node.expr)
+
+    def visit_Var(self, node):
+        if node.name not in self.assigned:
+            # straight-line code: a read before any assignment always fails
+            return self.call('_undefined', [ast.Constant(value=node.name), *self.span(node)])
+        return ast.Name(id=self.local(node.name), ctx=ast.Load())
+
+    def visit_Num(self, node):
+        return ast.Constant(value=node.value)
+
+    def visit_BinOp(self, node):
+        op_type = node.op.type
+        if op_type not in PYTHON_OPS:
+            raise Exception(f"Unknown operator: {op_type}")
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if self.budgeted:
+            return self.budget_call('binary', op_type, [left, right], node)
+        if op_type in CHECKED_OPS:
+            constant = isinstance(right, ast.Constant)
+            if not constant or right.value == 0:
+                return self.call(CHECKED_OPS[op_type], [left, right, *self.span(node)])
+        return ast.BinOp(left=left, op=PYTHON_OPS[op_type](), right=right)
+
+    def visit_UnaryOp(self, node):
+        # visit_UnaryOp multiplies by +1/-1; Python's unary operators can give
+        # different signed zeros for complex results, so multiply as well
+        if self.budgeted:
+            return self.budget_call('unary', node.op.type, [self.visit(node.expr)], node)
+        sign = -1 if node.op.type == T.MINUS else 1
+        return ast.BinOp(left=ast.Constant(value=sign), op=ast.Mult(), right=self.visit(node.expr))
+
+
+# compiled functions, kept as long as their Program is alive
+_compiled = weakref.WeakKeyDictionary()
+_budgeted = weakref.WeakKeyDictionary()
+
+
+def compile_python(tree, budget=None):
+    """
+    return the native function for tree, compiling it the first time.
+    With a budget, the function runs the budgeted code with it; whoever calls it starts the budget
+    """
+    compiled = _compiled if budget is None else _budgeted
+    function = compiled.get(tree)
+    if function is None:
+        module = PythonCodeGenerator(budgeted=budget is not None).generate(tree)
+        code = compile(module, '<program>', 'exec')
+        namespace = dict(HELPERS)
+        exec(code, namespace)
+        function = compiled[tree] = namespace[PythonCodeGenerator.FUNCTION_NAME]
+    if budget is not None:
+        return partial(function, budget)
+    return function
+
+
+def to_python_source(tree):
+    return ast.unparse(PythonCodeGenerator().generate(tree))
@@ -0,0 +1,170 @@
+import os
+import sys
+import hashlib
+import tempfile
+from collections import OrderedDict
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.scanner.file_input import SourceFile
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.optimizer import optimize, fold_limit_bits
+from ccompiler.parser.serialize import FORMAT_VERSION, encode_program, read_program
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.dirname(PACKAGE_DIR)
+# a checkout keeps its cache beside the sources, an installed copy in the user's cache directory
+if os.path.exists(os.path.join(PROJECT_ROOT, 'pyproject.toml')):
+    DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.compile_cache')
+else:
+    DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'ccompiler')
+DEFAULT_CACHE_DIR = os.environ.get('CCOMPILER_CACHE_DIR', DEFAULT_CACHE_DIR)
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+
+# bump when what is cached changes; entries are written with parser/serialize.py,
+# whose FORMAT_VERSION covers the layout
+CACHE_FORMAT = 3
+
+# sources that decide what a program compiles to, relative to the package: every
+# module this one imports to read, scan, parse, optimize and store a program
+COMPILER_SOURCES = ['tokens.py', 'scanner/file_input.py', 'scanner/line_index.py', 'scanner/lex_scanner.py',
+                    'scanner/token_buffer.py', 'parser/parser.py', 'parser/optimizer.py', 'parser/serialize.py']
+
+
+def compiler_version():
+    """hash of the compiler's own sources, so any change to them invalidates the cache"""
+    digest = hashlib.sha256(f"{CACHE_FORMAT}.{FORMAT_VERSION}".encode())
+    for path in COMPILER_SOURCES:
+        with open(os.path.join(PACKAGE_DIR, path), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+COMPILER_VERSION = compiler_version()
+
+
+class CacheStats:
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_errors = 0
+
+    @property
+    def hits(self):
+        return self.memory_hits + self.disk_hits
+
+    def __str__(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return (f"{self.hits} hits ({self.memory_hits} memory, {self.disk_hits} disk), "
+                f"{self.misses} misses, {self.evictions} evictions, {rate:.0f}% hit rate")
+
+
+class CompileCache:
+    """
+    Compiled (parsed and optimized) programs keyed by a hash of the source
+    and the compiler version: an in-process LRU layer, bounded by the
+    serialized size of its entries, in front of a directory on disk.
+    Programs are optimized for the Budget they will run under, if any.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_memory_bytes=DEFAULT_MEMORY_BYTES, budget=None):
+        self.cache_dir = cache_dir
+        self.budget = budget
+        # what folding may produce depends on the budget, so it is part of every key
+        self.version = f"{COMPILER_VERSION}.{fold_limit_bits(budget)}"
+        self.max_memory_bytes = max_memory_bytes
+        self.memory = OrderedDict()  # key -> (tree, serialized size)
+        self.memory_bytes = 0
+        self.stats = CacheStats()
+
+    def key_for_text(self, text):
+        return hashlib.sha256(f"{self.version}\0".encode() + text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def key_for_file(self, path, encoding='', chunk_size=1 << 20):
+        """hash of the raw file bytes, read in chunks; the encoding decides how they decode"""
+        digest = hashlib.sha256(f"{self.version}\0{encoding}\0".encode())
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(chunk_size), b''):
+                digest.update(data)
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], key[2:] + '.bin')
+
+    def get(self, key):
+        """the cached tree for key, or None"""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            return self.memory[key][0]
+        try:
+            with open(self.path_for(key), 'rb') as f:
+                data = f.read()
+            tree = read_program(data)
+        except (OSError, ValueError, EOFError, TypeError, IndexError, StopIteration):
+            # missing, truncated or written by another format: treat as a miss
+            self.stats.misses += 1
+            return None
+        self.stats.disk_hits += 1
+        self.remember(key, tree, len(data))
+        return tree
+
+    def put(self, key, tree):
+        try:
+            data = encode_program(tree)
+        except ValueError:
+            return  # e.g. a constant of a type the format has no encoding for: just don't cache it
+        try:
+            self.write(self.path_for(key), data)
+        except OSError as e:
+            # e.g. a read-only or full cache directory: the program still compiled,
+            # it just is not cached on disk
+            self.stats.write_errors += 1
+            if self.stats.write_errors == 1:
+                print(f"compile cache: cannot write to {self.cache_dir}: {e}", file=sys.stderr)
+        self.remember(key, tree, len(data))
+
+    @staticmethod
+    def write(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def remember(self, key, tree, size):
+        if key in self.memory:
+            self.memory_bytes -= self.memory.pop(key)[1]
+        self.memory[key] = (tree, size)
+        self.memory_bytes += size
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+            _, (_, evicted_size) = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted_size
+            self.stats.evictions += 1
+
+    def get_or_build(self, key, build):
+        """cached tree for key, else build() it and cache the result"""
+        tree = self.get(key)
+        if tree is None:
+            tree = build()
+            self.put(key, tree)
+        return tree
+
+    def compile_text(self, text):
+        def build():
+            tree, _ = optimize(Parser(Lexer(text, scanner='regex')).parse(), self.budget)
+            return tree
+        return self.get_or_build(self.key_for_text(text), build)
+
+    def compile_file(self, path):
+        source = SourceFile(path)
+        def build():
+            tree, _ = optimize(Parser(source.lexer()).parse(), self.budget)
+            return tree
+        return self.get_or_build(self.key_for_file(path, source.encoding), build)
@@ -0,0 +1,235 @@
+import weakref
+from ccompiler.parser.parser import Interpreter
+from ccompiler.parser.profiling import CHILDREN, count_nodes_by_class
+
+# expressions are pure: the same subtree over the same variable values always gives
+# the same value (or the same error), so identical subtrees can share one value.
+# Each occurrence stays its own node, with its own span for errors, and points to
+# the first occurrence of its structure through .canonical
+EXPRESSION_KINDS = ('BinOp', 'UnaryOp', 'Num', 'Var')
+
+# shared subtrees with fewer operators than this are cheaper to recompute than to look up
+MIN_MEMO_OPERATORS = 2
+
+# memoizing costs a lookup at every operator; below this share of the operators
+# standing in repeated subtrees it costs more than it saves
+MIN_REPEATED_SHARE = 0.25
+
+
+class SharingStats:
+    def __init__(self):
+        self.nodes_before = 0
+        self.nodes_after = 0
+
+    @property
+    def ratio(self):
+        return self.nodes_before / self.nodes_after if self.nodes_after else 1.0
+
+    def __str__(self):
+        return f"{self.nodes_before} -> {self.nodes_after} distinct nodes ({self.ratio:.2f}x deduplication)"
+
+
+def unique_nodes(tree):
+    """every distinct node object of a tree or DAG, children before parents"""
+    seen = set()
+    order = []
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children(node)))
+    return order
+
+
+def children(node):
+    kind = type(node).__name__
+    if kind == 'Block':
+        return list(node.statements)
+    return [getattr(node, name) for name in CHILDREN.get(kind, ())]
+
+
+def copy_tree(tree):
+    """a copy of tree with new nodes (tokens are shared), without recursion"""
+    copies = {}
+    for node in unique_nodes(tree):
+        # attribute by attribute rather than copy.copy, so the copies keep the
+        # compact attribute layout of the originals and evaluate as fast
+        new = copies[id(node)] = object.__new__(type(node))
+        for name, value in vars(node).items():
+            setattr(new, name, value)
+        kind = type(node).__name__
+        if kind == 'Block':
+            new.statements = [copies[id(statement)] for statement in node.statements]
+        else:
+            for name in CHILDREN.get(kind, ()):
+                setattr(new, name, copies[id(getattr(node, name))])
+    return copies[id(tree)]
+
+
+def share_subtrees(tree):
+    """
+    hash-cons the expressions of a copy of tree: every expression node gets a
+    .canonical, the first node of the same structure. tree itself is left
+    untouched. Returns (copy, SharingStats)
+    """
+    tree = copy_tree(tree)
+    stats = SharingStats()
+    table = {}  # structural key -> canonical node
+    nodes = unique_nodes(tree)
+    # assignment targets are written, not read: they share nothing
+    targets = {id(node.left) for node in nodes if type(node).__name__ == 'Assign'}
+
+    for node in nodes:
+        kind = type(node).__name__
+        if id(node) in targets:
+            continue
+        if kind == 'BinOp':
+            key = (kind, node.op.type, id(node.left.canonical), id(node.right.canonical))
+        elif kind == 'UnaryOp':
+            key = (kind, node.op.type, id(node.expr.canonical))
+        elif kind == 'Num':
+            value = node.value
+            # 0.0 == -0.0 and 1 == 1.0, but they are different constants
+            key = (kind, type(value), value if type(value) is int else repr(value))
+        elif kind == 'Var':
+            key = (kind, node.name)
+        else:
+            continue
+        node.canonical = table.setdefault(key, node)
+
+    stats.nodes_before = len(nodes)
+    # the nodes left if every canonical node stood in for all of its occurrences
+    stats.nodes_after = sum(1 for node in nodes if getattr(node, 'canonical', node) is node)
+    return tree, stats
+
+
+class MemoStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses, {self.invalidations} invalidations"
+
+
+def sharing_analysis(tree):
+    """
+    (memo, readers) for a tree passed through share_subtrees: memo maps each
+    BinOp/UnaryOp whose structure has more than one parent structure and is
+    worth memoizing to its canonical node, readers maps each variable name to the canonical
+    nodes that read it. Both are empty when too little of the tree repeats
+    """
+    # the parents each canonical node would have if the tree were turned into a DAG
+    # of its canonical nodes: a subtree that only repeats inside one larger
+    # repeated subtree is reused with it and needs no lookup of its own
+    parents = {}
+    reads = {}
+    operators = {}  # canonical node -> operator count of its subtree
+    nodes = unique_nodes(tree)
+    for node in nodes:
+        canonical = getattr(node, 'canonical', None)
+        if canonical is not None and canonical is not node:
+            continue
+        node_children = [getattr(child, 'canonical', None) for child in children(node)]
+        for child in node_children:
+            if child is not None:
+                parents[child] = parents.get(child, 0) + 1
+        if canonical is None:
+            continue
+        kind = type(node).__name__
+        if kind == 'Var':
+            reads[node] = frozenset([node.name])
+        else:
+            reads[node] = frozenset().union(*(reads[child] for child in node_children))
+        operators[node] = (kind in ('BinOp', 'UnaryOp')) + sum(operators[child] for child in node_children)
+    memo = {}
+    readers = {}
+    repeated = 0  # operators in repeated occurrences (nested ones counted again)
+    for node in nodes:
+        canonical = getattr(node, 'canonical', None)
+        if canonical is None or parents.get(canonical, 0) < 2 or operators[canonical] < MIN_MEMO_OPERATORS:
+            continue
+        memo[node] = canonical
+        if canonical is node:
+            for name in reads[node]:
+                readers.setdefault(name, []).append(node)
+        else:
+            repeated += operators[canonical]
+    total = sum(type(node).__name__ in ('BinOp', 'UnaryOp') for node in nodes)
+    if repeated < MIN_REPEATED_SHARE * total:
+        return {}, {}
+    return memo, readers
+
+
+# analyses kept as long as their Program is alive, so repeated runs only pay once
+_analyses = weakref.WeakKeyDictionary()
+
+
+class MemoInterpreter(Interpreter):
+    """
+    Interpreter for trees passed through share_subtrees: a BinOp or UnaryOp
+    whose structure occurs in more than one place is computed once and its value
+    reused until an Assign changes one of the variables it reads. Results and
+    errors (spans included) are the Interpreter's; events of a reused subtree
+    are not repeated.
+    """
+
+    def __init__(self, parser=None, on_event=None, budget=None):
+        super().__init__(parser, on_event, budget)
+        self.memo = {}       # memoized operator node -> its canonical node
+        self.readers = {}    # variable name -> canonical nodes that read it
+        self.cache = {}      # canonical node -> value
+        self.stats = MemoStats()
+
+    def visit_Program(self, node):
+        analysis = _analyses.get(node)
+        if analysis is None:
+            analysis = _analyses[node] = sharing_analysis(node)
+        self.memo, self.readers = analysis
+        for name in ('visit_Assign', 'visit_BinOp', 'visit_UnaryOp'):
+            if self.memo:
+                self.__dict__.pop(name, None)
+            else:
+                # nothing to memoize: dispatch straight to the Interpreter's methods
+                setattr(self, name, getattr(Interpreter, name).__get__(self))
+        return super().visit_Program(node)
+
+    def visit_Assign(self, node):
+        value = super().visit_Assign(node)
+        cache = self.cache
+        for canonical in self.readers.get(node.left.name, ()):
+            if canonical in cache:
+                del cache[canonical]
+                self.stats.invalidations += 1
+        return value
+
+    # Interpreter.visit_X(self, node) rather than super(): these run for every operator node
+    def visit_BinOp(self, node):
+        canonical = self.memo.get(node)
+        if canonical is None:
+            return Interpreter.visit_BinOp(self, node)
+        return self.memoized(node, canonical, Interpreter.visit_BinOp)
+
+    def visit_UnaryOp(self, node):
+        canonical = self.memo.get(node)
+        if canonical is None:
+            return Interpreter.visit_UnaryOp(self, node)
+        return self.memoized(node, canonical, Interpreter.visit_UnaryOp)
+
+    def memoized(self, node, canonical, compute):
+        cache = self.cache
+        if canonical in cache:
+            self.stats.hits += 1
+            return cache[canonical]
+        self.stats.misses += 1
+        # computed on this occurrence, so an error carries its span; an error is
+        # raised before anything is cached, so it repeats like it would uncached
+        value = cache[canonical] = compute(self, node)
+        return value
@@ -0,0 +1,225 @@
+from itertools import accumulate
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.token_buffer import TokenBuffer, BufferLexer, TYPE_CODES
+from ccompiler.parser.parser import Parser, ParserError, Program, Function, Block
+
+SEMI = TYPE_CODES[T.SEMI]
+
+# child attributes of the nodes a statement is made of
+STATEMENT_CHILDREN = {'Assign': ('left', 'right'), 'Return': ('expr',), 'BinOp': ('left', 'right'), 'UnaryOp': ('expr',)}
+
+
+class Fenwick:
+    """prefix sums over segment lengths with O(log n) updates and offset lookups"""
+
+    def __init__(self, values):
+        # O(n) build from prefix sums: node i covers the values (i & (i - 1), i]
+        self.size = len(values)
+        prefixes = [0, *accumulate(values)]
+        self.tree = [0] + [prefixes[i] - prefixes[i & (i - 1)] for i in range(1, self.size + 1)]
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """sum of the first index values"""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index &= index - 1
+        return total
+
+    def find(self, offset):
+        """index of the value whose range [prefix(i), prefix(i + 1)) holds offset"""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            if pos + step <= self.size and self.tree[pos + step] <= offset:
+                pos += step
+                offset -= self.tree[pos]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+def subtree_nodes(statement):
+    """every node of a statement, in a flat list"""
+    nodes = []
+    stack = [statement]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(getattr(node, name) for name in STATEMENT_CHILDREN.get(type(node).__name__, ()))
+    return nodes
+
+
+def shift_spans(node_lists, delta):
+    """move the spans of the nodes in node_lists by delta characters, in place"""
+    for nodes in node_lists:
+        for node in nodes:
+            node.start += delta
+            node.end += delta
+
+
+class HeaderParser(Parser):
+    """Parser that notes where the function header ends: right after the '{' it eats"""
+    header_end = None
+
+    def eat(self, token_type):
+        if token_type == T.LBRACE and self.header_end is None:
+            self.header_end = self.token_span()[1]
+        super().eat(token_type)
+
+
+class EditStats:
+    def __init__(self):
+        self.full_reparse = False
+        self.segments_replaced = 0
+        self.segments_parsed = 0
+        self.chars_scanned = 0
+
+    def __str__(self):
+        if self.full_reparse:
+            return f"full reparse of {self.chars_scanned} chars"
+        return (f"{self.segments_replaced} statements replaced by {self.segments_parsed}, "
+                f"{self.chars_scanned} chars scanned")
+
+
+class IncrementalDocument:
+    """
+    Source text kept as segments: the header up to '{', one segment per
+    statement ending right after its ';', and the footer from there to the end.
+    Each statement segment keeps its parsed node, and a Fenwick tree over the
+    segment lengths maps offsets to segments.
+
+    edit() rescans only the segments an edit touches, growing that window
+    until it ends right after a ';' again, and parses only the statements in
+    it; the cost follows the size of the edit, not of the file, but for moving
+    the spans of the statements after it by its length. Edits to the
+    header or footer, and syntax errors, fall back to a full parse, which
+    gives the same tree or ParserError as Parser would. Spans are those of
+    the current text: they move in place in the statements a tree returned
+    before shares with the new one.
+    """
+
+    def __init__(self, text):
+        self.texts = [text]
+        self.statements = []
+        self.nodes = []  # the nodes of each statement, for moving their spans
+        self.lengths = None
+        self.tree = None
+        self.stats = EditStats()
+        self.reparse(text)
+
+    @property
+    def text(self):
+        return "".join(self.texts)
+
+    def reparse(self, text):
+        """full scan and parse; on a syntax error the text is kept and ParserError raised"""
+        self.stats = EditStats()
+        self.stats.full_reparse = True
+        self.stats.chars_scanned = len(text)
+        self.texts = [text]
+        self.statements = []
+        self.nodes = []
+        self.lengths = None
+        self.tree = None
+
+        buffer = TokenBuffer.from_text(text)
+        parser = HeaderParser(BufferLexer(buffer))
+        tree = parser.parse()
+
+        # the header ends with the '{' of the function, each statement with its only ';'
+        boundaries = [parser.header_end]
+        boundaries.extend(buffer.starts[i] + 1 for i in range(len(buffer)) if buffer.types[i] == SEMI)
+        texts = [text[:boundaries[0]]]
+        texts.extend(text[start:end] for start, end in zip(boundaries, boundaries[1:]))
+        texts.append(text[boundaries[-1]:])
+
+        self.texts = texts
+        self.statements = list(tree.function.body.statements)
+        self.nodes = [subtree_nodes(statement) for statement in self.statements]
+        self.lengths = Fenwick([len(t) for t in texts])
+        self.tree = tree
+        return tree
+
+    def edit(self, offset, removed, inserted):
+        """
+        replace removed characters at offset with inserted and return the new tree;
+        raises ParserError when the edited text does not parse
+        """
+        if self.tree is None:
+            text = self.text
+            return self.reparse(text[:offset] + inserted + text[offset + removed:])
+
+        footer = len(self.texts) - 1
+        first = self.lengths.find(offset)
+        last = self.lengths.find(offset + removed - 1) if removed else first
+        if first == 0 or last >= footer:
+            text = self.text
+            return self.reparse(text[:offset] + inserted + text[offset + removed:])
+
+        window_start = self.lengths.prefix(first)
+        window = "".join(self.texts[first:last + 1])
+        local = offset - window_start
+        window = window[:local] + inserted + window[local + removed:]
+
+        stats = EditStats()
+        while True:
+            # scanned at its offset in the new text, so the statements get their spans there
+            buffer = TokenBuffer()
+            buffer.scan(window, 0, window_start)
+            stats.chars_scanned += len(window)
+            ends = [buffer.starts[i] + 1 - window_start for i in range(len(buffer)) if buffer.types[i] == SEMI]
+            if (ends[-1] if ends else 0) == len(window):
+                break
+            # the window does not end right after a ';': take in the next statement
+            last += 1
+            if last >= footer:
+                return self.reparse(self.text[:window_start] + window + self.texts[footer])
+            window += self.texts[last]
+
+        try:
+            parser = Parser(BufferLexer(buffer))
+            statements = []
+            while parser.current_token.type != T.EOF:
+                statements.append(parser.parse_statement())
+        except ParserError:
+            # let the full parse report the error exactly as Parser would
+            return self.reparse(self.text[:window_start] + window + "".join(self.texts[last + 1:]))
+
+        old_statements = self.statements[first - 1:last]
+        body = self.statements[:first - 1] + statements + self.statements[last:]
+        if not body or type(body[-1]).__name__ != 'Return':
+            return self.reparse(self.text[:window_start] + window + "".join(self.texts[last + 1:]))
+
+        texts = [window[start:end] for start, end in zip([0] + ends, ends)]
+        old_lengths = [len(t) for t in self.texts[first:last + 1]]
+        delta = len(window) - sum(old_lengths)
+        if delta:
+            # the statements after the window are reused, at offsets moved by the edit
+            shift_spans(self.nodes[last:], delta)
+        self.texts[first:last + 1] = texts
+        self.statements = body
+        self.nodes[first - 1:last] = [subtree_nodes(statement) for statement in statements]
+        if len(texts) == len(old_lengths):
+            # the usual keystroke: same statements, some lengths changed
+            for i, (segment, old_length) in enumerate(zip(texts, old_lengths)):
+                if len(segment) != old_length:
+                    self.lengths.add(first + i, len(segment) - old_length)
+        else:
+            # statements were added or removed, the positions of all later segments move
+            self.lengths = Fenwick([len(t) for t in self.texts])
+
+        function = self.tree.function
+        new_function = Function(function.name, Block(body))
+        # from 'int' to '}', like the Parser's
+        new_function.start, new_function.end = function.start, function.end + delta
+        self.tree = Program(new_function)
+        stats.segments_replaced = len(old_statements)
+        stats.segments_parsed = len(statements)
+        self.stats = stats
+        return self.tree
@@ -0,0 +1,78 @@
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.parser import Interpreter, runtime_error
+
+
+def apply_binary(op_type, left_val, right_val, start=None, end=None):
+    # same operations and errors as Interpreter.visit_BinOp; start / end locate its errors
+    if op_type == T.PLUS:
+        return left_val + right_val
+    elif op_type == T.MINUS:
+        return left_val - right_val
+    elif op_type == T.MUL:
+        return left_val * right_val
+    elif op_type == T.DIV:
+        if right_val == 0:
+            raise runtime_error("Runtime Error: Division by zero", start, end)
+        return left_val / right_val
+    elif op_type == T.MOD:
+        if right_val == 0:
+            raise runtime_error("Runtime Error: Modulo by zero", start, end)
+        return left_val % right_val
+    elif op_type == T.POWER:
+        return left_val ** right_val
+    else:
+        raise Exception(f"Unknown operator: {op_type}")
+
+
+class IterativeInterpreter(Interpreter):
+    """
+    Interpreter that evaluates expressions with an explicit stack instead of
+    recursive visit() calls, so nesting depth is bounded by memory rather than
+    by the recursion limit. Results, errors and events match Interpreter.
+    """
+
+    def visit_BinOp(self, node):
+        return self.evaluate(node)
+
+    def visit_UnaryOp(self, node):
+        return self.evaluate(node)
+
+    def evaluate(self, node):
+        # post-order: a node is pushed once to schedule its children (left on top,
+        # so it is evaluated first) and once more, marked done, to combine their values
+        values = []
+        stack = [(node, False)]
+        while stack:
+            node, done = stack.pop()
+            kind = type(node).__name__
+            if kind == 'Num':
+                values.append(node.value)
+            elif kind == 'Var':
+                values.append(self.visit_Var(node))
+            elif kind == 'BinOp':
+                if done:
+                    right_val = values.pop()
+                    if self.budget is not None:
+                        values.append(self.budget.binary(node.op.type, values.pop(), right_val, node.start, node.end))
+                    else:
+                        values.append(apply_binary(node.op.type, values.pop(), right_val, node.start, node.end))
+                else:
+                    stack.append((node, True))
+                    stack.append((node.right, False))
+                    stack.append((node.left, False))
+            elif kind == 'UnaryOp':
+                if done:
+                    op = node.op.type
+                    if self.budget is not None:
+                        result = self.budget.unary(op, values.pop(), node.start, node.end)
+                    else:
+                        result = (-1 if op == T.MINUS else +1) * values.pop()
+                    if self.on_event is not None:
+                        self.on_event('unary', op=op, value=result)
+                    values.append(result)
+                else:
+                    stack.append((node, True))
+                    stack.append((node.expr, False))
+            else:
+                values.append(self.visit(node))
+        return values[0]
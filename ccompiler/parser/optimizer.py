@@ -0,0 +1,314 @@
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.lex_scanner import Token
+from ccompiler.parser.parser import NodeVisitor, Program, Function, Block, Assign, Return, BinOp, UnaryOp, Num
+
+# folding stops at results this large, so a constant like 9 ** 9 ** 9 is left
+# for the runtime instead of hanging the compiler
+FOLD_LIMIT_BITS = 4096
+
+
+def fold_limit_bits(budget=None):
+    """
+    bits of the largest int folding may produce: FOLD_LIMIT_BITS, or less under
+    a Budget's max_int_bits, so a result the budget refuses at runtime is never
+    turned into a constant
+    """
+    if budget is not None and budget.max_int_bits is not None:
+        return min(FOLD_LIMIT_BITS, budget.max_int_bits)
+    return FOLD_LIMIT_BITS
+
+
+def constant(value):
+    """Num node for a value computed at compile time"""
+    token = Token(repr(value), None)
+    token.type = T.INTEGER
+    token.value = value
+    return Num(token)
+
+def at(new, old):
+    """new node, taking over the source span of the node it replaces"""
+    new.start, new.end = old.start, old.end
+    return new
+
+def is_constant(node):
+    return type(node).__name__ == 'Num'
+
+def is_int_one(node):
+    return is_constant(node) and type(node.value) is int and node.value == 1
+
+def is_int_zero(node):
+    return is_constant(node) and type(node.value) is int and node.value == 0
+
+
+def evaluate(op_type, left, right, limit_bits=FOLD_LIMIT_BITS):
+    """compute a constant BinOp like Interpreter.visit_BinOp, None when it must be left to the runtime"""
+    if op_type == T.POWER and type(left) is int and type(right) is int and right > 0:
+        if right * max(abs(left).bit_length(), 1) > limit_bits:
+            return None
+    try:
+        if op_type == T.PLUS:
+            value = left + right
+        elif op_type == T.MINUS:
+            value = left - right
+        elif op_type == T.MUL:
+            value = left * right
+        elif op_type == T.DIV:
+            value = left / right if right != 0 else None
+        elif op_type == T.MOD:
+            value = left % right if right != 0 else None
+        elif op_type == T.POWER:
+            value = left ** right
+        else:
+            value = None
+    except (ArithmeticError, ValueError):
+        # e.g. 0 ** -1 or a float overflow: the error has to happen at runtime
+        return None
+    if type(value) is int and value.bit_length() > limit_bits:
+        return None
+    if type(value) not in (int, float):
+        return None  # complex results have no literal form
+    return value
+
+
+class OptimizationStats:
+    def __init__(self):
+        self.nodes_before = 0
+        self.nodes_after = 0
+        self.folded = 0
+        self.simplified = 0
+        self.propagated = 0
+        self.removed = 0
+
+    def __str__(self):
+        return (f"{self.nodes_before} -> {self.nodes_after} nodes "
+                f"({self.folded} folded, {self.simplified} simplified, "
+                f"{self.propagated} constants propagated, {self.removed} dead statements removed)")
+
+
+def count_nodes(node):
+    kind = type(node).__name__
+    if kind == 'Program':
+        return 1 + count_nodes(node.function)
+    if kind == 'Function':
+        return 1 + count_nodes(node.body)
+    if kind == 'Block':
+        return 1 + sum(count_nodes(statement) for statement in node.statements)
+    if kind == 'Assign':
+        return 1 + count_nodes(node.left) + count_nodes(node.right)
+    if kind == 'Return':
+        return 1 + count_nodes(node.expr)
+    if kind == 'BinOp':
+        return 1 + count_nodes(node.left) + count_nodes(node.right)
+    if kind == 'UnaryOp':
+        return 1 + count_nodes(node.expr)
+    return 1
+
+
+class Optimizer(NodeVisitor):
+    """
+    AST to AST pass run between Parser.parse() and execution:
+    constant folding, algebraic identities, constant propagation through
+    the assignments of a Block and removal of dead statements.
+    Anything that could raise at runtime is kept where it is, so errors
+    still happen at the same point of execution; with the Budget the tree
+    will run under, that includes results over its max_int_bits.
+    """
+
+    def __init__(self, budget=None):
+        self.stats = OptimizationStats()
+        self.limit_bits = fold_limit_bits(budget)
+        # every operator's int result is checked against the budget's max_int_bits,
+        # so an operator can fail even when the same operation without it cannot
+        self.bounded = budget is not None and budget.max_int_bits is not None
+        self.constants = {}   # name -> value it certainly holds at this point of the block
+        self.defined = set()  # names certainly assigned at this point
+        self.int_vars = set() # names certainly holding an int
+
+    def optimize(self, tree):
+        self.stats.nodes_before = count_nodes(tree)
+        tree = self.visit(tree)
+        self.stats.nodes_after = count_nodes(tree)
+        return tree
+
+    def visit_Program(self, node):
+        return at(Program(self.visit(node.function)), node)
+
+    def visit_Function(self, node):
+        return at(Function(node.name, self.visit(node.body)), node)
+
+    def visit_Block(self, node):
+        # forward pass: fold and propagate, remembering which statements can fail
+        statements = []
+        for statement in node.statements:
+            if type(statement).__name__ == 'Assign':
+                right = self.visit(statement.right)
+                name = statement.left.name
+                can_fail = self.can_fail(right)
+                if is_constant(right):
+                    self.constants[name] = right.value
+                else:
+                    self.constants.pop(name, None)
+                if self.is_int(right):
+                    self.int_vars.add(name)
+                else:
+                    self.int_vars.discard(name)
+                self.defined.add(name)
+                statements.append((at(Assign(statement.left, right), statement), can_fail))
+            else:
+                expr = self.visit(statement.expr)
+                statements.append((at(Return(expr), statement), self.can_fail(expr)))
+
+        # backward pass: drop statements whose value is never used and that cannot fail
+        kept = []
+        live = set()
+        for i in range(len(statements) - 1, -1, -1):
+            statement, can_fail = statements[i]
+            last = i == len(statements) - 1
+            if isinstance(statement, Assign):
+                name = statement.left.name
+                if not last and name not in live and not can_fail:
+                    self.stats.removed += 1
+                    continue
+                live.discard(name)
+                live |= self.reads(statement.right)
+            else:
+                if not last and not can_fail:
+                    self.stats.removed += 1
+                    continue
+                live |= self.reads(statement.expr)
+            kept.append(statement)
+        kept.reverse()
+        return at(Block(kept), node)
+
+    def visit_Var(self, node):
+        if node.name in self.constants:
+            self.stats.propagated += 1
+            return at(constant(self.constants[node.name]), node)
+        return node
+
+    def visit_Num(self, node):
+        return node
+
+    def visit_UnaryOp(self, node):
+        expr = self.visit(node.expr)
+        if is_constant(expr):
+            # the runtime multiplies by +1 or -1, within the same limits
+            sign = -1 if node.op.type == T.MINUS else 1
+            value = evaluate(T.MUL, sign, expr.value, self.limit_bits)
+            if value is not None:
+                self.stats.folded += 1
+                return at(constant(value), node)
+        return node if expr is node.expr else at(UnaryOp(node.op, expr), node)
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        op_type = node.op.type
+
+        if is_constant(left) and is_constant(right):
+            value = evaluate(op_type, left.value, right.value, self.limit_bits)
+            if value is not None:
+                self.stats.folded += 1
+                return at(constant(value), node)
+
+        simplified = self.simplify(op_type, left, right)
+        if simplified is not None:
+            self.stats.simplified += 1
+            return simplified
+        if left is node.left and right is node.right:
+            return node
+        return at(BinOp(left=left, op=node.op, right=right), node)
+
+    def simplify(self, op_type, left, right):
+        """x*1, 1*x, x**1, x-0, and x+0 / 0+x for ints; None when nothing applies"""
+        if op_type == T.MUL:
+            if is_int_one(right) and self.fits(left):
+                return left
+            if is_int_one(left) and self.fits(right):
+                return right
+        elif op_type == T.POWER:
+            if is_int_one(right) and self.fits(left):
+                return left
+        elif op_type == T.MINUS:
+            if is_int_zero(right) and self.fits(left):
+                return left
+        elif op_type == T.PLUS:
+            # -0.0 + 0 is 0.0, so adding zero is only an identity for ints
+            if is_int_zero(right) and self.is_int(left) and self.fits(left):
+                return left
+            if is_int_zero(left) and self.is_int(right) and self.fits(right):
+                return right
+        return None
+
+    def fits(self, node):
+        """True when the budget cannot refuse node's value as an operator's result"""
+        if not self.bounded:
+            return True
+        return is_constant(node) and (type(node.value) is not int or node.value.bit_length() <= self.limit_bits)
+
+    def is_int(self, node):
+        """True when node certainly evaluates to an int"""
+        kind = type(node).__name__
+        if kind == 'Num':
+            return type(node.value) is int
+        if kind == 'Var':
+            return node.name in self.int_vars
+        if kind == 'UnaryOp':
+            return self.is_int(node.expr)
+        if kind == 'BinOp':
+            op_type = node.op.type
+            if op_type in (T.PLUS, T.MINUS, T.MUL, T.MOD):
+                return self.is_int(node.left) and self.is_int(node.right)
+            if op_type == T.POWER:
+                return (self.is_int(node.left) and is_constant(node.right)
+                        and type(node.right.value) is int and node.right.value >= 0)
+        return False
+
+    def can_fail(self, node):
+        """False only when evaluating node can never raise"""
+        kind = type(node).__name__
+        if kind == 'Num':
+            return False
+        if kind == 'Var':
+            return node.name not in self.defined
+        if kind == 'UnaryOp':
+            return self.can_fail(node.expr) or not self.fits(node.expr)
+        if kind == 'BinOp':
+            if self.can_fail(node.left) or self.can_fail(node.right):
+                return True
+            op_type = node.op.type
+            # int sums cannot overflow, but can outgrow a budget's max_int_bits;
+            # floats mixed with huge ints can overflow
+            if op_type in (T.PLUS, T.MINUS):
+                if self.bounded:
+                    return not (is_constant(node.left) and is_constant(node.right)
+                                and evaluate(op_type, node.left.value, node.right.value, self.limit_bits) is not None)
+                return not self.is_int(node)
+            # a product or power can exhaust memory, time or a budget's max_int_bits
+            # unless it is one of constants small enough to fold
+            if op_type in (T.MUL, T.POWER):
+                return not (is_constant(node.left) and is_constant(node.right)
+                            and evaluate(op_type, node.left.value, node.right.value, self.limit_bits) is not None)
+            if op_type == T.MOD:
+                # the remainder is smaller than the constant it is taken by
+                return not (self.is_int(node) and is_constant(node.right) and node.right.value != 0
+                            and self.fits(node.right))
+        return True
+
+    def reads(self, node):
+        """names of the variables read by an expression"""
+        kind = type(node).__name__
+        if kind == 'Var':
+            return {node.name}
+        if kind == 'UnaryOp':
+            return self.reads(node.expr)
+        if kind == 'BinOp':
+            return self.reads(node.left) | self.reads(node.right)
+        return set()
+
+
+def optimize(tree, budget=None):
+    """return the optimized tree and its OptimizationStats; budget: the Budget it will run under"""
+    optimizer = Optimizer(budget)
+    tree = optimizer.optimize(tree)
+    return tree, optimizer.stats
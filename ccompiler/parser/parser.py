@@ -0,0 +1,657 @@
+import sys
+import os
+if __name__ == '__main__' and not __package__:
+    # run as a script, this directory comes first on sys.path instead of the
+    # project root that the ccompiler package is imported from
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(script_dir))
+    sys.path[:] = [project_root] + [p for p in sys.path if os.path.abspath(p or '.') != script_dir]
+from ccompiler.tokens import TokenType as T , TOKEN_DESCRIPTIONS
+from ccompiler.scanner.lex_scanner import Lexer, Token, Scanner
+class AST:
+    pass
+
+class ParserError(Exception) :
+# exception raised for syntax errors in the parser
+    def __init__(self, message, token=None, line_index=None, start=None):
+        self.message = message
+        self.token = token
+        # where the offending token starts (start: for tokens that carry no offset);
+        # line and column need the source's LineIndex
+        self.start = getattr(token, 'start', None) if start is None else start
+        self.line = self.column = None
+        if self.start is not None and line_index is not None:
+            self.line, self.column = line_index.location(self.start)
+        super().__init__(self.message)
+
+
+def runtime_error(message, start=None, end=None):
+    """Exception(message) that also carries the source span of the node that failed"""
+    error = Exception(message)
+    error.start = start
+    error.end = end
+    return error
+
+
+# every node has start / end: the character offsets of the source it was parsed from
+# (None for nodes without a source, e.g. built by hand). By default a node spans its
+# children; the Parser widens statements, functions and parenthesized expressions
+# to their whole text, as ArenaParser does
+
+# program : function 
+class Program:
+    def __init__(self, function):
+        self.function = function
+        self.start = function.start
+        self.end = function.end
+
+
+# function : "int" IDENTIFIER "("  ")"  "{" statement "}" 
+class Function:
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body 
+        self.start = body.start
+        self.end = body.end
+
+# a Block is a node that holds multiple statements
+class Block:
+    def __init__(self, statements):
+        self.statements = statements
+        self.start = statements[0].start if statements else None
+        self.end = statements[-1].end if statements else None
+
+class Var:
+    def __init__(self, token):
+        self.token = token
+        self.name = token.value
+        self.start = token.start
+        self.end = token.end
+
+class Assign:
+    def __init__(self, left, right):
+        self.left = left # var node
+        self.right = right # expr  , Num(5)
+        self.start = left.start
+        self.end = right.end
+
+class Return:
+    def __init__(self, expr):
+        self.expr = expr
+        self.start = expr.start
+        self.end = expr.end
+    
+class BinOp:
+    # constructor
+    def __init__(self, left, op, right) :
+        self.left = left
+        self.op = op # = self.token
+        self.right = right
+        self.start = left.start
+        self.end = right.end
+
+    def __str__(self):
+        return str(self.token)
+
+class UnaryOp():
+    def __init__(self, op, expr):
+        self.token = self.op = op
+        self.expr = expr # represents an AST node
+        self.start = op.start
+        self.end = expr.end
+
+class Num:
+    def __init__(self,token):
+        self.token = token
+        self.value = token.value
+        self.start = token.start
+        self.end = token.end
+
+# operator table for the precedence-climbing expression parser (Parser.pratt_expr).
+# infix: token type -> (left binding power, right binding power). Higher binds tighter;
+# a right power above the left one makes the operator left associative, below it right
+# associative. New operators only need an entry here (and a case in the Interpreter)
+INFIX_OPERATORS = {
+    T.PLUS: (10, 11),
+    T.MINUS: (10, 11),
+    T.MUL: (20, 21),
+    T.DIV: (20, 21),
+    T.MOD: (20, 21),
+    T.POWER: (41, 40),
+}
+
+# prefix: token type -> binding power of its operand. A prefix operator can only start
+# an operand where min_bp allows it, so '-a ** b' is '-(a ** b)' and 'a ** -b' is an
+# error, as in the grammar
+PREFIX_OPERATORS = {
+    T.PLUS: 30,
+    T.MINUS: 30,
+}
+
+EXPRESSION_PARSERS = ('pratt', 'descent', 'iterative')
+
+# operator stack entries of Parser.iterative_expr: (token, right binding power, kind),
+# with the start offset of a '(' in place of its token
+PAREN, PREFIX, INFIX = 0, 1, 2
+
+class Parser:
+
+    def __init__(self, lexer, expr_parser='pratt', share_subtrees=False):
+        # expr_parser: 'pratt' (table driven), 'descent' (one method per grammar rule) or
+        # 'iterative' (table driven with explicit stacks, for any nesting depth);
+        # all of them build the same trees.
+        # share_subtrees: identical expressions are linked to one canonical node (see parser/cse.py)
+        if expr_parser not in EXPRESSION_PARSERS:
+            raise ValueError(f"Unknown expression parser: {expr_parser}")
+        self.lexer = lexer
+        # a lexer whose tokens need not carry offsets (BufferLexer) gives them through span()
+        self.lexer_span = getattr(lexer, 'span', None)
+        self.current_token = self.lexer.get_next_token()
+        self.expression = {'pratt': self.pratt_expr, 'descent': self.expr,
+                           'iterative': self.iterative_expr}[expr_parser]
+        self.share_subtrees = share_subtrees
+        self.sharing_stats = None
+    
+    def parse_program(self):
+        func = self.parse_function()
+        return Program(func)
+
+    # every self.eat( ) call is a checkpoint , if the current token doesnt match what is expected
+    # the parser should fail immediately with a clear error
+
+    def parse_function(self):
+        # expect: "int" IDENTIFIER "(" ")" "{" statement "}"
+        start = self.token_span()[0]
+        self.eat(T.INT)
+        token = self.current_token
+        self.eat(T.IDENTIFIER)
+        func_name = token.value
+
+        self.eat(T.LPAREN)
+        self.eat(T.RPAREN)
+
+        self.eat(T.LBRACE)
+        
+        body = self.parse_block()
+        end = self.token_span()[1]
+        self.eat(T.RBRACE)
+        function = Function(func_name, body)
+        function.start, function.end = start, end
+        return function
+
+    def parse_block(self):
+        statements = []
+        # this loops until it hits } , collecting all statements
+        while self.current_token.type != T.RBRACE:
+            # parse one statement and add it to the list
+            statements.append(self.parse_statement())
+        if not statements or not isinstance(statements[-1], Return):
+            self.error("Function body must end with a return statement")
+        return Block(statements)
+
+    def parse_statement(self):
+        token = self.current_token
+        
+        # Handle assignment: x = expr;
+        if token.type == T.IDENTIFIER:
+            next_token = self.lexer.peek()
+            if next_token and next_token.type == T.ASSIGN:
+                var_token = self.current_token  # Save the original token
+                self.eat(T.IDENTIFIER)
+                self.eat(T.ASSIGN)
+                expr_node = self.expression()
+                end = self.token_span()[1]
+                self.eat(T.SEMI)
+                node = Assign(Var(var_token), expr_node)  # Use saved token
+                node.end = end  # statements span their ';'
+                return node
+        
+        # Handle return statement
+        if token.type == T.RETURN:
+            start = self.token_span()[0]
+            self.eat(T.RETURN)
+            expr_node = self.expression()
+            end = self.token_span()[1]
+            self.eat(T.SEMI)
+            node = Return(expr_node)
+            node.start, node.end = start, end
+            return node
+        
+        self.error(f"Unexpected token")
+
+
+    def error(self, message=None):
+        if message is None :
+            message = f"Unexpected token"
+        raise ParserError(message, self.current_token, getattr(self.lexer, 'line_index', None),
+                          self.token_span()[0])
+
+    def token_span(self):
+        """(start, end) of the current token"""
+        if self.lexer_span is not None:
+            return self.lexer_span()
+        return self.current_token.start, self.current_token.end
+
+    def close_paren(self, node, start):
+        """eat the ')' of a parenthesized node, which then spans both parentheses (start: that of its '(')"""
+        end = self.token_span()[1]
+        self.eat(T.RPAREN)
+        node.start, node.end = start, end
+        return node
+    
+
+    def eat(self, token_type):
+        ##compare current token type with 
+        ## the passed token type if they match :
+        ## (Accept as Valid) the current token and assign the next token to the self.current_token,
+        ## otherwise raise an exception
+
+        if self.current_token.type == token_type:
+            self.current_token = self.lexer.get_next_token()
+            
+        else:
+            self.error(f"Expected '{token_type}', got '{self.current_token.type}'")
+            
+    
+    # smallest meaningful building block of an expression , you cant break down any further
+    def atom (self) :
+        token = self.current_token
+        if token.type == T.INTEGER:
+            self.eat(T.INTEGER)
+            return Num(token)
+        elif token.type == T.IDENTIFIER:
+            self.eat(T.IDENTIFIER)
+            return Var(token)
+        elif token.type == T.LPAREN: # ( 
+            start = self.token_span()[0]
+            self.eat(T.LPAREN)
+            node = self.expr() # expr
+            return self.close_paren(node, start) # )
+        self.error(f"Expected an operand, got '{token.type}'")
+
+
+    def power(self):
+        node = self.atom()
+        token = self.current_token
+        if token.type == T.POWER:
+            self.eat(T.POWER) # ← Consume the ** operator
+            node = BinOp(left=node, op=token, right=self.power())
+        return node
+    # 2 + 3 ** 4 ** 5 + 1
+    def factor(self):
+        """OLD : factor : INTEGER | (expr)"""
+        """ UPDATED : factor : (PLUS | MINUS) factor | power """
+        
+        token = self.current_token
+        if token.type == T.PLUS:
+            self.eat(T.PLUS)
+            node = UnaryOp(token, self.factor())
+            return node
+        elif token.type == T.MINUS:
+            self.eat(T.MINUS)
+            node = UnaryOp(token, self.factor())
+            return node
+        else:
+            return self.power()
+        
+    def term(self):
+        """term : factor ((MUL | DIV) factor)*"""
+        # factor * factor | factor / factor
+        node = self.factor()
+
+        while self.current_token.type in (T.MUL, T.DIV, T.MOD):
+            token = self.current_token
+            if token.type == T.MUL:
+                self.eat(T.MUL)
+            elif token.type == T.DIV:
+                self.eat(T.DIV)
+            elif token.type == T.MOD:
+                self.eat(T.MOD)
+
+            node = BinOp(left=node, op=token, right=self.factor())
+            #Example : node = BinOp(left=Num(3), op=*, right=Num(4))
+            # this represents (3 * 4)
+
+        return node
+    
+
+    def expr(self):
+        """
+        expr   : term ((PLUS | MINUS) term)*
+        term   : factor ((MUL | DIV | MOD) factor) | power*
+        factor : INTEGER | LPAREN expr RPAREN
+
+        power  : handles factor ** factor 
+        atom   : INTEGER | LPAREN expr RPAREN
+        """
+        node = self.term()
+
+        while self.current_token.type in (T.PLUS, T.MINUS):
+            token = self.current_token
+            if token.type == T.PLUS:
+                self.eat(T.PLUS)
+            elif token.type == T.MINUS:
+                self.eat(T.MINUS)
+
+            node = BinOp(left=node, op=token, right=self.term())
+
+        return node
+
+    def pratt_expr(self, min_bp=0):
+        """
+        precedence climbing over INFIX_OPERATORS / PREFIX_OPERATORS: parse one operand,
+        then keep folding in infix operators that bind at least as tightly as min_bp.
+        One call per operand instead of expr -> term -> factor -> power -> atom
+        """
+        token = self.current_token
+        # plain operands first: they are the common case and need no table lookup
+        if token.type == T.INTEGER:
+            self.current_token = self.lexer.get_next_token()
+            node = Num(token)
+        elif token.type == T.IDENTIFIER:
+            self.current_token = self.lexer.get_next_token()
+            node = Var(token)
+        elif token.type == T.LPAREN:
+            start = self.token_span()[0]
+            self.current_token = self.lexer.get_next_token()
+            node = self.close_paren(self.pratt_expr(), start)
+        else:
+            prefix_bp = PREFIX_OPERATORS.get(token.type)
+            if prefix_bp is None or prefix_bp < min_bp:
+                self.error(f"Expected an operand, got '{token.type}'")
+            self.current_token = self.lexer.get_next_token()
+            node = UnaryOp(token, self.pratt_expr(prefix_bp))
+
+        while True:
+            token = self.current_token
+            binding = INFIX_OPERATORS.get(token.type)
+            if binding is None or binding[0] < min_bp:
+                return node
+            self.current_token = self.lexer.get_next_token()
+            node = BinOp(left=node, op=token, right=self.pratt_expr(binding[1]))
+
+    def iterative_expr(self):
+        """
+        pratt_expr without recursion (shunting-yard): pending operators and open
+        parentheses wait on ops, finished subtrees on nodes. An operator on the stack
+        is applied once the next infix operator binds less tightly than its right
+        binding power, which is exactly where pratt_expr's call for it would return
+        """
+        nodes = []
+        ops = []
+        min_bp = 0
+        while True:
+            # operand position
+            token = self.current_token
+            if token.type == T.INTEGER:
+                self.current_token = self.lexer.get_next_token()
+                nodes.append(Num(token))
+            elif token.type == T.IDENTIFIER:
+                self.current_token = self.lexer.get_next_token()
+                nodes.append(Var(token))
+            elif token.type == T.LPAREN:
+                start = self.token_span()[0]
+                self.current_token = self.lexer.get_next_token()
+                ops.append((start, 0, PAREN))
+                min_bp = 0
+                continue
+            else:
+                prefix_bp = PREFIX_OPERATORS.get(token.type)
+                if prefix_bp is None or prefix_bp < min_bp:
+                    self.error(f"Expected an operand, got '{token.type}'")
+                self.current_token = self.lexer.get_next_token()
+                ops.append((token, prefix_bp, PREFIX))
+                min_bp = prefix_bp
+                continue
+
+            # operator position: close parentheses until an infix operator or the end
+            while True:
+                token = self.current_token
+                binding = INFIX_OPERATORS.get(token.type)
+                left_bp = -1 if binding is None else binding[0]
+                while ops and ops[-1][2] != PAREN and ops[-1][1] > left_bp:
+                    op, _, kind = ops.pop()
+                    if kind == PREFIX:
+                        nodes.append(UnaryOp(op, nodes.pop()))
+                    else:
+                        right = nodes.pop()
+                        nodes.append(BinOp(left=nodes.pop(), op=op, right=right))
+                if binding is not None:
+                    self.current_token = self.lexer.get_next_token()
+                    ops.append((token, binding[1], INFIX))
+                    min_bp = binding[1]
+                    break
+                if not ops:
+                    return nodes.pop()
+                self.close_paren(nodes[-1], ops.pop()[0])
+    
+    def parse(self):
+        program_node =  self.parse_program()
+        if self.current_token.type != T.EOF:
+            self.error("Unexpected tokens after end of program")
+        if self.share_subtrees:
+            # imported here because cse itself builds on this module
+            from ccompiler.parser.cse import share_subtrees
+            program_node, self.sharing_stats = share_subtrees(program_node)
+        return program_node
+
+class NodeVisitor:
+    # This class is to traverse or visit nodes in AST using the visitor design pattern  
+    def visit(self, node):
+        # 1. Construct the method name dynamically , (e.g., 'BinOp', 'Num'),
+        #    method name becomes a string like 'visit_BinOp', 'visit_Num'
+        method_name = 'visit_' + type(node).__name__
+
+        # 2. Return the method object corresbonding to the specific node type
+        # if such a method doesn't exist, it returns the default fallback method
+        visitor = getattr(self, method_name, self.generic_visit)
+        
+        return visitor(node)
+
+    def generic_visit(self, node):
+        raise Exception('No visit_{} method'.format(type(node).__name__))
+    
+class Interpreter(NodeVisitor):
+    def __init__(self, parser, on_event=None, budget=None):
+        self.parser = parser 
+        self.variables = {}
+        # on_event(kind, **details) is called for assignments and unary results,
+        # when given; without it evaluation reports nothing
+        self.on_event = on_event
+        # budget: a started Budget (parser/budget.py) every operator is checked against
+        self.budget = budget
+   
+    def visit_Program(self, node):
+        return self.visit(node.function)
+    
+    def visit_Function(self, node):
+        return self.visit(node.body)
+    
+    def visit_Block(self, node):
+        #print(f"Block has {len(node.statements)} statements")
+        result = None
+        for i, statement in enumerate(node.statements):
+            #print(f"Visiting statement {i+1}: {type(statement).__name__}")
+            result = self.visit(statement)
+        return result
+
+    def visit_Assign(self, node):
+        var_name = node.left.name
+        value = self.visit(node.right)
+        self.variables[var_name] = value
+        if self.on_event is not None:
+            self.on_event('assign', name=var_name, value=value)
+        return value
+
+    def visit_Var(self, node):
+        var_name = node.name
+        if var_name in self.variables:
+            return self.variables[var_name]
+        else:
+            raise runtime_error(f"Undefined variable: {var_name}", node.start, node.end)
+           
+
+
+    def visit_Return(self, node):
+        return self.visit(node.expr)
+
+    def visit_BinOp(self, node):
+        # Post-order: Visit children → process node
+        #print(f"Visiting BinOp with op: {node.op.type}")
+        left_val = (self.visit(node.left))
+        #print(f"left value: {left_val} ")
+        right_val = (self.visit(node.right))
+        op_type = node.op.type
+
+        #print(f"right value: {right_val}")
+        if self.budget is not None:
+            return self.budget.binary(op_type, left_val, right_val, node.start, node.end)
+        
+        if op_type == T.PLUS:
+            return left_val + right_val
+        elif op_type == T.MINUS:
+            return left_val - right_val
+        elif op_type == T.MUL:
+            return left_val * right_val
+        elif op_type == T.DIV:
+            if right_val == 0: 
+                raise runtime_error("Runtime Error: Division by zero", node.start, node.end)
+            return left_val / right_val
+        elif op_type == T.MOD:
+            if right_val == 0:
+                raise runtime_error("Runtime Error: Modulo by zero", node.start, node.end)
+            return left_val % right_val
+        elif op_type == T.POWER:
+            return left_val ** right_val
+        else:
+            raise Exception(f"Unknown operator: {op_type}")
+        
+        
+    
+    def visit_UnaryOp(self, node):
+        #print(f"Visiting UnaryOp with op: {node.op.type}")
+        op = node.op.type
+        if self.budget is not None:
+            result = self.budget.unary(op, self.visit(node.expr), node.start, node.end)
+        elif op == T.PLUS :
+            result =  +1 * self.visit(node.expr)
+        elif op == T.MINUS:
+            result =  -1 * self.visit(node.expr)
+        if self.on_event is not None:
+            self.on_event('unary', op=op, value=result)
+        return result
+                
+    
+    def visit_Num(self, node):
+        # the lexer already turned the integer lexeme into an int
+        return node.value
+    
+    def interpret(self):
+        tree = self.parser.parse()
+        return self.visit(tree)
+
+def interactie_menu_loop(filepath):
+    # imported here because the optimizer and the cache themselves import this module
+    # (and so that importing the parser does not load file handling)
+    from ccompiler.parser.optimizer import optimize
+    from ccompiler.parser.compile_cache import CompileCache
+    from ccompiler.scanner.file_input import SourceFile
+    from ccompiler.scanner.line_index import LineIndex
+
+    cache = CompileCache()
+    while True:
+        print("1. Print the tokens")
+        print("2. Compile the file")
+        print("3. Exit")
+        choice = input("Enter an option (1-3): ")
+        
+        if choice == "1" or choice == "2":
+            # Both options need to read the file
+            if not os.path.exists(filepath):
+                print(f"Error: File '{filepath}' not found.")
+                continue  # Don't return — stay in menu
+            
+            # tokens are scanned straight from the mapped file, never reading it whole
+            source = SourceFile(filepath)
+            
+            if choice == "1":
+                # Use Lexer to get tokens
+                lexer = source.lexer()
+                tokens = []
+                token = lexer.get_next_token()
+                while token.type != T.EOF:
+                    tokens.append(token)
+                    token = lexer.get_next_token()
+                
+                print("Scanner tokens:")
+                for t in tokens:
+                    desc = TOKEN_DESCRIPTIONS.get(t.type, "unknown")
+                    print(f" '{t.lexeme}' -> {desc}")
+                    
+            elif choice == "2":
+                try:
+                    def build():
+                        # only runs when the cache has no entry for this exact source
+                        lexer = source.lexer()
+                        parser = Parser(lexer)
+                        tree, stats = optimize(parser.parse())
+                        print(f"Optimized: {stats}")
+                        return tree
+
+                    tree = cache.get_or_build(cache.key_for_file(filepath, source.encoding), build)
+                    print(f"Compile cache: {cache.stats}")
+                    interpreter = Interpreter(None)
+                    result = interpreter.visit(tree)
+                    print(f"✅ Compiled successfully! Result: {result}")
+                except ParserError as e:
+                    where = f" at line {e.line}, column {e.column}" if e.line is not None else ""
+                    print(f"❌ Syntax Error: {e.message}{where}")
+                except Exception as e:  # ← Add this to catch runtime errors
+                    where = ""
+                    if getattr(e, 'start', None) is not None:
+                        # the tree may come from the cache, so index the file's lines now
+                        line_index = LineIndex()
+                        for _ in source.chunks(line_index):
+                            pass
+                        where = f" at {line_index.describe(e.start)}"
+                    print(f"💥 Runtime Error: {e}{where}")
+                        
+        elif choice == "3":
+            break
+        else:
+            print("⚠️  Invalid choice, try again.")
+
+def main():
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    filepath = os.path.join(project_root, "cfile.txt")
+    # if not os.path.exists(filepath):
+    #     print(f"Error: File '{filepath}' not found.")
+    #     return
+    
+    # with open(filepath , "r") as f:
+    #     text = f.read()
+
+    # lexer = Lexer(text)
+    # parser = Parser(lexer)
+    # interpreter = Interpreter(parser)
+    # result = interpreter.interpret()
+    # print(result)
+    interactie_menu_loop(filepath)
+
+
+    
+    
+    
+
+if __name__ == '__main__':
+    main()
+
+
+
+
+
+
+
+
+
+
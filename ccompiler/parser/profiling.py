@@ -0,0 +1,229 @@
+# opt-in instrumentation: where a compile spends its time and memory
+#   python -m ccompiler.parser.profiling FILE [--scanner regex] [--events] [--trace trace.json]
+# nothing here runs unless asked for; the plain Lexer/Parser/Interpreter path is untouched
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from ccompiler.scanner.lex_scanner import SCANNERS, Lexer
+from ccompiler.scanner.file_input import SourceFile
+from ccompiler.parser.parser import Parser, Interpreter
+
+
+# child attributes of each node class, for counting nodes without recursion
+CHILDREN = {
+    'Program': ('function',),
+    'Function': ('body',),
+    'Assign': ('left', 'right'),
+    'Return': ('expr',),
+    'BinOp': ('left', 'right'),
+    'UnaryOp': ('expr',),
+}
+
+
+def count_nodes_by_class(tree):
+    counts = Counter()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        kind = type(node).__name__
+        counts[kind] += 1
+        if kind == 'Block':
+            stack.extend(node.statements)
+        else:
+            stack.extend(getattr(node, name) for name in CHILDREN.get(kind, ()))
+    return counts
+
+
+class PhaseStats:
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0          # perf_counter() offset from the start of the profile
+        self.seconds = 0.0
+        self.allocated_bytes = None  # net bytes still allocated after the phase
+        self.peak_bytes = None       # peak traced memory during the phase
+
+
+class Profile:
+    """
+    Everything recorded about one compile: wall time and allocations per phase,
+    token count, AST node counts by class, visit counts per visit_* method,
+    the deepest visit recursion and, when asked for, the evaluation events.
+    """
+
+    def __init__(self, allocations=True, keep_events=False, max_events=100000):
+        self.allocations = allocations
+        self.keep_events = keep_events
+        self.max_events = max_events
+        self.origin = time.perf_counter()
+        self.phases = {}
+        self.tokens = None  # known when the profile scanned the source itself
+        self.node_counts = Counter()
+        self.visit_counts = Counter()
+        self.max_depth = 0
+        self.event_counts = Counter()
+        self.events = []
+        self.result = None
+        self.error = None
+
+    @contextmanager
+    def phase(self, name):
+        stats = self.phases[name] = PhaseStats(name)
+        tracing = self.allocations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        stats.start = start - self.origin
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - start
+            if tracing:
+                stats.allocated_bytes, stats.peak_bytes = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+    def record_event(self, kind, **details):
+        self.event_counts[kind] += 1
+        if self.keep_events and len(self.events) < self.max_events:
+            details = {key: value if isinstance(value, (int, float, str)) else str(value)
+                       for key, value in details.items()}
+            self.events.append({'kind': kind, 'time': time.perf_counter() - self.origin, **details})
+
+    def to_dict(self):
+        return {
+            'phases': {name: {'seconds': stats.seconds,
+                              'allocated_bytes': stats.allocated_bytes,
+                              'peak_bytes': stats.peak_bytes}
+                       for name, stats in self.phases.items()},
+            'tokens': self.tokens,
+            'node_counts': dict(self.node_counts),
+            'visit_counts': dict(self.visit_counts),
+            'max_depth': self.max_depth,
+            'event_counts': dict(self.event_counts),
+            'error': self.error,
+        }
+
+    def to_trace(self):
+        """Chrome trace event format (chrome://tracing, Perfetto): one span per phase, one instant per event"""
+        events = [{'name': stats.name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                   'ts': stats.start * 1e6, 'dur': stats.seconds * 1e6}
+                  for stats in self.phases.values()]
+        for event in self.events:
+            args = {key: value for key, value in event.items() if key not in ('kind', 'time')}
+            events.append({'name': event['kind'], 'ph': 'i', 's': 't', 'pid': 0, 'tid': 0,
+                           'ts': event['time'] * 1e6, 'args': args})
+        return {'traceEvents': events, 'otherData': self.to_dict()}
+
+    def write_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_trace(), f)
+
+    def summary(self):
+        lines = ["phase         time (ms)   allocated (KiB)   peak (KiB)"]
+        for stats in self.phases.values():
+            if stats.peak_bytes is None:
+                memory = f"{'-':>17} {'-':>12}"
+            else:
+                memory = f"{stats.allocated_bytes / 1024:17.1f} {stats.peak_bytes / 1024:12.1f}"
+            lines.append(f"{stats.name:<10} {stats.seconds * 1000:12.3f} {memory}")
+        if self.tokens is not None:
+            lines.append(f"tokens: {self.tokens}")
+        lines.append("nodes: " + ", ".join(f"{kind} {n}" for kind, n in self.node_counts.most_common()))
+        lines.append("visits: " + ", ".join(f"{name} {n}" for name, n in self.visit_counts.most_common()))
+        lines.append(f"max visit depth: {self.max_depth}")
+        if self.event_counts:
+            lines.append("events: " + ", ".join(f"{kind} {n}" for kind, n in self.event_counts.most_common()))
+        if self.error is not None:
+            lines.append(f"error: {self.error}")
+        return "\n".join(lines)
+
+
+class ProfilingInterpreter(Interpreter):
+    """Interpreter that counts visits per visit_* method and tracks the visit depth"""
+
+    def __init__(self, profile, budget=None):
+        super().__init__(None, on_event=profile.record_event, budget=budget)
+        self.profile = profile
+        self.depth = 0
+
+    def visit(self, node):
+        profile = self.profile
+        profile.visit_counts['visit_' + type(node).__name__] += 1
+        self.depth += 1
+        if self.depth > profile.max_depth:
+            profile.max_depth = self.depth
+        try:
+            return super().visit(node)
+        finally:
+            self.depth -= 1
+
+
+def interpret(tree, profile, budget=None):
+    profile.node_counts = count_nodes_by_class(tree)
+    if budget is not None:
+        budget.start()
+    with profile.phase('interpret'):
+        profile.result = ProfilingInterpreter(profile, budget).visit(tree)
+
+
+def profile_source(text, scanner='legacy', profile=None, budget=None):
+    """
+    scan, lex, parse and interpret text phase by phase, returning the Profile.
+    Errors are stored on profile.error instead of raised, so the phases
+    that did run are still reported; budget limits the interpret phase
+    """
+    profile = profile or Profile()
+    try:
+        with profile.phase('scan'):
+            scanner_tokens = SCANNERS[scanner](text)
+        with profile.phase('lex'):
+            lexer = Lexer(text, scanner_tokens=scanner_tokens)
+        profile.tokens = len(lexer.tokens) - 1  # without EOF
+        with profile.phase('parse'):
+            tree = Parser(lexer).parse()
+        interpret(tree, profile, budget)
+    except Exception as e:
+        profile.error = getattr(e, 'message', None) or str(e)
+    return profile
+
+
+def profile_tree(tree, profile=None, budget=None):
+    """profile_source's node counts and interpret phase for a tree already parsed"""
+    profile = profile or Profile()
+    try:
+        interpret(tree, profile, budget)
+    except Exception as e:
+        profile.error = getattr(e, 'message', None) or str(e)
+    return profile
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Profile the compile of one source file")
+    arg_parser.add_argument('path')
+    arg_parser.add_argument('--scanner', choices=sorted(SCANNERS), default='legacy')
+    arg_parser.add_argument('--no-allocations', action='store_true', help="skip tracemalloc, timing only")
+    arg_parser.add_argument('--events', action='store_true', help="print every evaluation event")
+    arg_parser.add_argument('--trace', help="write a Chrome trace event JSON file here")
+    args = arg_parser.parse_args(argv)
+
+    text = "".join(SourceFile(args.path).chunks())
+    profile = Profile(allocations=not args.no_allocations, keep_events=args.events or bool(args.trace))
+    profile_source(text, args.scanner, profile)
+    if args.events:
+        for event in profile.events:
+            details = " ".join(f"{key}={value}" for key, value in event.items() if key not in ('kind', 'time'))
+            print(f"{event['kind'].upper()}: {details}")
+    print(profile.summary())
+    if profile.error is None:
+        print(f"result: {profile.result}")
+    if args.trace:
+        profile.write_trace(args.trace)
+        print(f"trace written to {args.trace}")
+    return 0 if profile.error is None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
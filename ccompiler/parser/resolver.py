@@ -0,0 +1,168 @@
+import weakref
+from ccompiler.parser.parser import NodeVisitor, Interpreter, runtime_error
+from ccompiler.parser.parser import Program, Function, Block, Assign, Return, BinOp, UnaryOp, Var
+from ccompiler.parser.optimizer import at
+from ccompiler.parser.vm import UNSET
+
+# slot of a read that happens before any assignment to its variable
+UNDEFINED = -1
+
+
+class ResolveError(Exception):
+    """
+    the undefined variable error every run of a program raises, found before
+    running it (see Resolution.check); located like runtime_error's
+    """
+
+    def __init__(self, message, start=None, end=None):
+        super().__init__(message)
+        self.start = start
+        self.end = end
+
+
+class Resolution:
+    def __init__(self):
+        self.slots = {}      # name -> slot
+        self.names = []      # slot -> name
+        self.undefined = []  # Var nodes read before any assignment, in evaluation order
+        # no operator, and so nothing that can fail, is evaluated before the first of them
+        self.certain = False
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        return self.slots[name]
+
+    def check(self):
+        """
+        raise ResolveError for the first read before assignment when every run
+        reaches it: it is then the error any backend would raise, spans included.
+        Otherwise an earlier operator may fail first, and the run decides
+        """
+        if self.undefined and self.certain:
+            node = self.undefined[0]
+            raise ResolveError(f"Undefined variable: {node.name}", node.start, node.end)
+
+    def __str__(self):
+        return f"{len(self.names)} slots, {len(self.undefined)} reads before assignment"
+
+
+class Resolver(NodeVisitor):
+    """
+    Give every distinct variable of a Function a fixed integer slot, in order of
+    first appearance. Like the Optimizer it returns a new tree and leaves its input
+    alone: Var nodes are copied with a slot attribute (UNDEFINED for a read before
+    any assignment) and Assign nodes with the slot they store to. Subtrees without
+    variables are shared with the input.
+    """
+
+    def __init__(self):
+        self.resolution = Resolution()
+        self.assigned = set()  # names certainly assigned at this point of the block
+        self.operators = 0     # operators evaluated so far
+
+    def visit_Program(self, node):
+        return at(Program(self.visit(node.function)), node)
+
+    def visit_Function(self, node):
+        return at(Function(node.name, self.visit(node.body)), node)
+
+    def visit_Block(self, node):
+        return at(Block([self.visit(statement) for statement in node.statements]), node)
+
+    def visit_Assign(self, node):
+        # the value is read before the name is stored, so 'x = x + 1' reads an unset x
+        right = self.visit(node.right)
+        name = node.left.name
+        target = at(Var(node.left.token), node.left)
+        target.slot = self.resolution.slot(name)
+        self.assigned.add(name)
+        assign = at(Assign(target, right), node)
+        assign.slot = target.slot
+        return assign
+
+    def visit_Return(self, node):
+        return at(Return(self.visit(node.expr)), node)
+
+    def visit_Var(self, node):
+        var = at(Var(node.token), node)
+        var.slot = self.resolution.slot(node.name)
+        if node.name not in self.assigned:
+            var.slot = UNDEFINED
+            if not self.resolution.undefined:
+                self.resolution.certain = self.operators == 0
+            self.resolution.undefined.append(node)
+        return var
+
+    def visit_Num(self, node):
+        return node
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        self.operators += 1
+        if left is node.left and right is node.right:
+            return node
+        return at(BinOp(left=left, op=node.op, right=right), node)
+
+    def visit_UnaryOp(self, node):
+        expr = self.visit(node.expr)
+        self.operators += 1
+        return node if expr is node.expr else at(UnaryOp(node.op, expr), node)
+
+
+# input Program -> its resolved Program, and resolved Program -> Resolution,
+# kept as long as the Programs are alive so a tree is resolved once
+_resolved = weakref.WeakKeyDictionary()
+_resolutions = weakref.WeakKeyDictionary()
+
+
+def resolve(tree):
+    """(resolved tree, Resolution) for a Program; a resolved tree is returned as is"""
+    if tree in _resolutions:
+        return tree, _resolutions[tree]
+    resolved = _resolved.get(tree)
+    if resolved is None:
+        resolver = Resolver()
+        resolved = _resolved[tree] = resolver.visit(tree)
+        _resolutions[resolved] = resolver.resolution
+    return resolved, _resolutions[resolved]
+
+
+class SlotInterpreter(Interpreter):
+    """
+    Interpreter over resolved trees: variables live in a list frame indexed by
+    slot instead of a dict keyed by name. The resolver has proven that every
+    other read comes after an assignment, so only reads marked UNDEFINED need a
+    check. Results, errors and events match Interpreter, which stays the
+    reference to test against.
+    """
+
+    def __init__(self, parser=None, on_event=None, budget=None):
+        super().__init__(parser, on_event, budget)
+        self.frame = []
+        self.names = []
+
+    def visit_Program(self, node):
+        node, resolution = resolve(node)
+        self.names = resolution.names
+        self.frame = [UNSET] * len(resolution.names)
+        return self.visit(node.function)
+
+    @property
+    def values(self):
+        """name -> value of the variables assigned so far"""
+        return {name: value for name, value in zip(self.names, self.frame) if value is not UNSET}
+
+    def visit_Assign(self, node):
+        value = self.frame[node.slot] = self.visit(node.right)
+        if self.on_event is not None:
+            self.on_event('assign', name=node.left.name, value=value)
+        return value
+
+    def visit_Var(self, node):
+        slot = node.slot
+        if slot == UNDEFINED:
+            raise runtime_error(f"Undefined variable: {node.name}", node.start, node.end)
+        return self.frame[slot]
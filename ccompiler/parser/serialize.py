@@ -0,0 +1,419 @@
+# versioned binary encoding of token streams (TokenBuffer) and parsed programs
+# (Program trees, spans included), so that tools running after the parser can be
+# handed its output instead of scanning and parsing the source again
+import io
+import sys
+import struct
+from array import array
+from itertools import accumulate
+from ccompiler.tokens import TokenType as T, TOKEN_TYPES
+from ccompiler.scanner.lex_scanner import Token
+from ccompiler.scanner.token_buffer import TokenBuffer
+from ccompiler.parser.parser import Program, Function, Block, Assign, Return, BinOp, UnaryOp, Num, Var
+
+# ---- layout ----
+# A stream is a HEADER followed by frames, each a FRAME header and its payload.
+# Numbers are little-endian and every section starts 8-byte aligned, so the
+# columns of a frame are read where they lie, through memoryview.cast.
+#   HEADER  magic, format version, content (TOKENS or NODES)
+#   FRAME   kind, item count, string count, payload bytes
+# a payload starts with the frame's strings: their UTF-8 lengths ('I' each), then their text.
+#   TOKENS frame: per token its type code 'B', start 'q' and lexeme id 'I' (an index into
+#                 the frame's strings), then per string 'B' 1 if it is an integer lexeme
+#   NODES frame:  per node, in pre-order, its kind 'B', argument 'q', start 'q' and end 'q',
+#                 then the frame's other constants as text, one per line
+# Frames are self-contained, so a reader can use each one as soon as it has it.
+# An END frame, whose item count is the stream's total, closes the stream: a
+# stream without one was cut short.
+MAGIC = b'CCBF'
+# bump when the layout, the node kinds or the token type codes change
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHH')
+FRAME = struct.Struct('<4I')
+TOKENS, NODES, END = 1, 2, 3
+
+DEFAULT_FRAME_TOKENS = 1 << 16
+DEFAULT_FRAME_STATEMENTS = 1 << 10
+
+# node kinds. A program stream starts with its PROGRAM, FUNCTION and BLOCK, each
+# without children; the block's statements follow. Children follow their node in
+# pre-order: ASSIGN its Var and value, RETURN and UNARYOP their operand, BINOP its
+# left and right operands. The argument is the name id (FUNCTION, VAR), the operator's token type code
+# (BINOP, UNARYOP), the value (NUM, int64) or the index of the constant
+# (CONSTANT: floats, complex numbers and larger ints the optimizer folded)
+PROGRAM, FUNCTION, BLOCK, ASSIGN, RETURN, BINOP, UNARYOP, NUM, CONSTANT, VAR = range(10)
+HEADER_KINDS = (PROGRAM, FUNCTION, BLOCK)
+NO_OFFSET = -1
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+OP_LEXEMES = {T.PLUS: '+', T.MINUS: '-', T.MUL: '*', T.DIV: '/', T.MOD: '%', T.POWER: '**'}
+PADDING = bytes(8)
+# columns are used in place only where the machine's byte order is the format's
+SWAP = sys.byteorder != 'little'
+
+
+def aligned(size):
+    return size + (-size % 8)
+
+
+def write_frame(out, kind, items, strings, *sections):
+    """one frame: strings, then each section (bytes or array) padded to 8 bytes"""
+    encoded = [string.encode() for string in strings]
+    sections = (array('I', map(len, encoded)), b''.join(encoded)) + sections
+    sizes = [len(section) * getattr(section, 'itemsize', 1) for section in sections]
+    out.write(FRAME.pack(kind, items, len(strings), sum(map(aligned, sizes))))
+    for section, size in zip(sections, sizes):
+        if SWAP and getattr(section, 'itemsize', 1) > 1:
+            section = array(section.typecode, section)
+            section.byteswap()
+        out.write(section)
+        out.write(PADDING[:-size % 8])
+
+
+class FrameReader:
+    """sections of one frame's payload, in the order they were written, as views into it"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.pos = 0
+
+    def take(self, count, typecode='B'):
+        size = count * array(typecode).itemsize
+        if self.pos + size > len(self.payload):
+            raise ValueError("Frame shorter than its contents")
+        section = self.payload[self.pos: self.pos + size]
+        self.pos += aligned(size)
+        if SWAP and typecode != 'B':
+            column = array(typecode, section.tobytes())
+            column.byteswap()
+            return column
+        return section.cast(typecode)
+
+    def strings(self, count):
+        lengths = self.take(count, 'I')
+        data = self.take(sum(lengths))
+        ends = accumulate(lengths)
+        return [str(data[end - length: end], 'utf-8') for length, end in zip(lengths, ends)]
+
+    def rest(self):
+        return self.payload[self.pos:]
+
+
+def frames(source, content):
+    """
+    (kind, items, strings, payload view) of every frame of a stream of the given
+    content, from bytes-like data (bytes, bytearray, mmap: read in place) or a
+    binary file object (read one frame at a time)
+    """
+    if hasattr(source, 'read'):
+        read = source.read
+    else:
+        view = memoryview(source).cast('B')
+        pos = 0
+
+        def read(size):
+            nonlocal pos
+            pos += size
+            return view[pos - size: pos]
+
+    header = read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Not a serialized stream: too short")
+    magic, version, found = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a serialized stream: bad magic")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {version}")
+    if found != content:
+        raise ValueError(f"Expected a stream of content {content}, got {found}")
+    while True:
+        frame = read(FRAME.size)
+        if len(frame) < FRAME.size:
+            raise ValueError("Stream cut short: no END frame")
+        kind, items, strings, size = FRAME.unpack(frame)
+        if kind == END:
+            yield kind, items, strings, None
+            return
+        payload = memoryview(read(size))
+        if len(payload) < size:
+            raise ValueError("Stream cut short inside a frame")
+        yield kind, items, strings, payload
+
+
+# ---- token streams ----
+
+def write_tokens(buffer, out, frame_tokens=DEFAULT_FRAME_TOKENS):
+    """write the tokens of a TokenBuffer to a binary file object"""
+    out.write(HEADER.pack(MAGIC, FORMAT_VERSION, TOKENS))
+    for first in range(0, len(buffer), frame_tokens):
+        last = min(first + frame_tokens, len(buffer))
+        local = {}  # buffer lexeme id -> id in this frame
+        lexeme_ids = array('I', [local.setdefault(i, len(local)) for i in buffer.lexeme_ids[first:last]])
+        lexemes = [buffer.lexemes[i] for i in local]
+        integers = bytes(type(buffer.values[i]) is int for i in local)
+        write_frame(out, TOKENS, last - first, lexemes,
+                    buffer.types[first:last], buffer.starts[first:last], lexeme_ids, integers)
+    out.write(FRAME.pack(END, len(buffer), 0, 0))
+
+
+def read_tokens(source):
+    """
+    a TokenBuffer per frame of a token stream, as it is read. Its columns are
+    read-only views of the frame; it has no line_index (the source is not stored)
+    """
+    count = 0
+    for kind, items, strings, payload in frames(source, TOKENS):
+        if kind == END:
+            if count != items:
+                raise ValueError(f"Expected {items} tokens, read {count}")
+            return
+        if kind != TOKENS:
+            raise ValueError(f"Unexpected frame kind {kind} in a token stream")
+        reader = FrameReader(payload)
+        lexemes = reader.strings(strings)
+        buffer = TokenBuffer()
+        buffer.types = reader.take(items, 'B')
+        buffer.starts = reader.take(items, 'q')
+        buffer.lexeme_ids = reader.take(items, 'I')
+        integers = reader.take(strings, 'B')
+        buffer.lexemes = lexemes
+        buffer.values = [int(lexeme) if integer else lexeme for lexeme, integer in zip(lexemes, integers)]
+        buffer.ids = {lexeme: i for i, lexeme in enumerate(lexemes)}
+        buffer.shared_tokens = [None] * strings
+        count += items
+        yield buffer
+
+
+def load_tokens(source):
+    """the whole token stream as one TokenBuffer (in place when it is a single frame)"""
+    buffers = list(read_tokens(source))
+    if len(buffers) == 1:
+        return buffers[0]
+    merged = TokenBuffer()
+    for buffer in buffers:
+        merged.extend(buffer)
+    return merged
+
+
+# ---- programs ----
+
+class NodeFrame:
+    """one NODES frame being written: nodes in pre-order, column by column"""
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.args = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.names = {}
+        self.constants = []
+
+    def add(self, kind, arg, node):
+        self.kinds.append(kind)
+        self.args.append(arg)
+        self.starts.append(NO_OFFSET if node.start is None else node.start)
+        self.ends.append(NO_OFFSET if node.end is None else node.end)
+
+    def name(self, name):
+        return self.names.setdefault(name, len(self.names))
+
+    def constant(self, value):
+        if type(value) is int:
+            text = 'i' + hex(value)  # hex: int() parses it whatever its number of digits
+        elif type(value) is float:
+            text = 'f' + value.hex()
+        elif type(value) is complex:
+            text = f"c{value.real.hex()} {value.imag.hex()}"
+        else:
+            raise ValueError(f"Cannot serialize constant {value!r}")
+        self.constants.append(text)
+        return len(self.constants) - 1
+
+    def add_tree(self, node):
+        # iterative, so no nesting depth is too deep to write
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            kind = type(node).__name__
+            if kind == 'Num':
+                value = node.value
+                if type(value) is int and INT64_MIN <= value <= INT64_MAX:
+                    self.add(NUM, value, node)
+                else:
+                    self.add(CONSTANT, self.constant(value), node)
+            elif kind == 'Var':
+                self.add(VAR, self.name(node.name), node)
+            elif kind == 'BinOp':
+                self.add(BINOP, node.op.type, node)
+                stack.append(node.right)
+                stack.append(node.left)
+            elif kind == 'UnaryOp':
+                self.add(UNARYOP, node.op.type, node)
+                stack.append(node.expr)
+            elif kind == 'Assign':
+                self.add(ASSIGN, 0, node)
+                stack.append(node.right)
+                stack.append(node.left)
+            elif kind == 'Return':
+                self.add(RETURN, 0, node)
+                stack.append(node.expr)
+            else:
+                raise ValueError(f"Cannot serialize {kind}")
+
+    def write(self, out):
+        write_frame(out, NODES, len(self.kinds), list(self.names),
+                    self.kinds, self.args, self.starts, self.ends, "\n".join(self.constants).encode())
+
+
+def write_program(tree, out, frame_statements=DEFAULT_FRAME_STATEMENTS):
+    """write a Program to a binary file object, frame_statements statements per frame"""
+    out.write(HEADER.pack(MAGIC, FORMAT_VERSION, NODES))
+    function = tree.function
+    frame = NodeFrame()
+    frame.add(PROGRAM, 0, tree)
+    frame.add(FUNCTION, frame.name(function.name), function)
+    frame.add(BLOCK, 0, function.body)
+    statements = function.body.statements
+    for count, statement in enumerate(statements, 1):
+        frame.add_tree(statement)
+        if count % frame_statements == 0:
+            frame.write(out)
+            frame = NodeFrame()
+    if len(frame.kinds):
+        frame.write(out)
+    out.write(FRAME.pack(END, len(statements), 0, 0))
+
+
+def parse_constant(text):
+    if text[0] == 'i':
+        return int(text[1:], 16)
+    if text[0] == 'f':
+        return float.fromhex(text[1:])
+    if text[0] == 'c':
+        real, imag = text[1:].split()
+        return complex(float.fromhex(real), float.fromhex(imag))
+    raise ValueError(f"Bad constant {text!r}")
+
+
+def num_token(value, lexeme):
+    # the optimizer's folded constants are not necessarily ints
+    token = Token(lexeme, None)
+    token.type = T.INTEGER
+    token.value = value
+    return token
+
+
+def decode_nodes(reader, items, strings):
+    """the top-level nodes of one NODES frame, in order"""
+    names = reader.strings(strings)
+    kinds = reader.take(items, 'B')
+    args = reader.take(items, 'q')
+    starts = reader.take(items, 'q')
+    ends = reader.take(items, 'q')
+    constants = str(reader.rest(), 'utf-8').rstrip("\0").split("\n")
+    # tokens are shared by every node with the same name, value or operator;
+    # the nodes carry the spans
+    var_tokens = [Token(name, T.IDENTIFIER) for name in names]
+    num_tokens = {}
+    constant_tokens = [None] * len(constants)
+    op_tokens = {}
+
+    # walking the pre-order backwards, a node's children are already built, on top of the stack
+    stack = []
+    push, pop = stack.append, stack.pop
+    for kind, arg, start, end in zip(reversed(kinds), reversed(args), reversed(starts), reversed(ends)):
+        if kind == NUM:
+            token = num_tokens.get(arg)
+            if token is None:
+                token = num_tokens[arg] = num_token(arg, str(arg))
+            node = Num(token)
+        elif kind == VAR:
+            node = Var(var_tokens[arg])
+        elif kind == BINOP or kind == UNARYOP:
+            op = op_tokens.get(arg)
+            if op is None:
+                op_type = TOKEN_TYPES[arg]
+                if op_type not in OP_LEXEMES:
+                    raise ValueError(f"Unknown operator {op_type}")
+                op = op_tokens[arg] = Token(OP_LEXEMES[op_type], op_type)
+            node = BinOp(pop(), op, pop()) if kind == BINOP else UnaryOp(op, pop())
+        elif kind == CONSTANT:
+            token = constant_tokens[arg]
+            if token is None:
+                text = constants[arg]
+                token = constant_tokens[arg] = num_token(parse_constant(text), text[1:])
+            node = Num(token)
+        elif kind == ASSIGN:
+            node = Assign(pop(), pop())
+        elif kind == RETURN:
+            node = Return(pop())
+        elif kind in HEADER_KINDS:
+            # (kind, name, start, end): built once the statements are read
+            push((kind, names[arg] if kind == FUNCTION else None,
+                  None if start == NO_OFFSET else start, None if end == NO_OFFSET else end))
+            continue
+        else:
+            raise ValueError(f"Unknown node kind {kind}")
+        node.start = None if start == NO_OFFSET else start
+        node.end = None if end == NO_OFFSET else end
+        push(node)
+    stack.reverse()
+    return stack
+
+
+def read_nodes(source):
+    """the top-level nodes of a program stream, frame by frame as it is read"""
+    count = 0
+    for kind, items, strings, payload in frames(source, NODES):
+        if kind == END:
+            if count != items + len(HEADER_KINDS):
+                raise ValueError(f"Expected {items} statements, read {count - len(HEADER_KINDS)}")
+            return
+        if kind != NODES:
+            raise ValueError(f"Unexpected frame kind {kind} in a program stream")
+        for node in decode_nodes(FrameReader(payload), items, strings):
+            yield node
+            count += 1
+
+
+def read_header(nodes):
+    """(kind, name, start, end) of the program, function and block a program stream starts with"""
+    header = [next(nodes, None) for _ in HEADER_KINDS]
+    if tuple(node[0] if type(node) is tuple else None for node in header) != HEADER_KINDS:
+        raise ValueError("Program stream does not start with its program, function and block")
+    return header
+
+
+def read_statements(source):
+    """the statements of a program stream, each as soon as its frame is read"""
+    nodes = read_nodes(source)
+    read_header(nodes)
+    yield from nodes
+
+
+def read_program(source):
+    """the Program of a program stream"""
+    nodes = read_nodes(source)
+    program, function, block = read_header(nodes)
+    body = Block(list(nodes))
+    body.start, body.end = block[2:]
+    node = Function(function[1], body)
+    node.start, node.end = function[2:]
+    tree = Program(node)
+    tree.start, tree.end = program[2:]
+    return tree
+
+
+def encode_program(tree):
+    """a Program as bytes"""
+    out = io.BytesIO()
+    write_program(tree, out)
+    return out.getvalue()
+
+
+def encode_tokens(buffer):
+    """a TokenBuffer as bytes"""
+    out = io.BytesIO()
+    write_tokens(buffer, out)
+    return out.getvalue()
+
@@ -0,0 +1,274 @@
+# long-running compile/evaluate server speaking line-delimited JSON:
+#   python -m ccompiler.parser.server [--host 127.0.0.1 --port 8765 | --unix PATH] [--workers N]
+#                           [--max-pending K] [--timeout S] [--backend tree]
+#                           [--max-steps N] [--max-int-bits B] [--deadline S] [--max-memory-mb M]
+# each request line is an object with "source" (program text) or "path" (a file
+# the server can read), optionally "id" and "backend"; each response line is the
+# record ccompiler.parser.batch prints for a file, with the request's "id"
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from ccompiler.scanner.file_input import SourceFile
+from ccompiler.scanner.line_index import LineIndex
+from ccompiler.parser.parser import ParserError
+from ccompiler.parser.backends import BACKENDS, compile_program
+from ccompiler.parser.compile_cache import CompileCache, DEFAULT_CACHE_DIR
+from ccompiler.parser.resolver import resolve
+from ccompiler.parser.batch import json_value
+from ccompiler.parser.budget import BudgetExceeded, DEFAULT_MAX_INT_BITS, add_budget_arguments, budget_from_args
+
+DEFAULT_PORT = 8765
+MAX_LINE = 64 * 1024 * 1024  # longest request line, in bytes
+
+
+# ---- worker side: runs in the pool processes ----
+
+def evaluate(request, cache, backend, budget=None):
+    """compile (through the cache) and run one request within budget, as a JSON-ready dict"""
+    start = time.perf_counter()
+    record = {}
+    text = request.get('source')
+    path = request.get('path')
+    hits = cache.stats.hits
+    try:
+        tree = cache.compile_text(text) if text is not None else cache.compile_file(path)
+        record['cached'] = cache.stats.hits > hits
+        # reported as the runtime_error the run would raise (see ccompiler.parser.batch)
+        resolve(tree)[1].check()
+        result = compile_program(tree, request.get('backend', backend), budget)()
+        record['status'] = 'ok'
+        record['result'] = json_value(result)
+    except ParserError as e:
+        record['status'] = 'syntax_error'
+        record['error'] = e.message
+        if e.line is not None:
+            record['line'], record['column'] = e.line, e.column
+    except (OSError, UnicodeDecodeError) as e:
+        record['status'] = 'io_error'
+        record['error'] = str(e)
+    except Exception as e:
+        if isinstance(e, BudgetExceeded):
+            record['status'] = 'budget_exceeded'
+            record['limit'] = e.limit
+        else:
+            record['status'] = 'runtime_error'
+        record['error'] = str(e)
+        if getattr(e, 'start', None) is not None:
+            # the tree may come from the cache, so the lines are only indexed now
+            if text is not None:
+                line_index = LineIndex(text)
+            else:
+                line_index = LineIndex()
+                for _ in SourceFile(path).chunks(line_index):
+                    pass
+            record['line'], record['column'] = line_index.location(e.start)
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def serve_worker(conn, cache_dir, backend, budget):
+    # one cache per process; they share the directory, so a program compiled by
+    # any worker is a disk hit for the others
+    cache = CompileCache(cache_dir, budget=budget)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        conn.send(evaluate(request, cache, backend, budget))
+
+
+class Worker:
+    """a warm worker process, fed one request at a time over a pipe"""
+
+    def __init__(self, context, cache_dir, backend, budget):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve_worker, args=(child, cache_dir, backend, budget),
+                                       daemon=True)
+        self.process.start()
+        child.close()
+
+    def call(self, request):
+        # blocks: the server runs it in a thread
+        self.conn.send(request)
+        return self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+# ---- server side ----
+
+class Server:
+    """
+    Accepts connections and answers their request lines, possibly out of order
+    (responses carry the request's "id"). Requests run in a pool of warm worker
+    processes within budget (a Budget, see parser/budget.py), so a
+    pathological program fails with a runtime error instead of holding its
+    worker; one that still exceeds the timeout is killed and replaced.
+    At most max_pending requests are queued or running at once: past that the
+    server stops reading, so clients are slowed down by TCP flow control
+    instead of filling the server's memory.
+    """
+
+    def __init__(self, workers=None, max_pending=64, timeout=10.0, cache_dir=DEFAULT_CACHE_DIR,
+                 backend='tree', budget=None):
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.backend = backend
+        self.budget = budget
+        self.context = multiprocessing.get_context('spawn')
+        self.idle = None
+        self.pending = None
+        self.threads = None
+        self.pool = []
+        self.served = 0
+        self.timeouts = 0
+
+    def start_worker(self):
+        worker = Worker(self.context, self.cache_dir, self.backend, self.budget)
+        self.pool.append(worker)
+        return worker
+
+    def replace(self, worker):
+        worker.kill()
+        self.pool.remove(worker)
+        return self.start_worker()
+
+    async def __aenter__(self):
+        self.idle = asyncio.Queue()
+        self.pending = asyncio.Semaphore(self.max_pending)
+        self.threads = ThreadPoolExecutor(self.workers)
+        for _ in range(self.workers):
+            self.idle.put_nowait(self.start_worker())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for worker in self.pool:
+            worker.kill()
+        self.pool = []
+        self.threads.shutdown(wait=False)
+
+    async def run(self, request):
+        """response record for one decoded request"""
+        if not isinstance(request, dict) or ('source' in request) == ('path' in request):
+            return {'status': 'bad_request', 'error': "Expected an object with either 'source' or 'path'"}
+        if request.get('backend', self.backend) not in BACKENDS:
+            return {'status': 'bad_request', 'error': f"Unknown backend: {request['backend']}"}
+
+        worker = await self.idle.get()
+        loop = asyncio.get_running_loop()
+        try:
+            record = await asyncio.wait_for(loop.run_in_executor(self.threads, worker.call, request),
+                                            self.timeout)
+        except asyncio.TimeoutError:
+            # the worker is still busy with it; killing it also ends the blocked thread
+            worker = self.replace(worker)
+            self.timeouts += 1
+            record = {'status': 'timeout', 'error': f"No result within {self.timeout} s"}
+        except (EOFError, OSError) as e:
+            # the worker died, e.g. killed for running out of memory
+            worker = self.replace(worker)
+            record = {'status': 'worker_error', 'error': f"Worker process failed: {e!r}"}
+        finally:
+            self.idle.put_nowait(worker)
+        self.served += 1
+        return record
+
+    async def respond(self, line, writer):
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                record = {'status': 'bad_request', 'error': f"Invalid JSON: {e}"}
+            else:
+                record = await self.run(request)
+                if isinstance(request, dict) and 'id' in request:
+                    record = {'id': request['id'], **record}
+            writer.write(json.dumps(record).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass  # the client went away
+        finally:
+            self.pending.release()
+
+    async def handle_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                # backpressure: no new request is read while max_pending are in flight
+                await self.pending.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    line = b''  # longer than MAX_LINE, or reset
+                if not line.strip():
+                    self.pending.release()
+                    if not line:
+                        break
+                    continue
+                task = asyncio.create_task(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, unix=None, ready=None):
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, unix, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+async def serve(args):
+    if args.deadline is None:
+        # stop a program before the timeout kills its worker
+        args.deadline = args.timeout
+    async with Server(args.workers, args.max_pending, args.timeout, args.cache_dir, args.backend,
+                      budget_from_args(args)) as server:
+        def ready(listener):
+            where = args.unix or ":".join(str(part) for part in listener.sockets[0].getsockname()[:2])
+            print(f"serving on {where} with {server.workers} workers", file=sys.stderr, flush=True)
+        await server.serve(args.host, args.port, args.unix, ready)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Compile and evaluate programs sent as JSON lines")
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    arg_parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    arg_parser.add_argument('--max-pending', type=int, default=64,
+                            help="requests queued or running before the server stops reading")
+    arg_parser.add_argument('--timeout', type=float, default=10.0, help="seconds a request may run")
+    arg_parser.add_argument('--backend', choices=BACKENDS, default='tree', help="default execution backend")
+    arg_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    add_budget_arguments(arg_parser, defaults={'max_int_bits': DEFAULT_MAX_INT_BITS})
+    args = arg_parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.parser import NodeVisitor, Interpreter
+from ccompiler.parser.budget import BudgetExceeded
+
+try:
+    import numpy
+except ImportError:  # optional: only batch evaluation needs it
+    numpy = None
+
+# int64 results are exact while the operands stay below this; rows beyond it are
+# left to the scalar Interpreter, which has Python's unbounded ints
+INT_LIMIT = 2 ** 62
+# ints below this convert to float exactly, so int / int gives Python's rounding
+EXACT_FLOAT = 2 ** 53
+# float powers closer than this to the largest double may overflow in Python
+POWER_LIMIT = 1e308
+
+# numpy.power is not always rounded like the C pow() behind Python's **,
+# so float powers are done by Python, one element at a time
+python_power = numpy.frompyfunc(pow, 2, 1) if numpy is not None else None
+
+
+def magnitude(column):
+    # as float64, so abs() of the most negative int64 cannot wrap around
+    return numpy.abs(numpy.asarray(column, dtype=numpy.float64))
+
+def is_int(column):
+    return column.dtype.kind == 'i'
+
+
+class BatchResult:
+    def __init__(self, values, errors, fallback):
+        self.values = values      # result of every row; object dtype when some result does not fit
+        self.errors = errors      # error message of every row, None where it succeeded
+        self.fallback = fallback  # rows evaluated by the scalar Interpreter
+
+    @property
+    def ok(self):
+        return numpy.equal(self.errors, None)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __str__(self):
+        failed = len(self) - int(numpy.count_nonzero(self.ok))
+        return (f"{len(self)} rows, {failed} errors, "
+                f"{int(numpy.count_nonzero(self.fallback))} evaluated by the scalar interpreter")
+
+
+class VectorEvaluator(NodeVisitor):
+    """
+    Evaluate a Program once for many rows of inputs: every variable is a
+    column (a numpy array, or a scalar for constants) and every node one
+    whole-column operation, in the Interpreter's evaluation order.
+
+    A row stops at its first error, with the Interpreter's message. Rows where
+    int64/float64 arithmetic could differ from Python's (overflow, huge ints,
+    complex or raising powers) are deferred: they stop here and are re-run by
+    the scalar Interpreter afterwards.
+
+    With a started Budget every operation is a step of every row, as each row
+    evaluates the same operators; the clock and memory are checked for the
+    whole batch. Rows with an int that may be over max_int_bits are deferred,
+    for the Interpreter to refuse it exactly.
+    """
+
+    def __init__(self, columns, size, budget=None):
+        self.variables = dict(columns)
+        self.alive = numpy.ones(size, dtype=bool)
+        self.errors = numpy.full(size, None, dtype=object)
+        self.fallback = numpy.zeros(size, dtype=bool)
+        self.budget = budget
+        self.bits_limit = None
+        if budget is not None and budget.max_int_bits is not None:
+            self.bits_limit = 2.0 ** budget.max_int_bits
+
+    def fail(self, mask, message):
+        rows = self.alive & mask
+        self.errors[rows] = message
+        self.alive &= ~rows
+
+    def defer(self, mask):
+        rows = self.alive & mask
+        self.fallback |= rows
+        self.alive &= ~rows
+
+    def step(self, node):
+        """count one operator against the budget, like Budget.binary does for each row"""
+        budget = self.budget
+        if budget is None:
+            return
+        budget.steps += 1
+        if budget.steps >= budget.next_check:
+            try:
+                budget.tick(node.start, node.end)
+            except BudgetExceeded as e:
+                self.fail(True, str(e))
+
+    def within_bits(self, value):
+        if self.bits_limit is not None and is_int(value):
+            self.defer(magnitude(value) >= self.bits_limit)
+        return value
+
+    def visit_Program(self, node):
+        return self.visit(node.function)
+
+    def visit_Function(self, node):
+        return self.visit(node.body)
+
+    def visit_Block(self, node):
+        result = None
+        for statement in node.statements:
+            result = self.visit(statement)
+        return result
+
+    def visit_Assign(self, node):
+        value = self.variables[node.left.name] = self.visit(node.right)
+        return value
+
+    def visit_Return(self, node):
+        return self.visit(node.expr)
+
+    def visit_Var(self, node):
+        if node.name in self.variables:
+            return self.variables[node.name]
+        # not an input and not assigned yet: every row still running fails here
+        self.fail(True, f"Undefined variable: {node.name}")
+        return numpy.int64(0)
+
+    def visit_Num(self, node):
+        value = node.value
+        if type(value) is float:
+            return numpy.float64(value)
+        if abs(value) >= INT_LIMIT:
+            self.defer(True)
+            return numpy.int64(0)
+        return numpy.int64(value)
+
+    def visit_UnaryOp(self, node):
+        value = self.visit(node.expr)
+        self.step(node)
+        if is_int(value):
+            self.defer(magnitude(value) >= INT_LIMIT)
+        return self.within_bits((-1 if node.op.type == T.MINUS else +1) * value)
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        self.step(node)
+        return self.within_bits(self.binary(node.op.type, left, right))
+
+    def binary(self, op_type, left, right):
+        ints = is_int(left) and is_int(right)
+
+        if op_type in (T.PLUS, T.MINUS, T.MOD) and ints:
+            self.defer((magnitude(left) >= INT_LIMIT) | (magnitude(right) >= INT_LIMIT))
+        elif op_type == T.MUL and ints:
+            self.defer(magnitude(left) * magnitude(right) >= INT_LIMIT)
+
+        if op_type == T.PLUS:
+            return left + right
+        elif op_type == T.MINUS:
+            return left - right
+        elif op_type == T.MUL:
+            return left * right
+        elif op_type == T.DIV:
+            self.fail(right == 0, "Runtime Error: Division by zero")
+            if ints:
+                self.defer((magnitude(left) >= EXACT_FLOAT) | (magnitude(right) >= EXACT_FLOAT))
+            return numpy.true_divide(left, numpy.where(right == 0, 1, right))
+        elif op_type == T.MOD:
+            self.fail(right == 0, "Runtime Error: Modulo by zero")
+            return numpy.remainder(left, numpy.where(right == 0, 1, right))
+        elif op_type == T.POWER:
+            return self.power(left, right, ints)
+        else:
+            raise Exception(f"Unknown operator: {op_type}")
+
+    def power(self, left, right, ints):
+        if ints:
+            # a negative exponent gives a float in Python (or raises for 0),
+            # and a large result does not fit in int64
+            self.defer((right < 0) | (numpy.power(magnitude(left), numpy.asarray(right, dtype=numpy.float64))
+                                      >= INT_LIMIT))
+            return numpy.power(left, numpy.where(right < 0, 0, right))
+        # one element per row, so rows still running can be picked out below
+        base, exponent, _ = numpy.broadcast_arrays(numpy.asarray(left, dtype=numpy.float64),
+                                                   numpy.asarray(right, dtype=numpy.float64), self.alive)
+        estimate = numpy.power(base, exponent)
+        # where Python gives a complex number, raises ZeroDivisionError or OverflowError
+        self.defer(((base < 0) & (numpy.floor(exponent) != exponent))
+                   | ((base == 0) & (exponent < 0))
+                   | ((~numpy.isfinite(estimate) | (numpy.abs(estimate) >= POWER_LIMIT))
+                      & numpy.isfinite(base) & numpy.isfinite(exponent)))
+        rows = self.alive
+        result = estimate.copy()
+        result[rows] = python_power(base[rows], exponent[rows]).astype(numpy.float64)
+        return result
+
+def as_column(name, values):
+    column = numpy.asarray(values)
+    if column.ndim != 1:
+        raise ValueError(f"Input '{name}' must be one-dimensional")
+    if column.dtype.kind in 'biu':
+        if column.dtype.kind == 'u' and column.size and column.max() > numpy.iinfo(numpy.int64).max:
+            raise ValueError(f"Input '{name}' does not fit in int64")
+        return column.astype(numpy.int64)
+    if column.dtype.kind == 'f':
+        return column.astype(numpy.float64)
+    raise ValueError(f"Input '{name}' must hold integers or floats, not {column.dtype}")
+
+
+def fits(value, column):
+    if column.dtype.kind == 'i':
+        return type(value) is int and -2 ** 63 <= value < 2 ** 63
+    if column.dtype.kind == 'f':
+        return type(value) is float
+    return True
+
+
+def evaluate_batch(tree, inputs, budget=None):
+    """
+    Evaluate a parsed Program once per row of inputs (name -> sequence of
+    numbers, all of the same length; each name is a variable that is set
+    before the program runs) and return a BatchResult. Every row gets the
+    result or error message Interpreter would give for it, within budget
+    when one is given: its step and int limits hold for each row, its
+    deadline for the vector pass and again for each row re-run by the
+    Interpreter.
+    """
+    if numpy is None:
+        raise ImportError("evaluate_batch needs numpy")
+    columns = {name: as_column(name, values) for name, values in inputs.items()}
+    sizes = {len(column) for column in columns.values()}
+    if len(sizes) > 1:
+        raise ValueError("Input columns have different lengths")
+    size = sizes.pop() if sizes else 1
+
+    if budget is not None:
+        budget.start()
+    evaluator = VectorEvaluator(columns, size, budget)
+    with numpy.errstate(all='ignore'):
+        # failed and deferred rows are computed too, their values are ignored
+        result = evaluator.visit(tree)
+    values = numpy.array(numpy.broadcast_to(result, (size,)))
+    errors = evaluator.errors
+
+    for row in numpy.flatnonzero(evaluator.fallback):
+        if budget is not None:
+            budget.start()
+        interpreter = Interpreter(None, budget=budget)
+        interpreter.variables.update((name, column[row].item()) for name, column in columns.items())
+        try:
+            value = interpreter.visit(tree)
+        except Exception as e:
+            errors[row] = str(e)
+            continue
+        if not fits(value, values):
+            values = values.astype(object)
+        values[row] = value
+    return BatchResult(values, errors, evaluator.fallback)
+
+
+def evaluate_rows(tree, inputs, budget=None):
+    """the same rows one at a time with the Interpreter: (values, errors) lists, for reference"""
+    names = list(inputs)
+    values = []
+    errors = []
+    for row in zip(*(inputs[name] for name in names)):
+        if budget is not None:
+            budget.start()
+        interpreter = Interpreter(None, budget=budget)
+        interpreter.variables.update(zip(names, row))
+        try:
+            values.append(interpreter.visit(tree))
+            errors.append(None)
+        except Exception as e:
+            values.append(None)
+            errors.append(str(e))
+    return values, errors
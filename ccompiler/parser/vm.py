@@ -0,0 +1,269 @@
+from array import array
+from ccompiler.tokens import TokenType as T
+from ccompiler.parser.parser import NodeVisitor, runtime_error
+
+# opcodes; CONST, LOAD and STORE are followed by one operand
+(CONST, LOAD, STORE, STORE_KEEP, POP,
+ ADD, SUB, MUL, DIV, MOD, POW, POS, NEG) = range(13)
+
+OPCODE_NAMES = ['CONST', 'LOAD', 'STORE', 'STORE_KEEP', 'POP',
+                'ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'POW', 'POS', 'NEG']
+HAS_OPERAND = {CONST, LOAD, STORE, STORE_KEEP}
+
+BINARY_OPCODES = {
+    T.PLUS: ADD,
+    T.MINUS: SUB,
+    T.MUL: MUL,
+    T.DIV: DIV,
+    T.MOD: MOD,
+    T.POWER: POW,
+}
+UNARY_OPCODES = {
+    T.PLUS: POS,
+    T.MINUS: NEG,
+}
+# operator of every operator opcode, for running them through a Budget
+OPCODE_TYPES = {opcode: op_type for opcodes in (BINARY_OPCODES, UNARY_OPCODES)
+                for op_type, opcode in opcodes.items()}
+
+# marks a variable slot that has not been assigned yet
+UNSET = object()
+
+
+class Bytecode:
+    """
+    A compiled program: flat instruction array, constant pool and the
+    variable name of every slot. Compile once, run as often as needed.
+    spans maps the position of each instruction that can fail (LOAD and the
+    operators, which a Budget can stop) to the source span of its node; it is
+    only read when one does.
+    """
+
+    def __init__(self, code, consts, names, spans=None):
+        self.code = code
+        self.consts = consts
+        self.names = names
+        self.spans = spans if spans is not None else {}
+        # the VM indexes a list, which is faster than boxing array items on every read
+        self.instructions = list(code)
+
+    def dump(self):
+        lines = []
+        pc = 0
+        while pc < len(self.code):
+            op = self.code[pc]
+            if op in HAS_OPERAND:
+                arg = self.code[pc + 1]
+                shown = repr(self.consts[arg]) if op == CONST else self.names[arg]
+                lines.append(f"{pc:5} {OPCODE_NAMES[op]:<10} {arg} ({shown})")
+                pc += 2
+            else:
+                lines.append(f"{pc:5} {OPCODE_NAMES[op]}")
+                pc += 1
+        return "\n".join(lines)
+
+
+class BytecodeCompiler(NodeVisitor):
+    """compile a Program AST into Bytecode, resolving variables to integer slots"""
+
+    def __init__(self):
+        self.code = array('i')
+        self.consts = []
+        self.const_index = {}
+        self.names = []
+        self.slots = {}
+        self.store_at = -1  # position of the last STORE_KEEP
+        self.spans = {}
+
+    def compile(self, tree):
+        self.visit(tree)
+        return Bytecode(self.code, self.consts, self.names, self.spans)
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        return self.slots[name]
+
+    def visit_Program(self, node):
+        self.visit(node.function)
+
+    def visit_Function(self, node):
+        self.visit(node.body)
+
+    def visit_Block(self, node):
+        # like Interpreter.visit_Block the result is the value of the last
+        # statement, so every other statement drops its value
+        last = len(node.statements) - 1
+        for i, statement in enumerate(node.statements):
+            self.visit(statement)
+            if i != last:
+                if self.store_at == len(self.code) - 2:
+                    self.code[self.store_at] = STORE  # STORE_KEEP + POP
+                else:
+                    self.code.append(POP)
+
+    def visit_Assign(self, node):
+        self.visit(node.right)
+        self.store_at = len(self.code)
+        self.code.extend((STORE_KEEP, self.slot(node.left.name)))
+
+    def visit_Return(self, node):
+        self.visit(node.expr)
+
+    def visit_Var(self, node):
+        self.spans[len(self.code)] = (node.start, node.end)
+        self.code.extend((LOAD, self.slot(node.name)))
+
+    def visit_Num(self, node):
+        value = node.value
+        key = (type(value), value)
+        if key not in self.const_index:
+            self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        self.code.extend((CONST, self.const_index[key]))
+
+    def visit_BinOp(self, node):
+        op_type = node.op.type
+        if op_type not in BINARY_OPCODES:
+            raise Exception(f"Unknown operator: {op_type}")
+        self.visit(node.left)
+        self.visit(node.right)
+        self.spans[len(self.code)] = (node.start, node.end)
+        self.code.append(BINARY_OPCODES[op_type])
+
+    def visit_UnaryOp(self, node):
+        self.visit(node.expr)
+        self.spans[len(self.code)] = (node.start, node.end)
+        self.code.append(UNARY_OPCODES[node.op.type])
+
+
+class VM:
+    """stack machine running Bytecode; runtime errors match the Interpreter's"""
+
+    def __init__(self, budget=None):
+        # budget: a started Budget (parser/budget.py) every operator is checked against
+        self.budget = budget
+
+    def run(self, bytecode):
+        if self.budget is not None:
+            return self.run_budgeted(bytecode)
+        code = bytecode.instructions
+        consts = bytecode.consts
+        frame = [UNSET] * len(bytecode.names)
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        end = len(code)
+        pc = 0
+
+        while pc < end:
+            op = code[pc]
+            if op == LOAD:
+                value = frame[code[pc + 1]]
+                if value is UNSET:
+                    raise runtime_error(f"Undefined variable: {bytecode.names[code[pc + 1]]}",
+                                        *bytecode.spans.get(pc, (None, None)))
+                push(value)
+                pc += 2
+            elif op == CONST:
+                push(consts[code[pc + 1]])
+                pc += 2
+            elif op == ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+                pc += 1
+            elif op == MUL:
+                right = pop()
+                stack[-1] = stack[-1] * right
+                pc += 1
+            elif op == SUB:
+                right = pop()
+                stack[-1] = stack[-1] - right
+                pc += 1
+            elif op == STORE:
+                frame[code[pc + 1]] = pop()
+                pc += 2
+            elif op == STORE_KEEP:
+                frame[code[pc + 1]] = stack[-1]
+                pc += 2
+            elif op == DIV:
+                right = pop()
+                if right == 0:
+                    raise runtime_error("Runtime Error: Division by zero", *bytecode.spans.get(pc, (None, None)))
+                stack[-1] = stack[-1] / right
+                pc += 1
+            elif op == MOD:
+                right = pop()
+                if right == 0:
+                    raise runtime_error("Runtime Error: Modulo by zero", *bytecode.spans.get(pc, (None, None)))
+                stack[-1] = stack[-1] % right
+                pc += 1
+            elif op == POW:
+                right = pop()
+                stack[-1] = stack[-1] ** right
+                pc += 1
+            elif op == NEG:
+                stack[-1] = -1 * stack[-1]
+                pc += 1
+            elif op == POS:
+                stack[-1] = +1 * stack[-1]
+                pc += 1
+            elif op == POP:
+                pop()
+                pc += 1
+            else:
+                raise Exception(f"Unknown opcode: {op}")
+
+        return stack[-1] if stack else None
+
+    def run_budgeted(self, bytecode):
+        """run() with every operator going through the budget, kept apart so run() pays nothing for it"""
+        budget = self.budget
+        code = bytecode.instructions
+        consts = bytecode.consts
+        spans = bytecode.spans
+        frame = [UNSET] * len(bytecode.names)
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        end = len(code)
+        pc = 0
+
+        while pc < end:
+            op = code[pc]
+            if op == LOAD:
+                value = frame[code[pc + 1]]
+                if value is UNSET:
+                    raise runtime_error(f"Undefined variable: {bytecode.names[code[pc + 1]]}",
+                                        *spans.get(pc, (None, None)))
+                push(value)
+                pc += 2
+            elif op == CONST:
+                push(consts[code[pc + 1]])
+                pc += 2
+            elif op == STORE:
+                frame[code[pc + 1]] = pop()
+                pc += 2
+            elif op == STORE_KEEP:
+                frame[code[pc + 1]] = stack[-1]
+                pc += 2
+            elif op == POP:
+                pop()
+                pc += 1
+            elif op == NEG or op == POS:
+                stack[-1] = budget.unary(OPCODE_TYPES[op], stack[-1], *spans.get(pc, (None, None)))
+                pc += 1
+            elif op in OPCODE_TYPES:
+                right = pop()
+                stack[-1] = budget.binary(OPCODE_TYPES[op], stack[-1], right, *spans.get(pc, (None, None)))
+                pc += 1
+            else:
+                raise Exception(f"Unknown opcode: {op}")
+
+        return stack[-1] if stack else None
+
+
+def compile_program(tree):
+    return BytecodeCompiler().compile(tree)
+
@@ -0,0 +1,136 @@
+import os
+import io
+import mmap
+import time
+import codecs
+import locale
+from ccompiler.scanner.lex_scanner import RegexScanner, StreamingLexer
+from ccompiler.scanner.line_index import LineIndex
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # bytes
+
+
+def iter_chunk_tokens(chunks):
+    """
+    scan an iterable of text chunks as if they were one string.
+    Lexemes, // comments and /* */ comments may straddle chunk boundaries:
+    a match that ends within the last two characters of a chunk is held back
+    until more text arrives, and a comment still open at the end of a chunk is
+    skipped with a plain find() instead of being re-scanned.
+    """
+    kinds = {}
+    pending = ''
+    comment = None  # '//' or '/*' while inside a comment that started in an earlier chunk
+    length = 0      # characters seen so far, for token offsets in the whole text
+
+    for chunk in chunks:
+        buffer = pending + chunk if pending else chunk
+        length += len(chunk)
+        base = length - len(buffer)
+        pos = 0
+        if comment == '//':
+            pos = buffer.find('\n')
+            if pos < 0:
+                pending = ''
+                continue
+            comment = None
+        elif comment == '/*':
+            pos = buffer.find('*/')
+            if pos < 0:
+                # the last character may be the '*' of the closing */
+                pending = buffer[-1:]
+                continue
+            pos += 2
+            comment = None
+
+        # the word-before-comment check looks two characters past a match, so
+        # anything ending in the last two characters may still change
+        pos = yield from RegexScanner.iter_tokens(buffer, pos, len(buffer) - 2, kinds, base)
+        match = RegexScanner.PATTERN.match(buffer, pos)
+        if match.lastindex == RegexScanner.COMMENT:
+            body = match.group(RegexScanner.COMMENT)
+            if body.startswith('//'):
+                if match.end() == len(buffer):
+                    comment = '//'
+                    pending = ''
+                    continue
+            elif len(body) < 4 or not body.endswith('*/'):
+                comment = '/*'
+                # keep a trailing '*' of the comment body, never the opening '/*'
+                pending = body[-1:] if len(body) > 2 else ''
+                continue
+            pos = match.end()
+        pending = buffer[pos:]
+
+    # a comment left open at the end of the input swallows the rest, like scan_tokens
+    if comment is None:
+        yield from RegexScanner.iter_tokens(pending, kinds=kinds, base=length - len(pending))
+
+
+class SourceFile:
+    """
+    A source file read either through mmap or through fixed-size chunked reads.
+    The bytes are decoded incrementally with the same newline translation as
+    open(path, 'r'), so the whole decoded text never has to be in memory.
+    bytes_read / elapsed give the throughput of the last pass over the file.
+    """
+
+    def __init__(self, path, mode='mmap', chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+        if mode not in ('mmap', 'chunked'):
+            raise ValueError(f"Unknown input mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.bytes_read = 0
+        self.elapsed = 0.0
+
+    def raw_chunks(self):
+        with open(self.path, 'rb') as f:
+            if self.mode == 'chunked':
+                while True:
+                    data = f.read(self.chunk_size)
+                    if not data:
+                        return
+                    yield data
+            else:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:  # empty files cannot be mapped
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for offset in range(0, size, self.chunk_size):
+                        yield mapped[offset: offset + self.chunk_size]
+
+    def chunks(self, line_index=None):
+        """
+        decoded text chunks; a multi-byte character or \\r\\n split between reads is carried over.
+        line_index: a LineIndex to add the chunks to as they are decoded
+        """
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(self.encoding)(), translate=True)
+        self.bytes_read = 0
+        start = time.perf_counter()
+        for data in self.raw_chunks():
+            self.bytes_read += len(data)
+            text = decoder.decode(data)
+            if text:
+                if line_index is not None:
+                    line_index.add(text)
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            if line_index is not None:
+                line_index.add(text)
+            yield text
+        self.elapsed = time.perf_counter() - start
+
+    def scanner_tokens(self, line_index=None):
+        return iter_chunk_tokens(self.chunks(line_index))
+
+    def lexer(self):
+        # the line index is built alongside the scan, as the parser pulls tokens
+        line_index = LineIndex()
+        return StreamingLexer(scanner_tokens=self.scanner_tokens(line_index), line_index=line_index)
+
+    @property
+    def bytes_per_second(self):
+        return self.bytes_read / self.elapsed if self.elapsed else 0.0
@@ -0,0 +1,429 @@
+from collections import deque
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.line_index import LineIndex
+
+C_KEYWORDS = [
+    "auto", "break", "case", "char", "const", "continue", "default", "do",
+    "double", "else", "enum", "extern", "float", "for", "goto", "if",
+    "inline", "int", "long", "register", "restrict", "return", "short",
+    "signed", "sizeof", "static", "struct", "switch", "typedef", "union",
+    "unsigned", "void", "volatile", "while",
+    "_Bool", "_Complex", "_Imaginary"
+]
+
+class Token:
+    # one is created per token of the source, so no per-instance __dict__
+    __slots__ = ('lexeme', 'type', 'value', 'start', 'end')
+
+    def __init__(self, lexeme: str, token_type, start=None, end=None):
+        self.lexeme = lexeme 
+        self.type = token_type
+        # character offsets of the lexeme in the source, None when it has none;
+        # see LineIndex for turning them into line:column
+        self.start = start
+        self.end = end
+        # handle numbers, parsed once here rather than again when evaluated
+        # ('is' for the parser's type: one identity check instead of an int compare)
+        if token_type == 'integer' or token_type is T.INTEGER:
+            self.value = int(lexeme)
+        elif token_type == 'real number':
+            self.value = float(lexeme)
+        else:
+            self.value = lexeme
+
+    def __str__(self):
+        return f"({self.lexeme} => {self.token_type})"
+
+class Scanner:
+    def __init__(self, text):
+        self.text = text
+
+    @staticmethod
+    def is_delimiter(ch):
+        delimiters = ' +-*/ ,;><=()[]{}\n\t%'
+        return ch in delimiters
+
+    @staticmethod
+    def is_keyword(s):
+        return s in C_KEYWORDS
+
+    @staticmethod
+    def is_operator(ch):
+        operators = '+-*/><=%'
+        return ch in operators
+
+    @staticmethod
+    def valid_identifier(text):
+        if not text or text[0].isdigit() or Scanner.is_delimiter(text[0]):
+            return False
+        return True
+
+    @staticmethod
+    def is_integer(text):
+        if not text:
+            return False
+        for i in range(len(text)):
+            if not text[i].isdigit() and not (text[i] == '-' and i == 0):
+                return False
+        return True
+
+    @staticmethod
+    def is_real_number(text):
+        if not text:
+            return False
+        try:
+            float(text)
+            return '.' in text  # this ensures it has a '.' in it
+        except ValueError:
+            return False
+
+    @staticmethod
+    def sub_string(text, left, right):
+        return text[left: right + 1]
+
+    # returns a list of objects (lexeme , tokenType)
+    @staticmethod
+    def scan_tokens(stringCode):
+        left = 0
+        right = 0
+        len_str = len(stringCode)
+        tokens = []
+        double_ops = ['==', '<=', '>=', '!=', '&&', '||', '**', '--', '++']
+
+        # the main loop
+        while right < len_str:
+            # Handle comments before anything else
+            if stringCode[right] == '/' and right + 1 < len_str:
+                # Single-line comment //
+                if stringCode[right + 1] == '/':
+                    right += 2
+                    while right < len_str and stringCode[right] != '\n':
+                        right += 1
+                    # move left pointer to after the comment
+                    left = right
+                    continue
+
+                # Multi-line comment /* ... */
+                elif stringCode[right + 1] == '*':
+                    right += 2
+                    while right + 1 < len_str and not (stringCode[right] == '*' and stringCode[right + 1] == '/'):
+                        right += 1
+                    right += 2  # skip the closing */
+                    left = right
+                    continue
+
+            if not Scanner.is_delimiter(stringCode[right]):
+                right += 1
+                continue
+
+            # We hit a delimiter or end of token
+            if left != right:
+                raw = Scanner.sub_string(stringCode, left, right - 1)
+                sub_str = raw.strip()
+                start = left + len(raw) - len(raw.lstrip())
+                end = start + len(sub_str)
+
+                if Scanner.is_keyword(sub_str):
+                    important_keywords = {'int' : 'int keyword',
+                                          'return' : 'return keyword'}
+                    token_type = important_keywords.get(sub_str, 'keyword')
+                    tokens.append(Token(sub_str, token_type, start, end))
+                elif Scanner.is_integer(sub_str):
+                    tokens.append(Token(sub_str, 'integer', start, end))
+                elif Scanner.is_real_number(sub_str):
+                    tokens.append(Token(sub_str, 'real number', start, end))
+                elif Scanner.valid_identifier(sub_str):
+                    tokens.append(Token(sub_str, 'identifier', start, end))
+
+            ch = stringCode[right]
+            next_ch = stringCode[right + 1] if right + 1 < len_str else ''
+
+            if ch + next_ch in double_ops:
+                tokens.append(Token(ch + next_ch, 'operator', right, right + 2))
+                right += 2
+                left = right
+                continue
+            elif Scanner.is_operator(ch):
+                tokens.append(Token(ch, 'operator', right, right + 1))
+                right += 1
+                left = right
+                continue
+            else:
+                delimiter_types = {
+                    '{': 'open brace',
+                    '}': 'close brace',
+                    '(': 'open parenthesis',
+                    ')': 'close parenthesis',
+                    '[': 'open bracket',
+                    ']': 'close bracket',
+                    ',': '`comm`a',
+                    ';': 'semicolon',
+                    '\n': 'newline',
+                    '\t': 'tab',
+                }
+                token_type = delimiter_types.get(ch, 'delimiter')
+                if ch.strip():  # ignore whitespace
+                    tokens.append(Token(ch, token_type, right, right + 1))
+                right += 1
+                left = right
+
+
+         # Handle any remaining content after the loop ends
+        if left < len_str:
+            raw = Scanner.sub_string(stringCode, left, len_str - 1)
+            remaining_sub_str = raw.strip()
+            start = left + len(raw) - len(raw.lstrip())
+            end = start + len(remaining_sub_str)
+            if remaining_sub_str:
+                if Scanner.is_keyword(remaining_sub_str):
+                    important_keywords = {'int' : 'int keyword',
+                                        'return' : 'return keyword'}
+                    token_type = important_keywords.get(remaining_sub_str, 'keyword')
+                    tokens.append(Token(remaining_sub_str, token_type, start, end))
+                elif Scanner.is_integer(remaining_sub_str):
+                    tokens.append(Token(remaining_sub_str, 'integer', start, end))
+                elif Scanner.is_real_number(remaining_sub_str):
+                    tokens.append(Token(remaining_sub_str, 'real number', start, end))
+                elif Scanner.valid_identifier(remaining_sub_str):
+                    tokens.append(Token(remaining_sub_str, 'identifier', start, end))
+
+        return tokens
+
+
+class LazyPattern:
+    """
+    class attribute compiled by re on first use, so that importing the module
+    (and scanning with the legacy Scanner) does not import re
+    """
+    def __init__(self, source):
+        self.source = source
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        import re
+        pattern = re.compile(self.source)
+        setattr(owner, self.name, pattern)  # later lookups find the compiled pattern
+        return pattern
+
+
+class RegexScanner:
+    """
+    Single-pass scanner: one compiled master pattern matches every lexeme class
+    (comments, whitespace, words, double/single operators, punctuation).
+    It produces exactly the same token stream as Scanner.scan_tokens, including
+    its quirks (a word directly followed by a comment is dropped, '!', '&', '|'
+    and '~' are word characters, an unterminated /* swallows the rest of the input)
+    """
+
+    KEYWORDS = frozenset(C_KEYWORDS)
+    IMPORTANT_KEYWORDS = {'int': 'int keyword', 'return': 'return keyword'}
+    PUNCTUATION = {
+        '{': 'open brace',
+        '}': 'close brace',
+        '(': 'open parenthesis',
+        ')': 'close parenthesis',
+        '[': 'open bracket',
+        ']': 'close bracket',
+        ',': '`comm`a',
+        ';': 'semicolon',
+    }
+
+    # group numbers used for dispatch on match.lastindex
+    COMMENT, WORD, OPERATOR, PUNCT = 1, 2, 3, 4
+
+    # leading whitespace is folded into every match so blanks never cost a match
+    # of their own. The alternatives are tried in the same priority order as
+    # scan_tokens: comments, then words (anything that is not a delimiter), then
+    # double operators before single ones, then the remaining delimiters
+    PATTERN = LazyPattern(r"""(?xs)
+        [ \n\t]*
+        (?:
+            (//[^\n]*|/\*.*?(?:\*/|\Z))
+          | ([^ +\-*/,;><=()\[\]{}\n\t%]+)
+          | (==|<=|>=|\*\*|--|\+\+|[-+*/><=%])
+          | ([{}()\[\],;])
+        )?
+    """)
+
+    @staticmethod
+    def classify(lexeme):
+        """scanner type of a (stripped) word, or None when scan_tokens drops it"""
+        if lexeme in RegexScanner.KEYWORDS:
+            return RegexScanner.IMPORTANT_KEYWORDS.get(lexeme, 'keyword')
+        if lexeme.isdigit():
+            return 'integer'
+        if Scanner.is_real_number(lexeme):
+            return 'real number'
+        if Scanner.valid_identifier(lexeme):
+            return 'identifier'
+        return None
+
+    @staticmethod
+    def iter_tokens(stringCode, pos=0, stop=None, kinds=None, base=0):
+        """
+        yield the tokens of stringCode one at a time, starting at pos.
+        With stop, scanning ends before the first match that runs past it (a
+        chunked reader uses this to hold back lexemes that more input could
+        still extend) and the generator returns where that match starts.
+        base is the offset of stringCode in the whole source, added to token offsets
+        """
+        WORD, OPERATOR, PUNCT = RegexScanner.WORD, RegexScanner.OPERATOR, RegexScanner.PUNCT
+        punctuation = RegexScanner.PUNCTUATION
+        classify = RegexScanner.classify
+        if stop is None:
+            stop = len(stringCode)
+        if kinds is None:
+            kinds = {}  # word -> scanner type, so each distinct word is classified once
+
+        for match in RegexScanner.PATTERN.finditer(stringCode, pos):
+            end = match.end()
+            if end > stop:
+                return match.start()
+            group = match.lastindex
+            if group == WORD:
+                # scan_tokens loses a word that runs straight into a comment
+                if stringCode.startswith('//', end) or stringCode.startswith('/*', end):
+                    continue
+                word = match.group(WORD)
+                lexeme = word.strip()
+                if lexeme not in kinds:
+                    kinds[lexeme] = classify(lexeme)
+                kind = kinds[lexeme]
+                if kind is not None:
+                    if len(lexeme) == len(word):
+                        # the word ends the match
+                        yield Token(lexeme, kind, base + end - len(lexeme), base + end)
+                    else:
+                        start = base + match.start(WORD) + len(word) - len(word.lstrip())
+                        yield Token(lexeme, kind, start, start + len(lexeme))
+            elif group == OPERATOR:
+                lexeme = match.group(OPERATOR)
+                yield Token(lexeme, 'operator', base + end - len(lexeme), base + end)
+            elif group == PUNCT:
+                lexeme = match.group(PUNCT)
+                yield Token(lexeme, punctuation[lexeme], base + end - 1, base + end)
+        return len(stringCode)
+
+    @staticmethod
+    def scan_tokens(stringCode):
+        return list(RegexScanner.iter_tokens(stringCode))
+
+
+# scanner engines the Lexer can be built on
+SCANNERS = {
+    'legacy': Scanner.scan_tokens,
+    'regex': RegexScanner.scan_tokens,
+}
+
+# lexemes with a fixed parser token type; anything else is an integer,
+# an identifier or dropped (see lexer_type)
+LEXEME_TYPES = {
+    '+': T.PLUS,
+    '-': T.MINUS,
+    '*': T.MUL,
+    '/': T.DIV,
+    '%': T.MOD,
+    '(': T.LPAREN,
+    ')': T.RPAREN,
+    '**': T.POWER,
+    ';': T.SEMI,
+    'int': T.INT,
+    'return': T.RETURN,
+    '{': T.LBRACE,
+    '}': T.RBRACE,
+    '=': T.ASSIGN,
+}
+
+def lexer_type(token):
+    """map a scanner token to its parser TokenType, None if the parser ignores it"""
+    if token.type == 'integer':
+        return T.INTEGER
+    token_type = LEXEME_TYPES.get(token.lexeme)
+    if token_type is None and Scanner.valid_identifier(token.lexeme):
+        return T.IDENTIFIER
+    return token_type
+
+def lexer_tokens(scanner_tokens):
+    """re-wrap scanner tokens as parser tokens, ending with an EOF token"""
+    # the parser type only depends on the lexeme, so map each distinct lexeme once
+    types = {}
+    end = None
+    for token in scanner_tokens:
+        lexeme = token.lexeme
+        if lexeme in types:
+            token_type = types[lexeme]
+        else:
+            token_type = types[lexeme] = lexer_type(token)
+        if token_type is not None:
+            end = token.end
+            yield Token(lexeme, token_type, token.start, end)
+    # EOF sits right after the last token, where a missing ';' or '}' would go
+    yield Token('', T.EOF, end, end)
+
+class Lexer :
+
+    def __init__(self, text, scanner='legacy', scanner_tokens=None):
+            # scanner_tokens: tokens already scanned from text, used instead of scanning again
+            tokens = SCANNERS[scanner](text) if scanner_tokens is None else scanner_tokens
+           # print(f"Scanner tokens: {[(t.lexeme, t.type) for t in tokens]}")  # DEBUG
+            # Map the scanner token types to parser token types, with the EOF token at the end
+            self.tokens = list(lexer_tokens(tokens))
+            self.pos = 0
+            # line starts of text, for reporting token offsets as line:column
+            self.line_index = LineIndex(text) if text is not None else None
+
+
+    def get_next_token(self):
+        if self.pos < len(self.tokens):
+            token = self.tokens[self.pos]   
+            self.pos += 1
+            return token
+        else:
+            # Return EOF token if we've reached the end
+            return Token('', T.EOF)
+
+    def peek(self, n=1):
+        """return the next token without consuming it"""
+        # n : how many tokens ahead you want to look
+        next_pos = self.pos + n - 1
+        if next_pos < len(self.tokens):
+            return self.tokens[next_pos]
+        else :
+            return Token('', T.EOF)
+
+
+class StreamingLexer:
+    """
+    Lexer that pulls tokens from the scanner on demand instead of building
+    token lists up front. Only the tokens asked for by peek(n) are buffered,
+    so memory does not grow with the size of the input and parsing starts
+    before scanning has finished.
+    """
+
+    def __init__(self, text=None, scanner_tokens=None, line_index=None):
+        # scanner_tokens: any iterable of scanner tokens, used instead of scanning text
+        # line_index: LineIndex filled in as those tokens are scanned (see SourceFile)
+        if scanner_tokens is None:
+            scanner_tokens = RegexScanner.iter_tokens(text)
+        if line_index is None and text is not None:
+            line_index = LineIndex(text)
+        self.source = lexer_tokens(scanner_tokens)
+        self.lookahead = deque()
+        self.line_index = line_index
+
+    def get_next_token(self):
+        if self.lookahead:
+            return self.lookahead.popleft()
+        # after the EOF token the source is exhausted, keep answering EOF
+        return next(self.source, None) or Token('', T.EOF)
+
+    def peek(self, n=1):
+        """return the next token without consuming it"""
+        while len(self.lookahead) < n:
+            token = next(self.source, None)
+            if token is None:
+                return Token('', T.EOF)
+            self.lookahead.append(token)
+        return self.lookahead[n - 1]
@@ -0,0 +1,38 @@
+from array import array
+from bisect import bisect_right
+
+
+class LineIndex:
+    """
+    Offsets at which the lines of a source start, built once while it is scanned.
+    Tokens and AST nodes only carry character offsets (start, end); the line and
+    column of an offset are found by binary search when an error is reported.
+    """
+
+    def __init__(self, text=''):
+        self.starts = array('q', [0])  # 64-bit, like TokenBuffer.starts
+        self.length = 0
+        self.add(text)
+
+    def add(self, chunk):
+        """index the next chunk of the text, for sources read in pieces"""
+        import re  # here, so that importing the scanner does not import re (and enum)
+        ends = map(re.Match.end, re.finditer('\n', chunk))
+        base = self.length
+        if base:
+            self.starts.extend(base + end for end in ends)
+        else:
+            self.starts.extend(ends)
+        self.length += len(chunk)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def location(self, offset):
+        """(line, column) of an offset, both counted from 1"""
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def describe(self, offset):
+        line, column = self.location(offset)
+        return f"line {line}, column {column}"
@@ -0,0 +1,96 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from ccompiler.scanner.token_buffer import TokenBuffer, BufferLexer
+from ccompiler.scanner.line_index import LineIndex
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # characters
+BLANK = re.compile('[ \t]')
+
+
+def split_points(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    offsets at which text is cut into chunks of about chunk_size characters:
+    just after a newline, or after a blank when a line is longer than a chunk.
+    No word or operator spans a blank, so only a comment can straddle a cut
+    """
+    points = [0]
+    while points[-1] + chunk_size < len(text):
+        target = points[-1] + chunk_size
+        cut = text.find('\n', target, target + chunk_size)
+        if cut < 0:
+            match = BLANK.search(text, target)
+            if match is None:
+                break
+            cut = match.start()
+        if cut + 1 >= len(text):
+            break
+        points.append(cut + 1)
+    points.append(len(text))
+    return points
+
+
+def scan_chunk(chunk, base, comment=None):
+    """
+    (TokenBuffer, comment open at its end) for one chunk at offset base of the source.
+    comment is the one open where the chunk starts ('//', '/*' or None)
+    """
+    buffer = TokenBuffer()
+    pos = 0
+    if comment == '//':
+        pos = chunk.find('\n')
+        if pos < 0:
+            return buffer, comment
+    elif comment == '/*':
+        pos = chunk.find('*/')
+        if pos < 0:
+            return buffer, comment
+        pos += 2
+    return buffer, buffer.scan(chunk, pos, base)
+
+
+class ParallelScanner:
+    """
+    Scan one large source in worker processes: the text is cut into chunks at
+    blanks (see split_points), every chunk is scanned on its own into a
+    TokenBuffer with global offsets, and the buffers are merged in order.
+
+    Workers guess that no comment is open where their chunk starts. The merge
+    knows the real state from the chunk before; when a comment was open the
+    guess was wrong and that chunk is scanned again in this process, starting
+    after the comment ends (resynced counts these).
+    """
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self.resynced = 0
+
+    def scan(self, text):
+        points = split_points(text, self.chunk_size)
+        chunks = [text[start:end] for start, end in zip(points, points[1:])]
+        self.chunks = len(chunks)
+        self.resynced = 0
+
+        buffer = TokenBuffer()
+        buffer.line_index = LineIndex(text)
+        if self.workers == 1 or len(chunks) == 1:
+            # no processes to start: the same chunked scan in this process
+            self.merge(buffer, chunks, points, map(scan_chunk, chunks, points))
+        else:
+            with ProcessPoolExecutor(self.workers) as pool:
+                self.merge(buffer, chunks, points, pool.map(scan_chunk, chunks, points))
+        return buffer
+
+    def merge(self, buffer, chunks, points, results):
+        comment = None
+        for chunk, base, (part, open_comment) in zip(chunks, points, results):
+            if comment is not None:
+                part, open_comment = scan_chunk(chunk, base, comment)
+                self.resynced += 1
+            buffer.extend(part)
+            comment = open_comment
+
+    def lexer(self, text):
+        return BufferLexer(self.scan(text))
@@ -0,0 +1,198 @@
+from array import array
+from ccompiler.tokens import TokenType as T, TOKEN_TYPES
+from ccompiler.scanner.lex_scanner import RegexScanner, lexer_type, Token
+from ccompiler.scanner.line_index import LineIndex
+
+# parser token types are stored as their integer codes (TOKEN_TYPES maps them back)
+TYPE_CODES = {token_type: int(token_type) for token_type in TOKEN_TYPES}
+
+
+class CompactToken:
+    """
+    lightweight parser token. The instance TokenBuffer.token shares between every
+    occurrence of a lexeme has no source offsets of its own (the buffer's starts
+    array has them); the ones located_token makes for tree nodes to keep do
+    """
+    __slots__ = ('lexeme', 'type', 'value', 'start', 'end')
+
+    def __init__(self, lexeme, token_type, value, start=None, end=None):
+        self.lexeme = lexeme
+        self.type = token_type
+        self.value = value
+        self.start = start
+        self.end = end
+
+    def __str__(self):
+        return f"({self.lexeme} => {self.type})"
+
+
+EOF_TOKEN = CompactToken('', T.EOF, '')
+
+# codes of the token types a tree node may keep (Num, Var, UnaryOp), which
+# BufferLexer hands out located; every other token is the buffer's shared one
+KEPT_TYPES = frozenset(TYPE_CODES[token_type] for token_type in (T.INTEGER, T.IDENTIFIER, T.PLUS, T.MINUS))
+
+
+class TokenBuffer:
+    """
+    Parser tokens stored column-wise instead of as one object per token:
+    parallel arrays hold the type code, start offset and interned lexeme id
+    of every token (the length comes from the lexeme table, the line from
+    the source's LineIndex).
+    Token objects are only created on demand, and then once per distinct
+    lexeme rather than once per token.
+    """
+
+    def __init__(self):
+        self.types = array('B')
+        self.starts = array('q')  # 64-bit so offsets into multi-GB sources fit
+        self.lexeme_ids = array('i')
+        self.line_index = None
+        # interned lexeme table, indexed by lexeme id
+        self.lexemes = []
+        self.values = []
+        self.ids = {}
+        self.shared_tokens = []
+
+    def __len__(self):
+        return len(self.types)
+
+    def intern(self, lexeme, token_type):
+        lexeme_id = self.ids.get(lexeme)
+        if lexeme_id is None:
+            lexeme_id = self.ids[lexeme] = len(self.lexemes)
+            self.lexemes.append(lexeme)
+            # integers are parsed here once, not again for every Num node
+            self.values.append(int(lexeme) if token_type == T.INTEGER else lexeme)
+            self.shared_tokens.append(None)
+        return lexeme_id
+
+    def append(self, lexeme, token_type, start):
+        self.types.append(token_type)
+        self.starts.append(start)
+        self.lexeme_ids.append(self.intern(lexeme, token_type))
+
+    def extend(self, other):
+        """append the tokens of another buffer, scanned from a later part of the same source"""
+        # id in this buffer of every lexeme of the other one; the type only matters for integers
+        ids = [self.intern(lexeme, T.INTEGER if type(value) is int else None)
+               for lexeme, value in zip(other.lexemes, other.values)]
+        self.types.extend(other.types)
+        self.starts.extend(other.starts)
+        self.lexeme_ids.extend(map(ids.__getitem__, other.lexeme_ids))
+
+    @staticmethod
+    def from_text(text):
+        """scan text with the RegexScanner pattern straight into a buffer"""
+        buffer = TokenBuffer()
+        buffer.line_index = LineIndex(text)
+        buffer.scan(text)
+        return buffer
+
+    def scan(self, text, pos=0, base=0):
+        """
+        append the tokens of text from pos on, base being its offset in the whole
+        source. Returns '//' or '/*' when text ends inside that comment, else None
+        """
+        WORD, PUNCT, COMMENT = RegexScanner.WORD, RegexScanner.PUNCT, RegexScanner.COMMENT
+        types = {}  # lexeme -> parser type, None for lexemes the Lexer drops
+        comment = None
+
+        for match in RegexScanner.PATTERN.finditer(text, pos):
+            group = match.lastindex
+            if group is None:
+                continue
+            if group == COMMENT:
+                if match.end() == len(text):
+                    body = match.group(COMMENT)
+                    if body.startswith('//'):
+                        comment = '//'
+                    elif len(body) < 4 or not body.endswith('*/'):
+                        comment = '/*'
+                continue
+            start = match.start(group)
+            lexeme = match.group(group)
+            if group == WORD:
+                end = match.end()
+                if text.startswith('//', end) or text.startswith('/*', end):
+                    continue
+                stripped = lexeme.strip()
+                start += len(lexeme) - len(lexeme.lstrip())
+                lexeme = stripped
+            if lexeme not in types:
+                if group == WORD:
+                    kind = RegexScanner.classify(lexeme)
+                elif group == PUNCT:
+                    kind = RegexScanner.PUNCTUATION[lexeme]
+                else:
+                    kind = 'operator'
+                types[lexeme] = lexer_type(Token(lexeme, kind)) if kind is not None else None
+            token_type = types[lexeme]
+            if token_type is None:
+                continue
+            self.append(lexeme, token_type, base + start)
+        return comment
+
+    def token(self, index):
+        """shared CompactToken of the token at index (no allocation after the first use of a lexeme)"""
+        lexeme_id = self.lexeme_ids[index]
+        token = self.shared_tokens[lexeme_id]
+        if token is None:
+            token = self.shared_tokens[lexeme_id] = CompactToken(
+                self.lexemes[lexeme_id], TOKEN_TYPES[self.types[index]], self.values[lexeme_id])
+        return token
+
+    def located_token(self, index):
+        """a CompactToken of the token at index with its start / end offsets, for AST spans"""
+        lexeme_id = self.lexeme_ids[index]
+        lexeme = self.lexemes[lexeme_id]
+        start = self.starts[index]
+        return CompactToken(lexeme, TOKEN_TYPES[self.types[index]], self.values[lexeme_id], start, start + len(lexeme))
+
+    def span(self, index):
+        """(start offset, length, line) of the token at index"""
+        start = self.starts[index]
+        return start, len(self.lexemes[self.lexeme_ids[index]]), self.line_index.location(start)[0]
+
+
+class BufferLexer:
+    """
+    Lexer interface over a TokenBuffer: hands out the buffer's shared tokens by
+    index, allocating located ones only for the tokens a tree node may keep.
+    The Parser takes every other span from span(), so trees and ParserErrors get
+    the spans and line:column the Lexer gives them (line_index defaults to the buffer's)
+    """
+
+    def __init__(self, buffer, line_index=None):
+        self.buffer = buffer
+        self.pos = 0
+        self.line_index = line_index if line_index is not None else buffer.line_index
+        # EOF sits right after the last token, as with the Lexer
+        end = buffer.starts[-1] + len(buffer.lexemes[buffer.lexeme_ids[-1]]) if len(buffer) else None
+        self.eof = CompactToken('', T.EOF, '', end, end)
+
+    def get_next_token(self):
+        pos = self.pos
+        self.pos = pos + 1  # past the end too, so span() knows the EOF token is current
+        buffer = self.buffer
+        if pos < len(buffer):
+            if buffer.types[pos] in KEPT_TYPES:
+                return buffer.located_token(pos)
+            return buffer.token(pos)
+        return self.eof
+
+    def peek(self, n=1):
+        """return the next token without consuming it"""
+        next_pos = self.pos + n - 1
+        if next_pos < len(self.buffer):
+            return self.buffer.token(next_pos)
+        return self.eof
+
+    def span(self):
+        """(start, end) of the token get_next_token handed out last, from the buffer's starts"""
+        index = self.pos - 1
+        buffer = self.buffer
+        if index < len(buffer):
+            start = buffer.starts[index]
+            return start, start + len(buffer.lexemes[buffer.lexeme_ids[index]])
+        return self.eof.start, self.eof.end
@@ -0,0 +1,68 @@
+class TokenCode(int):
+    """
+    A token type: a small integer, so the scanner and parser compare and hash
+    it like any int, that keeps its name for display ("TokenType.SEMI").
+    There is exactly one instance per type, so `is` works as with an Enum.
+    """
+    def __new__(cls, value, name):
+        code = super().__new__(cls, value)
+        code.name = name
+        return code
+
+    def __repr__(self):
+        return f"TokenType.{self.name}"
+
+    __str__ = __repr__
+
+    def __reduce__(self):
+        # unpickles to the same constant rather than to a copy of it
+        return getattr, (TokenType, self.name)
+
+
+TOKEN_NAMES = ('INTEGER', 'PLUS', 'MINUS', 'MUL', 'DIV', 'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE', 'EOF',
+               'MOD', 'POWER', 'GREATER', 'INT', 'RETURN', 'SEMI', 'IDENTIFIER', 'ASSIGN')
+
+class TokenType:
+    INTEGER = TokenCode(0, 'INTEGER')
+    PLUS = TokenCode(1, 'PLUS')
+    MINUS = TokenCode(2, 'MINUS')
+    MUL = TokenCode(3, 'MUL')
+    DIV = TokenCode(4, 'DIV')
+    LPAREN = TokenCode(5, 'LPAREN')
+    RPAREN = TokenCode(6, 'RPAREN')
+    LBRACE = TokenCode(7, 'LBRACE')
+    RBRACE = TokenCode(8, 'RBRACE')
+    EOF = TokenCode(9, 'EOF')
+    MOD = TokenCode(10, 'MOD')
+    POWER = TokenCode(11, 'POWER')
+    GREATER = TokenCode(12, 'GREATER')
+    INT = TokenCode(13, 'INT')
+    RETURN = TokenCode(14, 'RETURN')
+    SEMI = TokenCode(15, 'SEMI')
+    IDENTIFIER = TokenCode(16, 'IDENTIFIER')
+    ASSIGN = TokenCode(17, 'ASSIGN')
+
+
+# every token type, indexed by its code
+TOKEN_TYPES = tuple(getattr(TokenType, name) for name in TOKEN_NAMES)
+
+
+TOKEN_DESCRIPTIONS = {
+    TokenType.INT: "keyword",
+    TokenType.RETURN: "keyword",
+    TokenType.IDENTIFIER: "identifier",
+    TokenType.INTEGER: "integer",
+    TokenType.PLUS: "operator",
+    TokenType.MINUS: "operator",
+    TokenType.MUL: "operator",
+    TokenType.DIV: "operator",
+    TokenType.MOD: "operator",
+    TokenType.POWER: "operator",
+    TokenType.LPAREN: "left parenthesis",
+    TokenType.RPAREN: "right parenthesis",
+    TokenType.LBRACE: "left brace",
+    TokenType.RBRACE: "right brace",
+    TokenType.SEMI: "semicolon",
+    TokenType.ASSIGN: "assignment operator",
+    TokenType.EOF: "end of file"
+}
@@ -0,0 +1,56 @@
+# differential test: every backend gives the tree-walking Interpreter's value or
+# error, with the span it reports, on a corpus of generated programs
+import pytest
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.backends import BACKENDS, compile_program
+from ccompiler.parser.budget import Budget
+from benchmarks.gen_source import generate_program
+
+SEEDS = range(60)
+
+
+def outcome(run):
+    try:
+        return 'ok', repr(run())
+    except Exception as e:
+        return 'error', str(e), getattr(e, 'start', None), getattr(e, 'end', None), getattr(e, 'limit', None)
+
+
+def corpus():
+    for seed in SEEDS:
+        yield Parser(Lexer(generate_program(statements=30, depth=4, seed=seed), scanner='regex')).parse()
+
+
+@pytest.fixture(scope='module')
+def trees():
+    return list(corpus())
+
+
+def test_corpus_has_values_and_errors(trees):
+    kinds = {outcome(compile_program(tree, 'tree'))[0] for tree in trees}
+    assert kinds == {'ok', 'error'}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_same_values_and_errors(trees, backend):
+    for seed, tree in zip(SEEDS, trees):
+        expected = outcome(compile_program(tree, 'tree'))
+        assert outcome(compile_program(tree, backend)) == expected, f"seed {seed}"
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('limits', [{'max_steps': 40}, {'max_int_bits': 64}])
+def test_same_budget_errors(trees, backend, limits):
+    for seed, tree in zip(SEEDS, trees):
+        expected = outcome(compile_program(tree, 'tree', Budget(**limits)))
+        assert outcome(compile_program(tree, backend, Budget(**limits))) == expected, f"seed {seed}"
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_error_spans(backend):
+    text = "int main() { x = 1; y = x - 1; z = (x + 2) / y; return z; }"
+    tree = Parser(Lexer(text)).parse()
+    _, message, start, end, _ = outcome(compile_program(tree, backend))
+    assert message == "Runtime Error: Division by zero"
+    assert text[start:end] == "(x + 2) / y"
@@ -0,0 +1,19 @@
+# the compile cache's version covers every compiler module a cached tree depends on
+import os
+import sys
+import subprocess
+from ccompiler.parser.compile_cache import COMPILER_SOURCES, PROJECT_ROOT
+
+IMPORTED = "import sys, ccompiler.parser.compile_cache; print(*sorted(sys.modules))"
+
+
+def test_sources_cover_imported_modules():
+    # a fresh interpreter, so only what compile_cache itself imports is loaded
+    modules = subprocess.run([sys.executable, '-c', IMPORTED], cwd=PROJECT_ROOT, capture_output=True,
+                             text=True, check=True).stdout.split()
+    names = [module[len('ccompiler.'):] for module in modules if module.startswith('ccompiler.')]
+    imported = {name.replace('.', '/') + '.py' for name in names
+                if name not in ('scanner', 'parser', 'parser.compile_cache')}
+    assert imported == set(COMPILER_SOURCES)
+    for path in COMPILER_SOURCES:
+        assert os.path.exists(os.path.join(PROJECT_ROOT, 'ccompiler', path))
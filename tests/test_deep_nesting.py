@@ -0,0 +1,37 @@
+# expressions nested far beyond the recursion limit, parsed and evaluated without recursion
+import sys
+import pytest
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.iterative import IterativeInterpreter
+
+DEPTH = 100000
+
+# name -> (expression of the given nesting depth, expected value)
+SHAPES = {
+    'parentheses': lambda n: ("(" * n + "a" + ")" * n, 3),
+    'unary chain': lambda n: ("- " * n + "a", 3 if n % 2 == 0 else -3),
+    '** chain': lambda n: (" ** ".join(["1"] * n), 1),
+    'nested sums': lambda n: ("(a + " * n + "1" + ")" * n, 3 * n + 1),
+}
+
+
+def parse(expression):
+    text = f"int main() {{ a = 3; return {expression}; }}"
+    return text, Parser(Lexer(text, scanner='regex'), expr_parser='iterative').parse()
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_deep_nesting(shape):
+    assert DEPTH > sys.getrecursionlimit()
+    expression, expected = SHAPES[shape](DEPTH)
+    _, tree = parse(expression)
+    assert IterativeInterpreter(None).visit(tree) == expected
+
+
+def test_deep_error_span():
+    expression = "(a + " * DEPTH + "1 / 0" + ")" * DEPTH
+    text, tree = parse(expression)
+    with pytest.raises(Exception, match="Division by zero") as info:
+        IterativeInterpreter(None).visit(tree)
+    assert text[info.value.start:info.value.end] == "1 / 0"
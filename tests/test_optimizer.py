@@ -0,0 +1,47 @@
+# differential test: an optimized tree gives the unoptimized tree's value or
+# error, with the span it reports, including under a small max_int_bits
+import pytest
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.parser.parser import Parser
+from ccompiler.parser.optimizer import optimize
+from ccompiler.parser.backends import compile_program
+from ccompiler.parser.budget import Budget
+from benchmarks.gen_source import generate_program
+
+SEEDS = range(300)
+
+
+def outcome(run):
+    try:
+        return 'ok', repr(run())
+    except Exception as e:
+        return 'error', str(e), getattr(e, 'start', None), getattr(e, 'end', None), getattr(e, 'limit', None)
+
+
+@pytest.fixture(scope='module')
+def trees():
+    return [Parser(Lexer(generate_program(statements=10, depth=4, seed=seed), scanner='regex')).parse()
+            for seed in SEEDS]
+
+
+@pytest.mark.parametrize('max_int_bits', [None, 3, 8, 64])
+def test_same_values_and_errors(trees, max_int_bits):
+    for seed, tree in zip(SEEDS, trees):
+        expected = outcome(compile_program(tree, 'tree', Budget(max_int_bits=max_int_bits)))
+        optimized, _ = optimize(tree, Budget(max_int_bits=max_int_bits))
+        assert outcome(compile_program(optimized, 'tree', Budget(max_int_bits=max_int_bits))) == expected, \
+            f"seed {seed}"
+
+
+@pytest.mark.parametrize('text', [
+    "int main() { return (- - 10) ** 0; }",
+    "int main() { x = 10; y = x * 1; return 0; }",
+    "int main() { x = 7; y = x + 1; return 0; }",
+    "int main() { d = ((((10) ** 1 / + 1)) ** (1/2)) ** 2; return w; }",
+])
+def test_int_bits_errors_are_kept(text):
+    tree = Parser(Lexer(text)).parse()
+    optimized, _ = optimize(tree, Budget(max_int_bits=3))
+    expected = outcome(compile_program(tree, 'tree', Budget(max_int_bits=3)))
+    assert expected[-1] == 'int_bits'
+    assert outcome(compile_program(optimized, 'tree', Budget(max_int_bits=3))) == expected
@@ -0,0 +1,64 @@
+# ParallelScanner against the sequential Lexer, with chunk boundaries forced
+# next to and inside comments, '**' operators and long numbers
+import pytest
+from ccompiler.tokens import TokenType as T
+from ccompiler.scanner.lex_scanner import Lexer
+from ccompiler.scanner.parallel_scan import ParallelScanner, split_points
+
+# one long line, so chunks are cut at blanks, and short lines cut at newlines;
+# the block comments span lines and contain what looks like code
+SOURCE = (
+    "int main() {\n"
+    "    a = 123456789 ** 2 ** 1 + 98765432109876543210 * 7; /* a block\n"
+    "    comment = 1 ** 2; with ** and 12345 in it\n"
+    "    */ b = a ** 3 % 1000000007; // a line comment with ** 42 /* inside\n"
+    "    c = 2 ** 10 ** 1 + 11111111111111111111 - b * 3333333333 / 7 % 5 ** 2 ** 1 - a;\n"
+    "    /**/ d = c ** 2; /* */ e = 1; /*** stars ***/ f = e ** e;\n"
+    "    // trailing comment without ** a newline at the end of a long line that goes on and on\n"
+    "    return a + b + c + d + f;\n"
+    "}"
+)
+
+
+def lexer_tokens(text):
+    return [(t.lexeme, t.type, t.start, t.end) for t in Lexer(text).tokens if t.type is not T.EOF]
+
+
+def buffer_tokens(buffer):
+    return [(token.lexeme, token.type, token.start, token.end)
+            for token in map(buffer.located_token, range(len(buffer)))]
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 40))
+def test_every_chunk_size(chunk_size):
+    buffer = ParallelScanner(workers=1, chunk_size=chunk_size).scan(SOURCE)
+    assert buffer_tokens(buffer) == lexer_tokens(SOURCE)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 8, 17])
+def test_cuts_never_split_a_token(chunk_size):
+    # every cut comes right after a newline or a blank, never inside '**' or a number
+    for point in split_points(SOURCE, chunk_size)[1:-1]:
+        assert SOURCE[point - 1] in ' \t\n'
+    starts = {start: end for _, _, start, end in lexer_tokens(SOURCE)}
+    for point in split_points(SOURCE, chunk_size):
+        assert not any(start < point < end for start, end in starts.items())
+
+
+def test_comments_across_chunks_are_resynced():
+    scanner = ParallelScanner(workers=1, chunk_size=5)
+    assert buffer_tokens(scanner.scan(SOURCE)) == lexer_tokens(SOURCE)
+    assert scanner.resynced > 0
+
+
+def test_unterminated_block_comment():
+    text = SOURCE.replace("/* */", "/* never closed ** 12", 1)
+    for chunk_size in (2, 7, 30):
+        buffer = ParallelScanner(workers=1, chunk_size=chunk_size).scan(text)
+        assert buffer_tokens(buffer) == lexer_tokens(text)
+
+
+def test_worker_processes():
+    scanner = ParallelScanner(workers=2, chunk_size=16)
+    assert buffer_tokens(scanner.scan(SOURCE)) == lexer_tokens(SOURCE)
+    assert scanner.chunks > 2
@@ -0,0 +1,91 @@
+# differential test: RegexScanner gives exactly the legacy Scanner's token
+# stream (types, values, spans and errors), quirks included
+import random
+import pytest
+from ccompiler.scanner.lex_scanner import Scanner, RegexScanner, Lexer, lexer_tokens
+from ccompiler.parser.parser import Parser
+from benchmarks.gen_source import generate_program
+
+SAMPLES = [
+    "",
+    "   \n\t  ",
+    "int main() { x = 2; y = x * (3 + 4); return y ** 2 % 7; }",
+    "int main() {\r\n  x = 10;\r\n  return x - 1;\r\n}\r\n",
+    "int main() { return 1; }\r",
+    "x\ry = 1\r\n;\r",
+    "x = 3.14; y = .5; z = 1.; w = 1e5; v = 2.5e3; u = 1.2.3; t = 0.0;",
+    "a ** b ** -c; a**b; a * * b; ***; ** *",
+    "a -- b ++ c == d <= e >= f != g && h || i",
+    "x = a @ b; y = #define; z = $1; w = `q`; 'c'; \"s\"; ?: ~x !y",
+    "int float double while for if else void struct _Bool sizeof return",
+    "a[1, 2]; {[(,)]};",
+    "x = 1; // comment\ny = 2; /* block\ncomment */ z = 3;",
+    "x//comment directly after a word\ny",
+    "a/*c*/b /**/ c /*/ d */ e",
+    "x = 1; /* unterminated",
+    "x = 1; // no newline at the end",
+    "/", "a /", "*/", "x = 1 /",
+    "x = ²;",
+    "x = ٣ + ٣٤;",
+    "café = naïve + π;",
+    "int main() { return 1 }",
+    "int main() { x = (1 + 2; return x; }",
+    "int main() { return 1; } extra",
+]
+
+ALPHABET = "ab19 0.5e+-*/%=<>(){}[];,\n\t\r!&|~@#_'\"²"
+
+
+def tokens(scan, text):
+    """(lexeme, type, value, start, end) of every scanner token, or the error scanning raises"""
+    try:
+        return [(t.lexeme, t.type, t.value, t.start, t.end) for t in scan(text)]
+    except Exception as e:
+        return 'error', type(e).__name__, str(e)
+
+
+def parser_tokens(scan, text):
+    try:
+        return [(t.lexeme, t.type, t.value, t.start, t.end) for t in lexer_tokens(scan(text))]
+    except Exception as e:
+        return 'error', type(e).__name__, str(e)
+
+
+def parse(text, scanner):
+    try:
+        Parser(Lexer(text, scanner=scanner)).parse()
+        return 'ok'
+    except Exception as e:
+        return type(e).__name__, str(e), getattr(e, 'line', None), getattr(e, 'column', None)
+
+
+def corpus():
+    yield from SAMPLES
+    for seed in range(5):
+        text = generate_program(statements=50, seed=seed)
+        yield text
+        yield text.replace('\n', '\r\n')
+    rng = random.Random(0)
+    for _ in range(2000):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randrange(30)))
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_samples(text):
+    assert tokens(RegexScanner.scan_tokens, text) == tokens(Scanner.scan_tokens, text)
+    assert parser_tokens(RegexScanner.scan_tokens, text) == parser_tokens(Scanner.scan_tokens, text)
+    assert parse(text, 'regex') == parse(text, 'legacy')
+
+
+def test_corpus():
+    for text in corpus():
+        assert tokens(RegexScanner.scan_tokens, text) == tokens(Scanner.scan_tokens, text), repr(text)
+        assert parser_tokens(RegexScanner.scan_tokens, text) == parser_tokens(Scanner.scan_tokens, text), repr(text)
+
+
+def test_samples_cover_errors_and_spans():
+    # the comparisons above are only worth something if the streams are not all empty or all errors
+    results = [tokens(Scanner.scan_tokens, text) for text in SAMPLES]
+    assert any(result and result[0] == 'error' for result in results)
+    assert sum(len(result) for result in results if result and result[0] != 'error') > 100
+    assert {parse(text, 'legacy') for text in SAMPLES} - {'ok'}